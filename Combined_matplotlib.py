@@ -1,5 +1,8 @@
 import math
+import sys
+import time
 import matplotlib.pyplot as plt
+from matplotlib.transforms import Bbox
 from matplotlib.widgets import Slider, Button
 
 # Arm length constants
@@ -8,6 +11,11 @@ L1, L2 = 155, 155  # Lengths of the first and second arm segments (in mm)
 # Initial aspect ratio
 aspect_ratio = 1
 
+# Rendering mode: "blit" creates the artists once, moves them on every slider
+# event and blits them over a cached background; "redraw" clears and rebuilds
+# the whole plot on every event. Run with --redraw to compare the two.
+RENDER_MODE = "blit"
+
 # Inverse Kinematics Function
 def inverse_kinematics(x, y):
     """
@@ -33,6 +41,123 @@ def forward_kinematics(q1, q2):
     x2, y2 = x1 + L2 * math.cos(q1 + q2), y1 + L2 * math.sin(q1 + q2)
     return x1, y1, x2, y2
 
+# Frame rate meter
+class FpsMeter:
+    """Frames per second over a sliding window of recent frames."""
+
+    def __init__(self, window=1.0):
+        self.window = window  # Seconds of history to average over
+        self.times = []
+        self.frames = 0
+
+    def tick(self):
+        now = time.perf_counter()
+        self.frames += 1
+        self.times.append(now)
+        while self.times and now - self.times[0] > self.window:
+            self.times.pop(0)
+
+    def fps(self):
+        if len(self.times) < 2:
+            return 0.0
+        return (len(self.times) - 1) / (self.times[-1] - self.times[0])
+
+# Retained-artist view of the arm for blitted rendering
+class ArmView:
+    """
+    Creates the arm, effector, labels and boundary artists once. Moving the
+    arm only updates their data, restores the cached background and redraws
+    the animated artists, instead of rebuilding the whole figure.
+    """
+
+    def __init__(self, fig, ax, sliders=()):
+        self.fig, self.ax = fig, ax
+        self.fps = FpsMeter()
+        self.backgrounds = None
+        self.regions = None
+
+        # Static artists, part of the cached background
+        ax.set_xlim(-L1 - L2 - 10, L1 + L2 + 10)
+        ax.set_ylim(0, L1 + L2 + 10)  # Adjust ylim to move the shoulder to the bottom center
+        ax.set_aspect(aspect_ratio)  # Set aspect ratio to user inputted value
+        ax.add_artist(plt.Circle((0, 0), L1 + L2, color='gray', fill=False, linestyle='--', linewidth=1.5))
+        ax.grid(True)
+        ax.set_title("2-Link Arm Interactive Plot")
+
+        # Animated artists, redrawn on every update
+        self.arm, = ax.plot([], [], 'o-', markersize=8, lw=3, label="Arm", color=arm_color, animated=True)
+        self.effector, = ax.plot([], [], 'o', color='red', markersize=10, label="End Effector", animated=True)
+        self.coordinates = ax.text(0, 0, "", fontsize=12, color='blue', animated=True)
+        self.out_of_reach = ax.text(0, 0.5 * (L1 + L2), "Out of Reach", fontsize=20, color='red', ha='center',
+                                    visible=False, animated=True)
+        self.boundary, = ax.plot([], [], 'r--', lw=3, animated=True)
+        self.fps_text = ax.text(0.98, 0.97, "", transform=ax.transAxes, ha='right', va='top', fontsize=10,
+                                color='gray', animated=True)
+        ax.legend(handles=[self.arm, self.effector], loc='upper left')
+        self.animated = [(ax, [self.boundary, self.arm, self.effector, self.coordinates, self.out_of_reach,
+                               self.fps_text])]
+
+        # Slider tracks and value labels are redrawn the same way
+        for slider in sliders:
+            slider.drawon = False  # Stop set_val() from requesting a full redraw
+            artists = [slider.poly, slider.valtext] + ([slider._handle] if hasattr(slider, "_handle") else [])
+            for artist in artists:
+                artist.set_animated(True)
+            self.animated.append((slider.ax, artists))
+
+        fig.canvas.mpl_connect('draw_event', self.cache_background)
+
+    def cache_background(self, event=None):
+        """Store everything but the animated artists after a full draw."""
+        canvas = self.fig.canvas
+        # A slider's value label sits to the right of its axes, so its region runs to the figure edge
+        self.regions = [ax.bbox if ax is self.ax else
+                        Bbox.from_extents(ax.bbox.x0, ax.bbox.y0 - 4, self.fig.bbox.x1, ax.bbox.y1 + 4)
+                        for ax, _ in self.animated]
+        self.backgrounds = [canvas.copy_from_bbox(region) for region in self.regions]
+        self.draw_animated()
+
+    def draw_animated(self):
+        for ax, artists in self.animated:
+            for artist in artists:
+                ax.draw_artist(artist)
+
+    def show_arm(self, q1, q2):
+        x1, y1, x2, y2 = forward_kinematics(q1, q2)
+        self.arm.set_data([0, x1, x2], [0, y1, y2])
+        self.arm.set_color(arm_color)
+        self.effector.set_data([x2], [y2])
+        self.coordinates.set_position((x2 + 10, y2 + 10))
+        self.coordinates.set_text(f"({x2:.1f}, {y2:.1f})")
+        for artist in (self.arm, self.effector, self.coordinates):
+            artist.set_visible(True)
+        self.out_of_reach.set_visible(False)
+        self.refresh()
+
+    def show_out_of_reach(self):
+        for artist in (self.arm, self.effector, self.coordinates):
+            artist.set_visible(False)
+        self.out_of_reach.set_visible(True)
+        self.refresh()
+
+    def set_boundary(self, x_a, y_a, x_b, y_b):
+        self.boundary.set_data([x_a, x_b, x_b, x_a, x_a], [y_a, y_a, y_b, y_b, y_a])
+
+    def refresh(self):
+        """Blit the animated artists over the cached background."""
+        canvas = self.fig.canvas
+        if self.backgrounds is None:
+            canvas.draw_idle()  # No full draw yet; the draw_event will cache the background
+            return
+        self.fps.tick()
+        self.fps_text.set_text(f"{self.fps.fps():.0f} fps")
+        for background in self.backgrounds:
+            canvas.restore_region(background)
+        self.draw_animated()
+        for region in self.regions:
+            canvas.blit(region)
+        canvas.flush_events()
+
 # Plotting Function
 def plot_arm(q1, q2):
     """
@@ -63,8 +188,17 @@ def plot_arm(q1, q2):
     ax.grid(True)
     ax.set_title("2-Link Arm Interactive Plot")
     ax.legend()
+    ax.text(0.98, 0.97, f"{redraw_fps.fps():.0f} fps", transform=ax.transAxes, ha='right', va='top',
+            fontsize=10, color='gray')
     plt.draw()
 
+# Show the arm with whichever rendering mode is active
+def render_arm(q1, q2):
+    if RENDER_MODE == "blit":
+        view.show_arm(q1, q2)
+    else:
+        plot_arm(q1, q2)
+
 # Slider Update Function
 def update(val):
     """Update the plot based on slider values."""
@@ -80,12 +214,16 @@ def update(val):
             slider_y.set_val(min(max(y, min(point2_y, point1_y)), max(point2_y, point1_y)))
             slider_x.eventson = True
             slider_y.eventson = True
-            return
+            if RENDER_MODE != "blit":
+                return
     
     try:
         q1, q2 = inverse_kinematics(slider_x.val, slider_y.val)
-        plot_arm(q1, q2)
+        render_arm(q1, q2)
     except ValueError:
+        if RENDER_MODE == "blit":
+            view.show_out_of_reach()
+            return
         ax.clear()
         ax.text(0, 0.5 * (L1 + L2), "Out of Reach", fontsize=20, color='red', ha='center')
         ax.set_xlim(-L1 - L2 - 10, L1 + L2 + 10)
@@ -116,7 +254,7 @@ def toggle_color(event):
             arm_color = 'green' if arm_color == 'blue' else 'blue'
             button_color.label.set_text('Color Changed')
             q1, q2 = inverse_kinematics(slider_x.val, slider_y.val)
-            plot_arm(q1, q2)
+            render_arm(q1, q2)
             button_color.disconnect(toggle_color)
 
 # Set Point 1 Function
@@ -134,46 +272,69 @@ def set_point2(event):
     
     print(f"Point 2 set to: ({point2_x}, {point2_y})")
     
+    if RENDER_MODE == "blit":
+        view.set_boundary(point1_x, point1_y, point2_x, point2_y)
     update(None)
 
-# Initial plot setup with 1x1 aspect ratio
-fig, ax = plt.subplots(figsize=(8.5, 8.5))
-plt.subplots_adjust(bottom=0.3)
-x_init, y_init = 100, 100
+# Frame rate of the "redraw" mode
+redraw_fps = FpsMeter()
 
-# Initial arm color
-arm_color = 'blue'
+# Figure setup: arm axes, sliders and buttons
+def build_figure(mode=RENDER_MODE):
+    """Create the figure and widgets, rendering with the given mode ("blit" or "redraw")."""
+    global RENDER_MODE, fig, ax, view, arm_color, slider_x, slider_y, button_color, button_point1, button_point2
+    RENDER_MODE = mode
 
-try:
-    q1_init, q2_init = inverse_kinematics(x_init, y_init)
-    plot_arm(q1_init, q2_init)
-except ValueError:
-    ax.text(0, 0.5 * (L1 + L2), "Out of Reach", fontsize=20, color='red', ha='center')
-    # Plot the out of reach boundary
-    circle = plt.Circle((0, 0), L1 + L2, color='gray', fill=False, linestyle='--', linewidth=1.5)
-    ax.add_artist(circle)
+    # Initial plot setup with 1x1 aspect ratio
+    fig, ax = plt.subplots(figsize=(8.5, 8.5))
+    plt.subplots_adjust(bottom=0.3)
+    x_init, y_init = 100, 100
+
+    # Initial arm color
+    arm_color = 'blue'
+
+    if RENDER_MODE != "blit":
+        try:
+            q1_init, q2_init = inverse_kinematics(x_init, y_init)
+            plot_arm(q1_init, q2_init)
+        except ValueError:
+            ax.text(0, 0.5 * (L1 + L2), "Out of Reach", fontsize=20, color='red', ha='center')
+            # Plot the out of reach boundary
+            circle = plt.Circle((0, 0), L1 + L2, color='gray', fill=False, linestyle='--', linewidth=1.5)
+            ax.add_artist(circle)
+
+    # Slider setup
+    ax_x = plt.axes([0.15, 0.15, 0.75, 0.03])
+    ax_y = plt.axes([0.15, 0.10, 0.75, 0.03])
+    slider_x = Slider(ax_x, 'X', -L1 - L2, L1 + L2, valinit=x_init)
+    slider_y = Slider(ax_y, 'Y', 0, L1 + L2, valinit=y_init)  # Adjust slider_y range to match new ylim
+    slider_x.on_changed(update)
+    slider_y.on_changed(update)
+
+    # Toggle button setup for color change
+    ax_button_color = plt.axes([0.45, 0.025, 0.15, 0.04])
+    button_color = Button(ax_button_color, 'Toggle Color')
+    button_color.on_clicked(toggle_color)
+
+    # Button setup for setting point 1
+    ax_button_point1 = plt.axes([0.05, 0.025, 0.15, 0.04])
+    button_point1 = Button(ax_button_point1, 'Set Point 1')
+    button_point1.on_clicked(set_point1)
+
+    # Button setup for setting point 2
+    ax_button_point2 = plt.axes([0.25, 0.025, 0.15, 0.04])
+    button_point2 = Button(ax_button_point2, 'Set Point 2')
+    button_point2.on_clicked(set_point2)
+
+    # The blitted view draws the arm itself once the sliders exist
+    if RENDER_MODE == "blit":
+        view = ArmView(fig, ax, (slider_x, slider_y))
+        update(None)
+    else:
+        # Count full redraws, which is when the legacy mode produces a frame
+        fig.canvas.mpl_connect('draw_event', lambda event: redraw_fps.tick())
+    return fig
 
-# Slider setup
-ax_x = plt.axes([0.15, 0.15, 0.75, 0.03])
-ax_y = plt.axes([0.15, 0.10, 0.75, 0.03])
-slider_x = Slider(ax_x, 'X', -L1 - L2, L1 + L2, valinit=x_init)
-slider_y = Slider(ax_y, 'Y', 0, L1 + L2, valinit=y_init)  # Adjust slider_y range to match new ylim
-slider_x.on_changed(update)
-slider_y.on_changed(update)
-
-# Toggle button setup for color change
-ax_button_color = plt.axes([0.45, 0.025, 0.15, 0.04])
-button_color = Button(ax_button_color, 'Toggle Color')
-button_color.on_clicked(toggle_color)
-
-# Button setup for setting point 1
-ax_button_point1 = plt.axes([0.05, 0.025, 0.15, 0.04])
-button_point1 = Button(ax_button_point1, 'Set Point 1')
-button_point1.on_clicked(set_point1)
-
-# Button setup for setting point 2
-ax_button_point2 = plt.axes([0.25, 0.025, 0.15, 0.04])
-button_point2 = Button(ax_button_point2, 'Set Point 2')
-button_point2.on_clicked(set_point2)
-
-plt.show()
+if __name__ == "__main__":
+    build_figure("redraw" if "--redraw" in sys.argv else "blit")
+    plt.show()
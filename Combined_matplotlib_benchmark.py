@@ -0,0 +1,35 @@
+import math
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import Combined_matplotlib as simulator
+
+# Benchmark: slider events per second in the "redraw" and "blit" rendering
+# modes of Combined_matplotlib, headless on the Agg backend.
+# Usage: python Combined_matplotlib_benchmark.py [events]
+
+def drag(events):
+    """Sweep the X slider back and forth, partly out of reach, like a user dragging it."""
+    fig = simulator.fig
+    fig.canvas.draw()  # First full draw caches the blit background
+    start = time.perf_counter()
+    for i in range(events):
+        simulator.slider_x.set_val(300 * math.sin(i / 20))
+    return events / (time.perf_counter() - start)
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rates = {}
+    for mode in ("redraw", "blit"):
+        simulator.build_figure(mode)
+        rates[mode] = drag(events)
+        plt.close(simulator.fig)
+        print(f"{mode:7s} {rates[mode]:8.1f} frames/s")
+    print(f"Blitting is {rates['blit'] / rates['redraw']:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 import math
 import time
 from machine import Pin, PWM, ADC
+from scheduler import FixedRateScheduler
 
 # Arm length constants
 L1, L2 = 155, 155  # Lengths of the first and second arm segments (in mm)
 
+# Control loop rate, matching the 50 Hz servo PWM frame
+CONTROL_RATE_HZ = 50
+
 # Initialize Buttons
 button_point1 = Pin(13, Pin.IN, Pin.PULL_DOWN)  # Set point 1 (GP13)
 button_point2 = Pin(11, Pin.IN, Pin.PULL_DOWN)  # Set point 2 (GP11)
@@ -127,8 +131,8 @@ def toggle_led(pin):
     led_state = not led_state
     led_updown.value(led_state)
 
-# Main loop
-while True:
+# One pass of the control loop
+def control_tick():
     # Read knob values (simulating sliders)
     knob1_value = -1*(-310 + 2*(knob1.read_u16() * (L1 + L2)/ 65535))  # Map ADC to -L1-L2 to L1+L2 range
     knob2_value = -1*(knob2.read_u16() * (L1 + L2) / 65535) + 310
@@ -169,7 +173,11 @@ while True:
 
     print(led_state)
     print(f"{point1_x},{point1_y}")
-    print(f"{point2_x},{point2_y}")  
-
-    # Small delay to prevent excessive loop cycling
-    time.sleep(0.1)
+    print(f"{point2_x},{point2_y}")
+
+# Main loop, run at a fixed rate against absolute deadlines
+scheduler = FixedRateScheduler(CONTROL_RATE_HZ)
+try:
+    scheduler.run(control_tick)
+finally:
+    print(scheduler.report())
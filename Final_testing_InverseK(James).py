@@ -1,8 +1,7 @@
 import math
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider
-from machine import PWM
+
+# matplotlib and machine are only imported by main(), so the functions below
+# can be imported without a display or a Pico.
 
 # Arm length constants
 L1, L2 = 155, 155  # Lengths of the first and second arm segments (in mm)
@@ -66,7 +65,7 @@ def safe_move_to(x, y):
         print(f"Cannot move to ({x}, {y}): {e}")
 
 # Simulate Movement and Plot Arm
-def plot_arm(q1, q2):
+def plot_arm(ax, q1, q2):
     """
     Plot the robotic arm for given joint angles q1 (shoulder) and q2 (elbow).
     """
@@ -78,35 +77,44 @@ def plot_arm(q1, q2):
     ax.set_ylim(-L1 - L2 - 10, L1 + L2 + 10)
     ax.set_aspect('equal', 'box')
     ax.grid(True)
-    plt.draw()
-
-# Initialize Servo Connections (Pico)
-servo_shoulder = PWM(Pin(0))  # Replace Pin(0) with actual GPIO pin for shoulder
-servo_elbow = PWM(Pin(1))     # Replace Pin(1) with actual GPIO pin for elbow
-servo_shoulder.freq(50)  # Set PWM frequency
-servo_elbow.freq(50)
-
-# Initialize Plot and Sliders
-fig, ax = plt.subplots(figsize=(8, 8))
-plt.subplots_adjust(bottom=0.3)
-
-# Slider setup for manual testing
-ax_x = plt.axes([0.2, 0.2, 0.65, 0.03])
-ax_y = plt.axes([0.2, 0.15, 0.65, 0.03])
-slider_x = Slider(ax_x, 'X', -L1 - L2, L1 + L2, valinit=100)
-slider_y = Slider(ax_y, 'Y', -L1 - L2, L1 + L2, valinit=100)
-
-# Update function for sliders
-def update(val):
-    x, y = slider_x.val, slider_y.val
-    try:
-        q1, q2 = inverse_kinematics(x, y)
-        plot_arm(q1, q2)
-        safe_move_to(x, y)
-    except ValueError:
-        print("Target out of reach")
-
-slider_x.on_changed(update)
-slider_y.on_changed(update)
-
-plt.show()
+    ax.figure.canvas.draw_idle()
+
+def main():
+    global servo_shoulder, servo_elbow
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import Slider
+    from machine import PWM, Pin
+
+    # Initialize Servo Connections (Pico)
+    servo_shoulder = PWM(Pin(0))  # Replace Pin(0) with actual GPIO pin for shoulder
+    servo_elbow = PWM(Pin(1))     # Replace Pin(1) with actual GPIO pin for elbow
+    servo_shoulder.freq(50)  # Set PWM frequency
+    servo_elbow.freq(50)
+
+    # Initialize Plot and Sliders
+    fig, ax = plt.subplots(figsize=(8, 8))
+    plt.subplots_adjust(bottom=0.3)
+
+    # Slider setup for manual testing
+    ax_x = plt.axes([0.2, 0.2, 0.65, 0.03])
+    ax_y = plt.axes([0.2, 0.15, 0.65, 0.03])
+    slider_x = Slider(ax_x, 'X', -L1 - L2, L1 + L2, valinit=100)
+    slider_y = Slider(ax_y, 'Y', -L1 - L2, L1 + L2, valinit=100)
+
+    # Update function for sliders
+    def update(val):
+        x, y = slider_x.val, slider_y.val
+        try:
+            q1, q2 = inverse_kinematics(x, y)
+            plot_arm(ax, q1, q2)
+            safe_move_to(x, y)
+        except ValueError:
+            print("Target out of reach")
+
+    slider_x.on_changed(update)
+    slider_y.on_changed(update)
+
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from kinematics import L1, L2, PWM_MIN, PWM_MAX
+
+# Vectorized versions of the kinematics in kinematics.py.
+# These solve a whole path in one call on the host, so preparing a drawing
+# with hundreds of thousands of points does not pay the per-point Python cost.
+
+# Inverse Kinematics Function (batch)
+def inverse_kinematics_batch(x, y, l1=L1, l2=L2, elbow=-1):
+    """
+    Compute shoulder (q1) and elbow (q2) angles for arrays of (x, y) positions.
+    Returns (q1, q2, reachable); angles are in radians and are NaN where the
+    matching point is out of reach. elbow=-1 gives the negative elbow angle
+    used by inverse_kinematics(), elbow=1 the mirrored solution.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    r_squared = x * x + y * y
+
+    cos_q2 = (r_squared - l1**2 - l2**2) / (2 * l1 * l2)
+    reachable = (r_squared <= (l1 + l2)**2) & (np.abs(cos_q2) <= 1.0)
+    cos_q2 = np.where(reachable, cos_q2, np.nan)
+
+    q2 = elbow * np.arccos(cos_q2)  # Elbow angle
+    q1 = np.arctan2(y, x) - np.arctan2(l2 * np.sin(q2), l1 + l2 * np.cos(q2))  # Shoulder angle
+
+    return q1, q2, reachable
+
+# Forward Kinematics Function (batch)
+def forward_kinematics_batch(q1, q2, l1=L1, l2=L2):
+    """
+    Compute elbow and end-effector positions for arrays of joint angles.
+    Returns (x1, y1, x2, y2) arrays.
+    """
+    q1 = np.asarray(q1, dtype=np.float64)
+    q2 = np.asarray(q2, dtype=np.float64)
+    x1, y1 = l1 * np.cos(q1), l1 * np.sin(q1)
+    x2, y2 = x1 + l2 * np.cos(q1 + q2), y1 + l2 * np.sin(q1 + q2)
+    return x1, y1, x2, y2
+
+# Translate Function (batch)
+def translate_batch(angle):
+    """
+    Translate an array of angles (degrees) to PWM values.
+    Matches translate() exactly, including the truncation and clamp.
+    """
+    angle = np.asarray(angle, dtype=np.float64)
+    pulse_width = 500 + (2500 - 500) * angle / 180
+    duty_cycle = pulse_width / 20000  # Convert to duty cycle (0-1)
+    duty_u16_value = np.trunc(duty_cycle * 65535)  # Convert to 16-bit scale
+    return np.clip(duty_u16_value, PWM_MIN, PWM_MAX).astype(np.uint16)  # Clamp to safe limits
+
+# Inverse of translate (batch)
+def untranslate_batch(duty):
+    """
+    Convert an array of PWM values back to angles (degrees). translate()
+    truncates, so each duty stands for half a step above its value; duties at
+    PWM_MIN or PWM_MAX may have been clamped and only give the limit angle.
+    """
+    duty = np.asarray(duty, dtype=np.float64) + 0.5
+    pulse_width = duty / 65535 * 20000
+    return (pulse_width - 500) * 180 / (2500 - 500)
+
+# Whole path solver
+def solve_path(x, y, l1=L1, l2=L2):
+    """
+    Solve a whole path of (x, y) points in one call.
+    Returns (q1, q2, reachable, shoulder_duty, elbow_duty). Duty values are 0
+    for unreachable points so they can never be mistaken for a real command.
+    """
+    q1, q2, reachable = inverse_kinematics_batch(x, y, l1, l2)
+    shoulder_duty = np.where(reachable, translate_batch(np.degrees(np.where(reachable, q1, 0.0))), 0)
+    elbow_duty = np.where(reachable, translate_batch(np.degrees(np.where(reachable, q2, 0.0))), 0)
+    return q1, q2, reachable, shoulder_duty.astype(np.uint16), elbow_duty.astype(np.uint16)
@@ -0,0 +1,55 @@
+import math
+import sys
+import time
+
+import numpy as np
+
+from kinematics import L1, L2, inverse_kinematics, translate
+from batch_kinematics import solve_path
+
+# Benchmark: scalar inverse_kinematics + translate loop against solve_path.
+# Usage: python batch_kinematics_benchmark.py [number_of_points]
+
+def make_path(n):
+    """Build a spiral path of n points that wanders in and out of reach."""
+    t = np.linspace(0, 40 * math.pi, n)
+    r = (L1 + L2) * (0.2 + 0.85 * (0.5 + 0.5 * np.sin(t / 7)))
+    return r * np.cos(t), np.abs(r * np.sin(t))
+
+def solve_scalar(xs, ys):
+    """Solve the path one point at a time, the way the control code does."""
+    shoulder, elbow = [], []
+    for x, y in zip(xs, ys):
+        try:
+            q1, q2 = inverse_kinematics(x, y)
+        except ValueError:
+            shoulder.append(0)
+            elbow.append(0)
+            continue
+        shoulder.append(translate(math.degrees(q1)))
+        elbow.append(translate(math.degrees(q2)))
+    return shoulder, elbow
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    xs, ys = make_path(n)
+    xs_list, ys_list = xs.tolist(), ys.tolist()
+
+    start = time.perf_counter()
+    shoulder, elbow = solve_scalar(xs_list, ys_list)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, _, reachable, shoulder_duty, elbow_duty = solve_path(xs, ys)
+    batch_time = time.perf_counter() - start
+
+    mismatches = int(np.count_nonzero(shoulder_duty != np.array(shoulder))
+                     + np.count_nonzero(elbow_duty != np.array(elbow)))
+
+    print(f"Points: {n} ({int(reachable.sum())} reachable)")
+    print(f"Scalar: {scalar_time * 1000:.1f} ms ({n / scalar_time:,.0f} points/s)")
+    print(f"Batch:  {batch_time * 1000:.1f} ms ({n / batch_time:,.0f} points/s)")
+    print(f"Speedup: {scalar_time / batch_time:.1f}x, duty mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
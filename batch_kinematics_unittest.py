@@ -0,0 +1,57 @@
+import math
+import unittest
+
+import numpy as np
+
+from kinematics import L1, L2, inverse_kinematics, forward_kinematics, translate
+from batch_kinematics import inverse_kinematics_batch, forward_kinematics_batch, translate_batch, untranslate_batch, solve_path
+
+class TestBatchKinematics(unittest.TestCase):
+    def setUp(self):
+        xs, ys = np.meshgrid(np.linspace(-320, 320, 41), np.linspace(0, 320, 21))
+        self.xs, self.ys = xs.ravel(), ys.ravel()
+
+    def test_matches_scalar(self):
+        """Test that the batch solver agrees with the scalar functions point by point"""
+        q1s, q2s, reachable, shoulder, elbow = solve_path(self.xs, self.ys)
+        for i, (x, y) in enumerate(zip(self.xs.tolist(), self.ys.tolist())):
+            try:
+                q1, q2 = inverse_kinematics(x, y)
+            except ValueError:
+                self.assertFalse(reachable[i], f"({x}, {y}) should be out of reach")
+                self.assertEqual(shoulder[i], 0)
+                continue
+            self.assertTrue(reachable[i], f"({x}, {y}) should be reachable")
+            self.assertAlmostEqual(q1s[i], q1, places=9)
+            self.assertAlmostEqual(q2s[i], q2, places=9)
+            self.assertEqual(shoulder[i], translate(math.degrees(q1)))
+            self.assertEqual(elbow[i], translate(math.degrees(q2)))
+
+    def test_round_trip(self):
+        """Test that forward kinematics returns to the requested points"""
+        q1, q2, reachable = inverse_kinematics_batch(self.xs, self.ys)
+        _, _, x2, y2 = forward_kinematics_batch(q1[reachable], q2[reachable])
+        np.testing.assert_allclose(x2, self.xs[reachable], atol=1e-6)
+        np.testing.assert_allclose(y2, self.ys[reachable], atol=1e-6)
+        self.assertEqual(forward_kinematics_batch(0.3, -0.4)[3], forward_kinematics(0.3, -0.4)[3])
+
+    def test_translate(self):
+        """Test that translate_batch matches translate, clamp included"""
+        angles = np.arange(-20, 200, 0.25)
+        expected = [translate(a) for a in angles.tolist()]
+        self.assertEqual(translate_batch(angles).tolist(), expected)
+
+    def test_untranslate(self):
+        """Test that untranslate_batch inverts translate to within one duty step"""
+        angles = np.arange(20, 160, 0.1)
+        recovered = untranslate_batch(translate_batch(angles))
+        self.assertLess(np.max(np.abs(recovered - angles)), 180 / (65535 * 2000 / 20000) / 2 + 1e-9)
+
+    def test_out_of_reach(self):
+        """Test that unreachable points are masked rather than raising"""
+        q1, q2, reachable = inverse_kinematics_batch([L1 + L2 + 1, 0], [0, 100])
+        self.assertEqual(reachable.tolist(), [False, True])
+        self.assertTrue(math.isnan(q1[0]) and math.isnan(q2[0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import math
+import time
+from array import array
+
+from kinematics import PWM_MIN, PWM_MAX, inverse_kinematics, forward_kinematics, translate
+
+# Servo calibration.
+# translate() assumes every servo follows the ideal 500-2500 us line. Real
+# servos do not, so the pen lands a little off. The workflow here:
+#   1. command a set of joint angles and record where the pen really landed
+#      (Calibration.record, or run_calibration to drive it)
+#   2. fit, per joint, the angle that has to be commanded to reach a wanted
+#      angle as a low-order polynomial, by least squares (Calibration.fit)
+#   3. bake the fit into a CorrectionTable: ideal duty -> corrected duty,
+#      sampled every 2**shift duty steps and interpolated in integers, which
+#      ServoBank applies to every write (servos.correction = table)
+# The fitted coefficients are kept in the config store (config_store.py).
+# Everything is plain Python, so it runs on the Pico as well as the host.
+
+# Joint angles visited by run_calibration(), inside the servo range
+CALIBRATION_ANGLES = [(shoulder, elbow) for shoulder in (40, 70, 100, 130) for elbow in (30, 75, 120, 160)]
+
+# ============================ Least squares ============================
+def polyfit(xs, ys, degree):
+    """
+    Least-squares polynomial through (xs, ys). Returns coefficients, lowest
+    power first. Solved with the normal equations on x scaled to about -1..1,
+    which keeps them well conditioned for the low degrees used here.
+    """
+    if len(xs) != len(ys):
+        raise ValueError("xs and ys must have the same length")
+    if len(set(xs)) <= degree:
+        raise ValueError(f"A degree {degree} fit needs at least {degree + 1} distinct samples")
+    centre = (max(xs) + min(xs)) / 2
+    half_span = (max(xs) - min(xs)) / 2 or 1.0
+    n = degree + 1
+    # Normal equations A^T A c = A^T y, built without forming A
+    matrix = [[0.0] * (n + 1) for _ in range(n)]
+    for x, y in zip(xs, ys):
+        t = (x - centre) / half_span
+        powers = [t ** k for k in range(n)]
+        for i in range(n):
+            for j in range(n):
+                matrix[i][j] += powers[i] * powers[j]
+            matrix[i][n] += powers[i] * y
+    scaled = _solve(matrix)
+    # Substitute t = (x - centre) / half_span back, by Horner's rule on polynomials
+    coefficients = [0.0]
+    for c in reversed(scaled):
+        shifted = [0.0] + [value / half_span for value in coefficients]
+        for i, value in enumerate(coefficients):
+            shifted[i] -= value * centre / half_span
+        shifted[0] += c
+        coefficients = shifted
+    return coefficients[:n]
+
+def _solve(matrix):
+    """Solve an augmented n x (n + 1) system by Gaussian elimination with partial pivoting."""
+    n = len(matrix)
+    for column in range(n):
+        pivot = max(range(column, n), key=lambda row: abs(matrix[row][column]))
+        if abs(matrix[pivot][column]) < 1e-12:
+            raise ValueError("Calibration samples do not determine the fit")
+        matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+        for row in range(column + 1, n):
+            factor = matrix[row][column] / matrix[column][column]
+            for k in range(column, n + 1):
+                matrix[row][k] -= factor * matrix[column][k]
+    solution = [0.0] * n
+    for row in range(n - 1, -1, -1):
+        total = matrix[row][n] - sum(matrix[row][k] * solution[k] for k in range(row + 1, n))
+        solution[row] = total / matrix[row][row]
+    return solution
+
+def evaluate(coefficients, x):
+    """Value of a polynomial (lowest power first) at x."""
+    value = 0.0
+    for c in reversed(coefficients):
+        value = value * x + c
+    return value
+
+# ============================ Correction table ============================
+def duty_to_degrees(duty):
+    """
+    Inverse of translate() without the clamp. translate() truncates, so the
+    duty stands for half a step above its value, as in untranslate_batch().
+    """
+    return ((duty + 0.5) * 20000 / 65535 - 500) * 180 / 2000
+
+def _unclamped_duty(angle):
+    """translate() without the PWM_MIN/PWM_MAX clamp (kept within 16 bits)."""
+    return max(0, min(65535, int((500 + (2500 - 500) * angle / 180) / 20000 * 65535)))
+
+class CorrectionTable:
+    """
+    Ideal duty -> corrected duty for the shoulder and elbow, one node every
+    2**shift duty steps over PWM_MIN..PWM_MAX, linearly interpolated. Nodes
+    are stored unclamped so the last cell interpolates correctly; results
+    are clamped to the safe PWM range.
+    """
+
+    def __init__(self, shoulder, elbow, shift=5):
+        self.shift = shift
+        self.mask = (1 << shift) - 1
+        self.shoulder = shoulder  # array('H') of corrected duties at the nodes
+        self.elbow = elbow
+
+    @classmethod
+    def from_functions(cls, shoulder, elbow, shift=5):
+        """Sample two angle -> commanded angle functions (degrees) at the table nodes."""
+        nodes = ((PWM_MAX - PWM_MIN) >> shift) + 2  # One past PWM_MAX, so interpolation never runs off the end
+        tables = []
+        for function in (shoulder, elbow):
+            table = array('H')
+            for i in range(nodes):
+                table.append(_unclamped_duty(function(duty_to_degrees(PWM_MIN + (i << shift)))))
+            tables.append(table)
+        return cls(tables[0], tables[1], shift)
+
+    @staticmethod
+    def _lookup(table, duty, shift, mask):
+        offset = duty - PWM_MIN
+        if offset < 0:
+            offset = 0
+        elif offset > PWM_MAX - PWM_MIN:
+            offset = PWM_MAX - PWM_MIN
+        i = offset >> shift
+        low = table[i]
+        duty = low + (((table[i + 1] - low) * (offset & mask)) >> shift)
+        return PWM_MIN if duty < PWM_MIN else PWM_MAX if duty > PWM_MAX else duty
+
+    def correct(self, shoulder, elbow):
+        """Corrected (shoulder, elbow) duties for the ideal ones."""
+        shift, mask = self.shift, self.mask
+        return self._lookup(self.shoulder, shoulder, shift, mask), self._lookup(self.elbow, elbow, shift, mask)
+
+    def correct_joint(self, joint, duty):
+        """Corrected duty for one joint (0 shoulder, 1 elbow)."""
+        return self._lookup(self.elbow if joint else self.shoulder, duty, self.shift, self.mask)
+
+# ============================ Calibration ============================
+class CalibrationModel:
+    """Per-joint polynomials: wanted angle -> angle to command (degrees)."""
+
+    def __init__(self, shoulder, elbow):
+        self.shoulder = list(shoulder)
+        self.elbow = list(elbow)
+
+    @classmethod
+    def identity(cls):
+        return cls([0.0, 1.0], [0.0, 1.0])
+
+    def command(self, shoulder, elbow):
+        """Angles to command so the joints end up at (shoulder, elbow)."""
+        return evaluate(self.shoulder, shoulder), evaluate(self.elbow, elbow)
+
+    def table(self, shift=5):
+        """Bake the model into a CorrectionTable."""
+        return CorrectionTable.from_functions(lambda a: evaluate(self.shoulder, a),
+                                              lambda a: evaluate(self.elbow, a), shift)
+
+class Calibration:
+    """Commanded joint angles and the pen positions they really produced."""
+
+    def __init__(self):
+        self.samples = []  # (commanded shoulder, commanded elbow, measured x, measured y)
+
+    def record(self, shoulder, elbow, x, y):
+        """Record that commanding (shoulder, elbow) degrees put the pen at (x, y) mm."""
+        self.samples.append((shoulder, elbow, x, y))
+
+    def record_position(self, x, y, measured_x, measured_y, elbow=1):
+        """Record a commanded pen position, solved with the given elbow branch."""
+        q1, q2 = inverse_kinematics(x, y, elbow)
+        self.record(math.degrees(q1), math.degrees(q2), measured_x, measured_y)
+
+    def actual_angles(self):
+        """Joint angles (degrees) each measured position needs, on the commanded elbow branch."""
+        angles = []
+        for shoulder, elbow, x, y in self.samples:
+            q1, q2 = inverse_kinematics(x, y, 1 if elbow >= 0 else -1)
+            q1 = math.degrees(q1)
+            q1 -= 360 * round((q1 - shoulder) / 360)  # atan2 wraps at 180, keep the turn nearest the command
+            angles.append((q1, math.degrees(q2)))
+        return angles
+
+    def fit(self, degree=1):
+        """
+        Least-squares fit, per joint, of the commanded angle against the
+        angle really reached, which is the correction to apply.
+        """
+        actual = self.actual_angles()
+        shoulder = polyfit([a[0] for a in actual], [s[0] for s in self.samples], degree)
+        elbow = polyfit([a[1] for a in actual], [s[1] for s in self.samples], degree)
+        return CalibrationModel(shoulder, elbow)
+
+    def errors(self, model=None):
+        """
+        Pen position errors (mm): between wanted and reached positions as
+        recorded, or, given a model, how far its fitted commands land from
+        the ones really needed (the fit residuals, in mm).
+        """
+        actual = self.actual_angles()
+        errors = []
+        for (shoulder, elbow, x, y), (actual_shoulder, actual_elbow) in zip(self.samples, actual):
+            if model is None:
+                wanted = forward_kinematics(math.radians(shoulder), math.radians(elbow))[2:]
+                errors.append(math.hypot(wanted[0] - x, wanted[1] - y))
+            else:
+                shoulder_command, elbow_command = model.command(actual_shoulder, actual_elbow)
+                predicted = forward_kinematics(math.radians(shoulder_command), math.radians(elbow_command))[2:]
+                commanded = forward_kinematics(math.radians(shoulder), math.radians(elbow))[2:]
+                errors.append(math.hypot(predicted[0] - commanded[0], predicted[1] - commanded[1]))
+        return errors
+
+    def report(self, model):
+        before, after = self.errors(), self.errors(model)
+        worst_before, worst_after = max(before), max(after)
+        rms_before = math.sqrt(sum(e * e for e in before) / len(before))
+        rms_after = math.sqrt(sum(e * e for e in after) / len(after))
+        return (f"Calibration: {len(self.samples)} points, error {rms_before:.2f} mm RMS ({worst_before:.2f} max) "
+                f"-> {rms_after:.2f} mm RMS ({worst_after:.2f} max) after correction")
+
+def run_calibration(write, measure, angles=CALIBRATION_ANGLES, degree=1, settle_s=1.0):
+    """
+    Drive the arm through angles with write(shoulder_duty, elbow_duty), ask
+    measure(expected_x, expected_y) where the pen really landed after each
+    move, and fit the correction. Returns (calibration, model).
+    """
+    calibration = Calibration()
+    for shoulder, elbow in angles:
+        write(translate(shoulder), translate(elbow))
+        time.sleep(settle_s)  # Let the servos settle
+        expected = forward_kinematics(math.radians(shoulder), math.radians(elbow))[2:]
+        x, y = measure(*expected)
+        calibration.record(shoulder, elbow, x, y)
+    return calibration, calibration.fit(degree)
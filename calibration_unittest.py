@@ -0,0 +1,103 @@
+import math
+import unittest
+
+import numpy as np
+
+import sim_machine
+from kinematics import PWM_MIN, PWM_MAX, forward_kinematics, translate
+from servo_bank import ServoBank, SHOULDER, ELBOW, WRIST
+from calibration import (polyfit, evaluate, duty_to_degrees, Calibration, CalibrationModel, run_calibration,
+                         CALIBRATION_ANGLES)
+
+# A servo pair that misses the ideal line: angle reached for the angle commanded
+def shoulder_reached(angle):
+    return 2.0 + 0.97 * angle + 0.0003 * (angle - 90) ** 2
+
+def elbow_reached(angle):
+    return -1.5 + 1.02 * angle
+
+def pen_position(shoulder, elbow):
+    return forward_kinematics(math.radians(shoulder_reached(shoulder)), math.radians(elbow_reached(elbow)))[2:]
+
+class TestCalibration(unittest.TestCase):
+    def test_polyfit_matches_numpy(self):
+        """Test the least-squares fit against numpy.polyfit"""
+        rng = np.random.default_rng(4)
+        xs = rng.uniform(20, 160, 40)
+        ys = 0.5 + 1.1 * xs - 0.002 * xs ** 2 + 1e-5 * xs ** 3 + rng.normal(0, 0.2, 40)
+        for degree in (1, 2, 3):
+            np.testing.assert_allclose(polyfit(xs.tolist(), ys.tolist(), degree), np.polyfit(xs, ys, degree)[::-1],
+                                       rtol=1e-6, atol=1e-9)
+        self.assertAlmostEqual(evaluate([1.0, 2.0, 3.0], 2.0), 17.0)
+        with self.assertRaises(ValueError):
+            polyfit([1.0, 1.0, 2.0], [1.0, 2.0, 3.0], 2)
+
+    def test_fit_corrects_servos(self):
+        """Test that commanding the fitted angles reaches the wanted ones"""
+        calibration = Calibration()
+        for shoulder, elbow in CALIBRATION_ANGLES:
+            calibration.record(shoulder, elbow, *pen_position(shoulder, elbow))
+        model = calibration.fit(degree=2)
+        for wanted in (45.0, 90.0, 125.0):
+            shoulder, elbow = model.command(wanted, wanted)
+            self.assertAlmostEqual(shoulder_reached(shoulder), wanted, places=2)
+            self.assertAlmostEqual(elbow_reached(elbow), wanted, places=2)
+        self.assertGreater(max(calibration.errors()), 5.0)
+        self.assertLess(max(calibration.errors(model)), 0.05)
+
+    def test_identity_table(self):
+        """Test that an uncalibrated table leaves every duty alone"""
+        table = CalibrationModel.identity().table()
+        for duty in range(PWM_MIN, PWM_MAX + 1):
+            self.assertEqual(table.correct(duty, duty), (duty, duty))
+        self.assertEqual(table.correct(0, 65535), (PWM_MIN, PWM_MAX))
+
+    def test_table_matches_model(self):
+        """Test that the interpolated table stays within a duty step of the model"""
+        model = CalibrationModel([1.0, 0.95, 0.0004], [-2.0, 1.03])
+        table = model.table()
+        self.assertLess(len(table.shoulder), 200)
+        for duty in range(PWM_MIN, PWM_MAX + 1, 7):
+            exact = [translate(a) for a in model.command(duty_to_degrees(duty), duty_to_degrees(duty))]
+            corrected = table.correct(duty, duty)
+            self.assertLessEqual(abs(corrected[0] - exact[0]), 1)
+            self.assertLessEqual(abs(corrected[1] - exact[1]), 1)
+
+    def test_servo_bank_hook(self):
+        """Test that the bank writes corrected duties and the wrist mirrors the corrected shoulder"""
+        sim_machine.reset()
+        table = CalibrationModel([0.0, 1.1], [5.0, 1.0]).table()
+        bank = ServoBank(sim_machine.PWM(0), sim_machine.PWM(1), sim_machine.PWM(2), correction=table)
+        bank.write(4000, 5000)
+        shoulder, elbow = table.correct(4000, 5000)
+        self.assertNotEqual((shoulder, elbow), (4000, 5000))
+        self.assertEqual(bank.last, [shoulder, elbow, shoulder])
+
+    def test_servo_bank_channel_hook(self):
+        """Test that single-channel writes are corrected too, so elision compares calibrated duties"""
+        sim_machine.reset()
+        table = CalibrationModel([0.0, 1.1], [5.0, 1.0]).table()
+        bank = ServoBank(sim_machine.PWM(0), sim_machine.PWM(1), sim_machine.PWM(2), correction=table)
+        bank.write(4000, 5000)
+        self.assertFalse(bank.write_channel(SHOULDER, 4000))
+        self.assertFalse(bank.write_channel(ELBOW, 5000))
+        self.assertTrue(bank.write_channel(ELBOW, 5500))
+        self.assertEqual(bank.last[ELBOW], table.correct(4000, 5500)[1])
+        self.assertTrue(bank.write_channel(WRIST, 4000))
+        self.assertEqual(bank.last[WRIST], 4000)  # The wrist has no correction
+
+    def test_run_calibration(self):
+        """Test the drive-measure-fit workflow against the simulated servos"""
+        written = []
+
+        def measure(expected_x, expected_y):
+            shoulder, elbow = written[-1]
+            return pen_position(duty_to_degrees(shoulder), duty_to_degrees(elbow))
+
+        calibration, model = run_calibration(lambda s, e: written.append((s, e)), measure, degree=2, settle_s=0)
+        self.assertEqual(len(written), len(CALIBRATION_ANGLES))
+        self.assertIn("after correction", calibration.report(model))
+        self.assertLess(max(calibration.errors(model)), 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
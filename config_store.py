@@ -0,0 +1,137 @@
+import os
+import struct
+from binascii import crc32
+
+# Persistent config: boundary points, page profile and servo calibration.
+# Everything lives in one small fixed-size binary record packed with struct:
+#
+#     header   magic "EASC", version, payload size, CRC32 of the payload
+#     payload  flags, boundary points, page profile, calibration polynomials
+#
+# Loading is one readinto() into a preallocated buffer and a struct unpack,
+# no text parsing. A missing, truncated, corrupt or old-version file gives
+# the defaults. Saving packs the record and only touches flash when the bytes
+# differ from what is already stored; the new record is written to a
+# temporary file and renamed over the old one, so a power cut mid-write
+# leaves the previous config intact.
+
+CONFIG_FILE = "config.bin"
+CONFIG_MAGIC = b"EASC"
+CONFIG_VERSION = 1
+MAX_COEFFICIENTS = 4  # Per joint, so calibration fits up to degree 3
+
+HEADER = "<4sHHI"
+PAYLOAD = "<B4f12s2fB4fB4f"
+HEADER_SIZE = struct.calcsize(HEADER)
+PAYLOAD_SIZE = struct.calcsize(PAYLOAD)
+RECORD_SIZE = HEADER_SIZE + PAYLOAD_SIZE
+
+# Flags: which optional parts of the record are set
+HAS_POINT1, HAS_POINT2, HAS_PAGE, HAS_CALIBRATION = 1, 2, 4, 8
+
+# MicroPython has no os.replace, but its rename replaces an existing target
+_replace = getattr(os, "replace", os.rename)
+
+class Config:
+    """
+    The persistent settings. point1/point2 are (x, y) in mm, page is
+    (name, width, height) and calibration is (shoulder, elbow) polynomial
+    coefficients as in calibration.CalibrationModel; each may be None.
+    """
+
+    __slots__ = ("point1", "point2", "page", "calibration")
+
+    def __init__(self, point1=None, point2=None, page=None, calibration=None):
+        self.point1 = point1
+        self.point2 = point2
+        self.page = page
+        self.calibration = calibration
+
+def _coefficients(values):
+    """Pad polynomial coefficients to MAX_COEFFICIENTS for packing."""
+    values = list(values)
+    if len(values) > MAX_COEFFICIENTS:
+        raise ValueError(f"Calibration polynomials can have at most {MAX_COEFFICIENTS} coefficients")
+    return [len(values)] + values + [0.0] * (MAX_COEFFICIENTS - len(values))
+
+def pack(config):
+    """The config as a complete record (header included)."""
+    flags = 0
+    point1, point2 = config.point1 or (0.0, 0.0), config.point2 or (0.0, 0.0)
+    page_name, page_width, page_height = config.page or ("", 0.0, 0.0)
+    shoulder, elbow = config.calibration or ((), ())
+    for part, flag in ((config.point1, HAS_POINT1), (config.point2, HAS_POINT2),
+                       (config.page, HAS_PAGE), (config.calibration, HAS_CALIBRATION)):
+        if part is not None:
+            flags |= flag
+    payload = struct.pack(PAYLOAD, flags, point1[0], point1[1], point2[0], point2[1],
+                          page_name.encode()[:12], page_width, page_height,
+                          *(_coefficients(shoulder) + _coefficients(elbow)))
+    return struct.pack(HEADER, CONFIG_MAGIC, CONFIG_VERSION, PAYLOAD_SIZE, crc32(payload)) + payload
+
+def unpack(record):
+    """Config from a record written by pack(). Raises ValueError if it is not a valid record."""
+    if len(record) != RECORD_SIZE:
+        raise ValueError("Config record is truncated")
+    magic, version, size, checksum = struct.unpack_from(HEADER, record)
+    if magic != CONFIG_MAGIC:
+        raise ValueError("Not a config file")
+    if version != CONFIG_VERSION or size != PAYLOAD_SIZE:
+        raise ValueError("Config file is from another version")
+    if crc32(memoryview(record)[HEADER_SIZE:]) != checksum:
+        raise ValueError("Config file is corrupt")
+    values = struct.unpack_from(PAYLOAD, record, HEADER_SIZE)
+    flags = values[0]
+    config = Config()
+    if flags & HAS_POINT1:
+        config.point1 = (values[1], values[2])
+    if flags & HAS_POINT2:
+        config.point2 = (values[3], values[4])
+    if flags & HAS_PAGE:
+        config.page = (values[5].rstrip(b"\0").decode(), values[6], values[7])
+    if flags & HAS_CALIBRATION:
+        shoulder_start = 9
+        elbow_start = shoulder_start + MAX_COEFFICIENTS + 1
+        config.calibration = (list(values[shoulder_start:shoulder_start + values[8]]),
+                              list(values[elbow_start:elbow_start + values[elbow_start - 1]]))
+    return config
+
+class ConfigStore:
+    """A config file that is read once at startup and written only when it changes."""
+
+    def __init__(self, path=CONFIG_FILE):
+        self.path = path
+        self.buffer = bytearray(RECORD_SIZE)
+        self.stored = None  # Record bytes known to be on flash
+        self.writes = 0
+        self.skipped = 0
+        self.error = None  # Why the last load fell back to the defaults
+
+    def load(self):
+        """The stored config, or the defaults if there is none or it is damaged."""
+        try:
+            with open(self.path, "rb") as f:
+                if f.readinto(self.buffer) != RECORD_SIZE:
+                    raise ValueError("Config record is truncated")
+            config = unpack(self.buffer)
+        except (OSError, ValueError) as e:
+            self.error = e
+            self.stored = None
+            return Config()
+        self.error = None
+        self.stored = bytes(self.buffer)
+        return config
+
+    def save(self, config):
+        """Store config atomically unless it is already stored. Returns True if flash was written."""
+        record = pack(config)
+        if record == self.stored:
+            self.skipped += 1
+            return False
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(record)
+        _replace(temporary, self.path)
+        self.stored = record
+        self.writes += 1
+        return True
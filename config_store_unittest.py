@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import config_store
+from config_store import Config, ConfigStore, pack, unpack, RECORD_SIZE
+
+def full_config():
+    return Config((-50.5, 120.25), (80.0, 200.0), ("A4", 210.0, 297.0), ([0.5, 0.98, 0.0002], [-1.25, 1.0]))
+
+class TestConfigStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that every field survives a save and a load"""
+        ConfigStore(self.path).save(full_config())
+        config = ConfigStore(self.path).load()
+        self.assertEqual(config.point1, (-50.5, 120.25))
+        self.assertEqual(config.point2, (80.0, 200.0))
+        self.assertEqual(config.page, ("A4", 210.0, 297.0))
+        shoulder, elbow = config.calibration
+        self.assertEqual(len(shoulder), 3)
+        for got, expected in zip(shoulder + elbow, [0.5, 0.98, 0.0002, -1.25, 1.0]):
+            self.assertAlmostEqual(got, expected, places=6)
+        self.assertEqual(os.path.getsize(self.path), RECORD_SIZE)
+
+    def test_unset_fields(self):
+        """Test that fields never set load as None"""
+        ConfigStore(self.path).save(Config(point1=(1.0, 2.0)))
+        config = ConfigStore(self.path).load()
+        self.assertEqual(config.point1, (1.0, 2.0))
+        self.assertIsNone(config.point2)
+        self.assertIsNone(config.page)
+        self.assertIsNone(config.calibration)
+
+    def test_missing_file(self):
+        """Test that a missing file gives the defaults"""
+        store = ConfigStore(self.path)
+        self.assertIsNone(store.load().point1)
+        self.assertIsInstance(store.error, OSError)
+
+    def test_write_only_on_change(self):
+        """Test that saving an unchanged config does not touch the file"""
+        store = ConfigStore(self.path)
+        config = full_config()
+        self.assertTrue(store.save(config))
+        os.remove(self.path)  # A rewrite would bring it back
+        self.assertFalse(store.save(config))
+        self.assertFalse(os.path.exists(self.path))
+        config.point1 = (0.0, 0.0)
+        self.assertTrue(store.save(config))
+        self.assertEqual((store.writes, store.skipped), (2, 1))
+
+    def test_loaded_config_is_not_rewritten(self):
+        """Test that a config just loaded counts as stored"""
+        ConfigStore(self.path).save(full_config())
+        store = ConfigStore(self.path)
+        self.assertFalse(store.save(store.load()))
+
+    def test_atomic_write(self):
+        """Test that saving leaves no temporary file and replaces the old record"""
+        store = ConfigStore(self.path)
+        store.save(full_config())
+        store.save(Config(point1=(1.0, 1.0)))
+        self.assertEqual(os.listdir(self.directory.name), ["config.bin"])
+        self.assertIsNone(ConfigStore(self.path).load().page)
+
+    def test_damaged_files(self):
+        """Test that corrupt, truncated and foreign files give the defaults"""
+        record = bytearray(pack(full_config()))
+        corrupt = bytearray(record)
+        corrupt[-3] ^= 0xFF
+        old_version = bytearray(record)
+        old_version[4] += 1
+        for data, message in ((corrupt, "corrupt"), (record[:-1], "truncated"),
+                              (old_version, "version"), (b"X" * RECORD_SIZE, "Not a config")):
+            with open(self.path, "wb") as f:
+                f.write(data)
+            store = ConfigStore(self.path)
+            self.assertIsNone(store.load().point1)
+            self.assertIn(message, str(store.error))
+
+    def test_too_many_coefficients(self):
+        """Test that a calibration the record can not hold is refused"""
+        with self.assertRaises(ValueError):
+            pack(Config(calibration=([0.0] * (config_store.MAX_COEFFICIENTS + 1), [0.0, 1.0])))
+        with self.assertRaises(ValueError):
+            unpack(b"")
+
+    def test_calibration_degree_checked_first(self):
+        """Test that calibrate_page refuses a degree the record can not hold before moving any servo"""
+        from page_calibration import calibrate_page
+        servos = mock.Mock()
+        servos.correction = "existing"
+        with self.assertRaises(ValueError):
+            calibrate_page(servos, degree=config_store.MAX_COEFFICIENTS)
+        servos.write.assert_not_called()
+        self.assertEqual(servos.correction, "existing")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+from scheduler import ticks_us, ticks_diff, ticks_add
+
+# Cooperative control runtime: the control program as asyncio tasks.
+# Input sampling, kinematics, servo output, the buttons and telemetry each run
+# as their own task (uasyncio on the Pico, asyncio on a PC), so a button
+# waiting out its debounce only pauses that button and the servos keep being
+# updated. Stages hand data on through BoundedQueues, which never block the
+# producer: when a queue is full its oldest item is dropped, because for
+# knob readings and servo targets only the newest one matters.
+#
+# Every task keeps latency metrics: periodic tasks record how late they woke
+# up against their deadline, queue consumers how long an item waited in the
+# queue, and both how long their step took.
+#
+#     runtime = ControlRuntime()
+#     knobs = BoundedQueue(4)
+#     runtime.periodic("sample", 50, sample_knobs)   # Puts readings into knobs
+#     runtime.consumer("kinematics", knobs, solve)
+#     runtime.button("point1", button_point1, set_point1, debounce_ms=500)
+#     runtime.run()
+
+_asyncio = None
+
+def _load_asyncio():
+    """asyncio, imported on first use: on CPython it is a large import the boot path does not need."""
+    global _asyncio
+    if _asyncio is None:
+        try:
+            import uasyncio as module
+        except ImportError:
+            import asyncio as module
+        _asyncio = module
+    return _asyncio
+
+async def _sleep_us(us):
+    asyncio = _load_asyncio()
+    if hasattr(asyncio, "sleep_ms"):
+        await asyncio.sleep_ms((us + 999) // 1000)  # Never wake before the deadline
+    else:
+        await asyncio.sleep(us / 1000000)
+
+class BoundedQueue:
+    """
+    Fixed-capacity FIFO between two tasks. put() never waits: a full queue
+    drops its oldest item. waited_us is how long the last item taken had
+    been queued.
+    """
+
+    def __init__(self, capacity=4):
+        if capacity < 1:
+            raise ValueError("Queue capacity must be at least 1")
+        self.capacity = capacity
+        self.items = [None] * capacity
+        self.stamps = [0] * capacity  # ticks_us when each item was put
+        self.head = 0  # Slot of the oldest item
+        self.count = 0
+        self.puts = 0
+        self.dropped = 0
+        self.high_water = 0  # Most items queued at once
+        self.waited_us = 0
+        self.event = None  # Created by the first get(), inside the event loop
+
+    def __len__(self):
+        return self.count
+
+    def put(self, item):
+        """Add an item, dropping the oldest one if the queue is full."""
+        if self.count == self.capacity:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            self.dropped += 1
+        slot = (self.head + self.count) % self.capacity
+        self.items[slot] = item
+        self.stamps[slot] = ticks_us()
+        self.count += 1
+        self.puts += 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        if self.event is not None:
+            self.event.set()
+
+    def get_nowait(self):
+        """The oldest item. Raises IndexError if the queue is empty."""
+        if not self.count:
+            raise IndexError("Queue is empty")
+        item = self.items[self.head]
+        self.waited_us = ticks_diff(ticks_us(), self.stamps[self.head])
+        self.items[self.head] = None
+        self.head = (self.head + 1) % self.capacity
+        self.count -= 1
+        return item
+
+    def latest(self):
+        """The newest item with everything older discarded, or None if the queue is empty."""
+        if not self.count:
+            return None
+        skipped = self.count - 1
+        self.head = (self.head + skipped) % self.capacity
+        self.count = 1
+        self.dropped += skipped
+        return self.get_nowait()
+
+    async def get(self):
+        """Wait for an item and return the oldest one."""
+        while not self.count:
+            if self.event is None:
+                self.event = _load_asyncio().Event()
+            self.event.clear()
+            await self.event.wait()
+        return self.get_nowait()
+
+    def stats(self):
+        return {"puts": self.puts, "dropped": self.dropped, "high_water": self.high_water}
+
+class TaskStats:
+    """Run count, latency and step time of one task, in microseconds."""
+
+    __slots__ = ("name", "runs", "overruns", "max_latency_us", "total_latency_us", "max_work_us", "total_work_us")
+
+    def __init__(self, name):
+        self.name = name
+        self.runs = 0
+        self.overruns = 0  # Periodic steps that ran past their next deadline
+        self.max_latency_us = 0
+        self.total_latency_us = 0
+        self.max_work_us = 0
+        self.total_work_us = 0
+
+    def add(self, latency, work):
+        self.runs += 1
+        if latency > self.max_latency_us:
+            self.max_latency_us = latency
+        self.total_latency_us += abs(latency)
+        if work > self.max_work_us:
+            self.max_work_us = work
+        self.total_work_us += work
+
+    def stats(self):
+        """The metrics gathered so far as a dict."""
+        runs = self.runs or 1
+        return {
+            "name": self.name,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "max_latency_us": self.max_latency_us,
+            "mean_latency_us": self.total_latency_us / runs,
+            "max_work_us": self.max_work_us,
+            "mean_work_us": self.total_work_us / runs,
+        }
+
+    def report(self):
+        """One-line summary of the metrics."""
+        stats = self.stats()
+        return (f"{stats['name']}: {stats['runs']} runs, {stats['overruns']} overruns, latency max "
+                f"{stats['max_latency_us']} us mean {stats['mean_latency_us']:.1f} us, step max "
+                f"{stats['max_work_us']} us mean {stats['mean_work_us']:.1f} us")
+
+class ControlRuntime:
+    """A set of cooperative control tasks, started together by run()."""
+
+    def __init__(self):
+        self.tasks = []  # (TaskStats, function returning the task's coroutine)
+        self.queues = {}
+
+    def periodic(self, name, rate_hz, step, phase_us=0):
+        """
+        Call step() at a fixed rate against absolute deadlines, starting
+        phase_us after the runtime starts. If step() returns a number of
+        microseconds, the task also sleeps that much longer before its next
+        deadline (a debounce, say) without holding up the other tasks.
+        """
+        if rate_hz <= 0:
+            raise ValueError("Rate must be positive")
+        stats = TaskStats(name)
+        period = int(1000000 // rate_hz)
+        self.tasks.append((stats, lambda: self._periodic(stats, step, period, phase_us)))
+        return stats
+
+    def consumer(self, name, queue, handler):
+        """Call handler(item) for every item put into queue."""
+        stats = TaskStats(name)
+        self.queues[name] = queue
+        self.tasks.append((stats, lambda: self._consumer(stats, queue, handler)))
+        return stats
+
+    def button(self, name, pin, handler, debounce_ms=500, rate_hz=50):
+        """Poll a push button and call handler(pin) while it is pressed, at most once per debounce_ms."""
+        debounce_us = debounce_ms * 1000
+
+        def poll():
+            if pin.value():
+                handler(pin)
+                return debounce_us
+            return 0
+        return self.periodic(name, rate_hz, poll)
+
+    async def _periodic(self, stats, step, period, phase):
+        deadline = ticks_add(ticks_us(), phase)
+        while True:
+            remaining = ticks_diff(deadline, ticks_us())
+            await _sleep_us(remaining if remaining > 0 else 0)
+            start = ticks_us()
+            hold = step()
+            end = ticks_us()
+            stats.add(ticks_diff(start, deadline), ticks_diff(end, start))
+            deadline = ticks_add(deadline, period + (hold or 0))
+            late = ticks_diff(end, deadline)
+            if late >= 0:
+                # Skip the deadlines already missed rather than running them back to back
+                stats.overruns += 1
+                deadline = ticks_add(deadline, (late // period + 1) * period)
+
+    async def _consumer(self, stats, queue, handler):
+        while True:
+            item = await queue.get()
+            start = ticks_us()
+            handler(item)
+            stats.add(queue.waited_us, ticks_diff(ticks_us(), start))
+
+    async def main(self, duration_s=None):
+        """Run every task, forever or for duration_s seconds. An exception in any task stops them all."""
+        asyncio = _load_asyncio()
+        tasks = [asyncio.create_task(start()) for _, start in self.tasks]
+        try:
+            if duration_s is None:
+                await asyncio.gather(*tasks)
+            else:
+                try:
+                    await asyncio.wait_for(asyncio.gather(*tasks), duration_s)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run(self, duration_s=None):
+        """Start the event loop and run the tasks (see main())."""
+        _load_asyncio().run(self.main(duration_s))
+
+    def stats(self):
+        """Metrics of every task, in the order they were added."""
+        return [stats.stats() for stats, _ in self.tasks]
+
+    def report(self):
+        """One line per task, plus the queues that dropped items."""
+        lines = [stats.report() for stats, _ in self.tasks]
+        for name, queue in self.queues.items():
+            lines.append(f"{name} queue: {queue.puts} items, {queue.dropped} dropped, "
+                         f"at most {queue.high_water} waiting")
+        return "\n".join(lines)
@@ -0,0 +1,116 @@
+import unittest
+
+import sim_machine
+from control_runtime import ControlRuntime, BoundedQueue
+
+class FakeButton:
+    def __init__(self, level):
+        self.level = level
+
+    def value(self):
+        return self.level
+
+class TestBoundedQueue(unittest.TestCase):
+    def test_drops_oldest(self):
+        """Test that a full queue drops its oldest item instead of blocking"""
+        queue = BoundedQueue(3)
+        for item in range(5):
+            queue.put(item)
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual(queue.high_water, 3)
+        self.assertEqual([queue.get_nowait() for _ in range(3)], [2, 3, 4])
+        with self.assertRaises(IndexError):
+            queue.get_nowait()
+
+    def test_latest(self):
+        """Test that latest() keeps only the newest item"""
+        queue = BoundedQueue(4)
+        self.assertIsNone(queue.latest())
+        for item in "abc":
+            queue.put(item)
+        self.assertEqual(queue.latest(), "c")
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.dropped, 2)
+
+    def test_capacity(self):
+        with self.assertRaises(ValueError):
+            BoundedQueue(0)
+
+class TestControlRuntime(unittest.TestCase):
+    def setUp(self):
+        self.clock = sim_machine.install(virtual_time=True)
+
+    def tearDown(self):
+        sim_machine.uninstall()
+
+    def test_periodic(self):
+        """Test that periodic tasks run on their deadlines, with their phase"""
+        runtime = ControlRuntime()
+        starts = []
+        sampler = runtime.periodic("sample", 50, lambda: starts.append(self.clock.now))
+        output = runtime.periodic("output", 50, lambda: None, phase_us=10000)
+        runtime.run(1.0)
+        self.assertEqual(sampler.runs, 50)
+        self.assertEqual(output.runs, 50)
+        for i, start in enumerate(starts):
+            self.assertAlmostEqual(start - starts[0], i * 0.02, places=5)
+        self.assertLessEqual(sampler.max_latency_us, 1)
+        self.assertEqual(sampler.overruns, 0)
+
+    def test_pipeline(self):
+        """Test that items flow through a queue to a consumer, with their waiting time measured"""
+        runtime = ControlRuntime()
+        readings, handled = BoundedQueue(4), []
+        runtime.periodic("sample", 50, lambda: readings.put(len(handled)))
+        kinematics = runtime.consumer("kinematics", readings, handled.append)
+        runtime.run(0.5)
+        self.assertEqual(handled, list(range(25)))
+        self.assertEqual(kinematics.runs, 25)
+        self.assertLessEqual(kinematics.max_latency_us, 1)
+        self.assertEqual(readings.dropped, 0)
+        self.assertIn("kinematics queue: 25 items, 0 dropped", runtime.report())
+
+    def test_debounce_does_not_stall(self):
+        """Test that a button waiting out its debounce does not hold up the servo task"""
+        runtime = ControlRuntime()
+        presses = []
+        servo = runtime.periodic("servo", 50, lambda: None)
+        runtime.button("point1", FakeButton(1), presses.append, debounce_ms=500)
+        runtime.run(1.0)
+        self.assertEqual(len(presses), 2)
+        self.assertEqual(servo.runs, 50)
+        self.assertLessEqual(servo.max_latency_us, 1)
+
+    def test_overrun(self):
+        """Test that a step running past its next deadline is counted and the missed deadlines skipped"""
+        runtime = ControlRuntime()
+        starts = []
+
+        def step():
+            starts.append(self.clock.now)
+            if len(starts) == 3:
+                self.clock.now += 0.05  # 2.5 periods of work
+        task = runtime.periodic("slow", 50, step)
+        runtime.run(0.2)
+        self.assertEqual(task.overruns, 1)
+        self.assertAlmostEqual(starts[3] - starts[0], 0.1, places=5)
+        self.assertEqual(task.stats()["max_work_us"], 50000)
+
+    def test_exception_stops_runtime(self):
+        """Test that an exception in one task ends the run"""
+        runtime = ControlRuntime()
+
+        def fail():
+            raise sim_machine.SimulationFinished("done")
+        runtime.periodic("fine", 50, lambda: None)
+        runtime.periodic("failing", 10, fail)
+        with self.assertRaises(sim_machine.SimulationFinished):
+            runtime.run()
+
+    def test_rate(self):
+        with self.assertRaises(ValueError):
+            ControlRuntime().periodic("bad", 0, lambda: None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,20 @@
 import machine
 import utime
+from knob_input import KnobInput, MEDIAN
 
 # assign/configure ADC pins for X and Y potentiometers
 adc_x = machine.ADC(26)  # ADC pin for X potentiometer =(GPIO 26)
 adc_y = machine.ADC(27)  # ADC pin for Y potentiometer =(GPIO 27)
 
+# oversample each pot 8 times and take the median of the last 5 readings to remove noise spikes
+knob_x = KnobInput(adc_x, oversample=8, mode=MEDIAN, median_window=5)
+knob_y = KnobInput(adc_y, oversample=8, mode=MEDIAN, median_window=5)
+
 # define a function to read ADC values and map them to servo angles for us to use later on 
 def read_potentiometers():
-    # read the raw ADC value (range from 0-65535 for 16-bit)
-    x_value = adc_x.read_u16()
-    y_value = adc_y.read_u16()
+    # read the filtered ADC value (range from 0-65535 for 16-bit)
+    x_value = knob_x.value
+    y_value = knob_y.value
     
     # map the raw values to a servo angle to hit all 0 to 180 degrees
     x_angle = int((x_value / 65535) * 180)
@@ -19,11 +24,12 @@ def read_potentiometers():
 
 # main loop(while ture)
 while True:
-    # read the potentiometer values given by reader and convert it into angles
-    x_angle, y_angle = read_potentiometers()
-    
-    # display/send angles to servos
-    print(f"X Angle: {x_angle}, Y Angle: {y_angle}")
+    # only convert and display the angles when a potentiometer has actually moved
+    if knob_x.poll() | knob_y.poll():
+        x_angle, y_angle = read_potentiometers()
+
+        # display/send angles to servos
+        print(f"X Angle: {x_angle}, Y Angle: {y_angle}")
     
     # delay for some stability
     utime.sleep(0.3)
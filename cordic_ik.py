@@ -0,0 +1,190 @@
+import math
+
+from kinematics import L1, L2
+
+try:
+    import micropython
+except ImportError:
+    class micropython:
+        """CPython stand-in: @micropython.native leaves the function unchanged."""
+
+        @staticmethod
+        def native(function):
+            return function
+from servo_translator import translate_cdeg
+
+# Integer-only inverse kinematics for boards without an FPU (the RP2040).
+# Positions come in as integers in 1/16 mm and angles go out as integer
+# centi-degrees, ready for servo_translator.translate_cdeg(), so a knob tick
+# does no software float at all. Every intermediate value stays below 2**30,
+# so MicroPython never allocates a big int.
+#
+# The elbow uses the half-angle form of the law of cosines, which stays well
+# conditioned even at full stretch or fully folded:
+#     tan(q2 / 2) = sqrt(((L1 + L2)^2 - r^2) / (r^2 - (L1 - L2)^2))
+# Angles are found with CORDIC: a vector is rotated towards the x axis by
+# +-atan(2^-i), i = 0..ITERATIONS-1, using only shifts and adds, and the
+# rotations applied add up to its angle. With equal links the shoulder offset
+# is exactly q2 / 2; otherwise (L2 cos q2, L2 sin q2) is built by CORDIC
+# rotation and its angle taken as in inverse_kinematics().
+#
+# Worst-case error against the float inverse_kinematics(), measured over the
+# whole workspace on a 0.5 mm grid (cordic_ik_unittest checks a coarser one):
+#     equal links (this arm, 155/155)   1.17 -> MAX_ERROR_CDEG = 2 centi-degrees
+#     unequal links (tried at 130/170)  3.77 -> MAX_ERROR_CDEG_UNEQUAL = 4,
+#                                       reached near the fully folded pose
+# Both are under one servo duty step (about 5.5 centi-degrees), so the duties
+# differ from the float pipeline by at most one step.
+#
+# The price is work per call: about 2000 bytecodes against 130 for the float
+# Kinematics kernel (cordic_ik_benchmark.py counts them). As plain bytecode
+# this is much slower than the float path, so it is not the default. The
+# CORDIC steps are marked @micropython.native (the decorator must be written
+# literally, as it is a compiler directive); whether native code makes them
+# faster than software float on the RP2040 has not been measured on the Pico.
+
+XY_SHIFT = 4  # Positions are in units of 1/16 mm
+ANGLE_SHIFT = 8  # CORDIC angles are in units of 1/256 centi-degree
+ITERATIONS = 16
+MAX_ERROR_CDEG = 2
+MAX_ERROR_CDEG_UNEQUAL = 4
+
+# atan(2^-i) in 1/256 centi-degree units, and 1/K (the CORDIC gain) in Q15
+ATAN_TABLE = tuple(int(round(math.degrees(math.atan(2.0 ** -i)) * 100 * (1 << ANGLE_SHIFT)))
+                   for i in range(ITERATIONS))
+def _gain():
+    gain = 1.0
+    for i in range(ITERATIONS):
+        gain *= math.sqrt(1 + 4.0 ** -i)
+    return gain
+
+GAIN_INVERSE_Q15 = int(round((1 << 15) / _gain()))
+
+HALF_TURN = 18000 << ANGLE_SHIFT
+QUARTER_TURN = 9000 << ANGLE_SHIFT
+NORMALIZED = 1 << 26  # Vectors are scaled up to about this size before CORDIC
+
+def isqrt(n):
+    """Integer square root (floor) by the digit-by-digit method, for 0 <= n < 2**30."""
+    root, bit = 0, 1 << 28
+    while bit >> 8 > n:
+        bit >>= 8
+    while bit > n:
+        bit >>= 2
+    while bit:
+        if n >= root + bit:
+            n -= root + bit
+            root = (root >> 1) + bit
+        else:
+            root >>= 1
+        bit >>= 2
+    return root
+
+@micropython.native
+def atan2_fixed(y, x):
+    """atan2 of integers, in 1/256 centi-degree units, by CORDIC vectoring."""
+    if x == 0 and y == 0:
+        return 0
+    # Fold the left half-plane onto the right one
+    offset = 0
+    if x < 0:
+        offset = HALF_TURN if y >= 0 else -HALF_TURN
+        x, y = -x, -y
+    # Scale up for precision (the shifts below drop the low bits), a byte at a time first
+    limit = NORMALIZED >> 8
+    while -limit < x < limit and -limit < y < limit:
+        x <<= 8
+        y <<= 8
+    while -NORMALIZED < x < NORMALIZED and -NORMALIZED < y < NORMALIZED:
+        x <<= 1
+        y <<= 1
+    angle = 0
+    for i in range(ITERATIONS):
+        if y > 0:
+            x, y = x + (y >> i), y - (x >> i)
+            angle += ATAN_TABLE[i]
+        else:
+            x, y = x - (y >> i), y + (x >> i)
+            angle -= ATAN_TABLE[i]
+    return offset + angle
+
+def rotation_start(length):
+    """The starting x for rotate_fixed(), length divided by the CORDIC gain (computed once per arm)."""
+    return (length * GAIN_INVERSE_Q15) >> 15
+
+@micropython.native
+def rotate_fixed(start, angle):
+    """
+    (length cos angle, length sin angle) by CORDIC rotation, with start =
+    rotation_start(length) and the angle in 1/256 centi-degree units.
+    """
+    x, y = start, 0
+    # Bring the angle into the +-99 degree CORDIC range with a quarter turn
+    if angle > QUARTER_TURN:
+        x, y, angle = 0, x, angle - QUARTER_TURN
+    elif angle < -QUARTER_TURN:
+        x, y, angle = 0, -x, angle + QUARTER_TURN
+    for i in range(ITERATIONS):
+        if angle > 0:
+            x, y = x - (y >> i), y + (x >> i)
+            angle -= ATAN_TABLE[i]
+        else:
+            x, y = x + (y >> i), y - (x >> i)
+            angle += ATAN_TABLE[i]
+    return x, y
+
+def to_fixed(mm):
+    """Millimetres to the integer 1/16 mm units used here (host side helper)."""
+    return int(round(mm * (1 << XY_SHIFT)))
+
+def knob_to_fixed(knob1_value, knob2_value):
+    """kinematics.knob_to_xy() in integers: the (x, y) target in 1/16 mm for two knob readings."""
+    reach = (L1 + L2) << XY_SHIFT
+    return reach - (2 * reach * knob1_value) // 65535, reach - (reach * knob2_value) // 65535
+
+class CordicKinematics:
+    """Integer inverse kinematics for one arm geometry, angles in centi-degrees."""
+
+    __slots__ = ("l1", "l2", "elbow", "symmetric", "reach_squared", "inner_squared", "l1_scaled", "l2_start")
+
+    def __init__(self, l1=L1, l2=L2, elbow=-1):
+        if ((l1 + l2) << XY_SHIFT) ** 2 << 5 >= 1 << 30:
+            raise ValueError("Arm too long for 30-bit fixed point")
+        self.l1, self.l2 = l1, l2
+        self.elbow = elbow
+        self.symmetric = l1 == l2
+        self.reach_squared = ((l1 + l2) << XY_SHIFT) ** 2
+        self.inner_squared = ((l1 - l2) << XY_SHIFT) ** 2
+        self.l1_scaled = l1 << 12  # Links in 1/4096 mm for the rotation step
+        self.l2_start = rotation_start(l2 << 12)
+
+    @micropython.native
+    def inverse_cdeg(self, x, y):
+        """
+        Shoulder and elbow angles in integer centi-degrees for (x, y) in
+        1/16 mm, the same solution as inverse_kinematics().
+        """
+        r_squared = x * x + y * y
+        if r_squared > self.reach_squared:
+            raise ValueError("Target is out of reach")
+        if r_squared < self.inner_squared:
+            raise ValueError("Target is too close")
+        # Half-angle law of cosines; both terms are below 2**25, so << 5 is safe
+        half_q2 = atan2_fixed(isqrt((self.reach_squared - r_squared) << 5),
+                              isqrt((r_squared - self.inner_squared) << 5))
+        if self.elbow < 0:
+            half_q2 = -half_q2
+        q2 = 2 * half_q2
+        if self.symmetric:
+            offset = half_q2  # Isosceles link triangle
+        else:
+            c, s = rotate_fixed(self.l2_start, q2)
+            offset = atan2_fixed(s, self.l1_scaled + c)
+        q1 = atan2_fixed(y, x) - offset
+        half = 1 << (ANGLE_SHIFT - 1)
+        return (q1 + half) >> ANGLE_SHIFT, (q2 + half) >> ANGLE_SHIFT
+
+    def duties(self, x, y):
+        """Servo duties (shoulder, elbow) for (x, y) in 1/16 mm, with integers only."""
+        q1, q2 = self.inverse_cdeg(x, y)
+        return translate_cdeg(q1), translate_cdeg(q2)
@@ -0,0 +1,75 @@
+import math
+import sys
+
+from kinematics_benchmark import workspace_grid, timer_overhead, time_calls
+
+# Benchmark: the integer CORDIC solver in cordic_ik.py against the float
+# Kinematics kernel, from a target position to the two servo duties.
+# CPython has a hardware FPU and a fast math module, so the wall-clock rates
+# here favour the float path; the RP2040 has neither. The bytecode count per
+# call (and whether any float is created at all) is the better guide to the
+# Pico, where every float operation is a software routine and a heap object.
+# Usage: python cordic_ik_benchmark.py [grid_step_mm]
+
+def float_pipeline():
+    from kinematics import Kinematics, translate
+    arm = Kinematics()
+
+    def duties(x, y):
+        q1, q2 = arm.inverse(x, y)
+        return translate(math.degrees(q1)), translate(math.degrees(q2))
+    return duties
+
+def cordic_pipeline():
+    from cordic_ik import CordicKinematics
+    return CordicKinematics().duties
+
+def trace_call(function, arguments):
+    """(bytecodes executed, float locals seen line by line) for one call."""
+    counts = [0, 0]
+
+    def tracer(frame, event, arg):
+        frame.f_trace_opcodes = True
+        if event == "opcode":
+            counts[0] += 1
+        elif event == "line" or event == "return":
+            counts[1] += sum(1 for value in frame.f_locals.values() if type(value) is float)
+            if event == "return" and type(arg) is float:
+                counts[1] += 1
+        return tracer
+
+    sys.settrace(tracer)
+    try:
+        function(*arguments)
+    except ValueError:
+        pass
+    finally:
+        sys.settrace(None)
+    return counts
+
+def main():
+    from cordic_ik import to_fixed
+    step = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    points = workspace_grid(step, 310.0)
+    fixed_points = [(to_fixed(x), to_fixed(y)) for x, y in points]
+    overhead = timer_overhead()
+    rows = [("float Kinematics + translate", float_pipeline(), points),
+            ("integer CordicKinematics.duties", cordic_pipeline(), fixed_points)]
+    print(f"(x, y) -> duties over {len(points)} points on a {step} mm grid")
+    print(f"{'pipeline':34s} {'calls/s':>11s} {'p99 us':>8s} {'worst us':>9s} {'bytecodes':>10s} {'float locals':>13s}")
+    results = []
+    for label, function, arguments in rows:
+        rate, worst, p99, duties = time_calls(function, arguments, overhead)
+        sample = arguments[::max(1, len(arguments) // 200)]
+        traces = [trace_call(function, point) for point in sample]
+        bytecodes = sum(trace[0] for trace in traces) / len(traces)
+        floats = sum(trace[1] for trace in traces) / len(traces)
+        results.append(duties)
+        print(f"{label:34s} {rate:>11,.0f} {p99 / 1000:>8.2f} {worst / 1000:>9.2f} {bytecodes:>10.0f} {floats:>13.1f}")
+    differences = [max(abs(a - b) for a, b in zip(float_duties, cordic_duties))
+                   for float_duties, cordic_duties in zip(*results)
+                   if float_duties is not None and cordic_duties is not None]
+    print(f"Largest duty difference: {max(differences)} step(s)")
+
+if __name__ == "__main__":
+    main()
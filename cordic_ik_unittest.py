@@ -0,0 +1,143 @@
+import ast
+import math
+import random
+import sys
+import unittest
+
+import cordic_ik
+from cordic_ik import (CordicKinematics, isqrt, atan2_fixed, rotate_fixed, rotation_start, to_fixed,
+                       knob_to_fixed, MAX_ERROR_CDEG, MAX_ERROR_CDEG_UNEQUAL, ANGLE_SHIFT)
+from kinematics import Kinematics, translate, knob_to_xy
+
+def workspace(reach, step):
+    points = []
+    y = -reach
+    while y <= reach:
+        x = -reach
+        while x <= reach:
+            points.append((x, y))
+            x += step
+        y += step
+    return points
+
+def to_cdeg(fixed):
+    return fixed / (1 << ANGLE_SHIFT)
+
+class TestCordicIK(unittest.TestCase):
+    def test_isqrt(self):
+        """Test the integer square root against math.isqrt"""
+        rng = random.Random(5)
+        for n in [0, 1, 2, 3, 4, 15, 16, 17, (1 << 30) - 1] + [rng.randrange(1 << 30) for _ in range(2000)]:
+            self.assertEqual(isqrt(n), math.isqrt(n), n)
+
+    def test_atan2(self):
+        """Test CORDIC atan2 in every quadrant"""
+        rng = random.Random(6)
+        for _ in range(2000):
+            x, y = rng.randint(-5000, 5000), rng.randint(-5000, 5000)
+            if x == 0 and y == 0:
+                continue
+            expected = math.degrees(math.atan2(y, x)) * 100
+            error = math.remainder(to_cdeg(atan2_fixed(y, x)) - expected, 36000)
+            self.assertLess(abs(error), 0.5, (x, y))
+
+    def test_rotate(self):
+        """Test that CORDIC rotation builds (L cos a, L sin a)"""
+        length = 155 << 12
+        for degrees in range(-180, 181, 7):
+            x, y = rotate_fixed(rotation_start(length), (degrees * 100) << ANGLE_SHIFT)
+            self.assertLess(abs(x - length * math.cos(math.radians(degrees))), 40)
+            self.assertLess(abs(y - length * math.sin(math.radians(degrees))), 40)
+
+    def check_error(self, l1, l2, elbow, bound, step=3.0):
+        cordic, reference = CordicKinematics(l1, l2, elbow), Kinematics(l1, l2, elbow)
+        worst = 0.0
+        for x, y in workspace(l1 + l2, step):
+            fx, fy = to_fixed(x), to_fixed(y)
+            try:
+                expected = reference.inverse(fx / 16, fy / 16)
+            except ValueError:
+                self.assertRaises(ValueError, cordic.inverse_cdeg, fx, fy)
+                continue
+            q1, q2 = cordic.inverse_cdeg(fx, fy)
+            worst = max(worst, abs(math.remainder(q1 - math.degrees(expected[0]) * 100, 36000)),
+                        abs(q2 - math.degrees(expected[1]) * 100))
+        self.assertLessEqual(worst, bound)
+
+    def test_error_bound(self):
+        """Test the documented worst-case angular error against the float solver"""
+        self.check_error(155, 155, -1, MAX_ERROR_CDEG)
+        self.check_error(155, 155, 1, MAX_ERROR_CDEG)
+        self.check_error(130, 170, -1, MAX_ERROR_CDEG_UNEQUAL)
+
+    def test_duties(self):
+        """Test that duties are within one step of the float pipeline"""
+        arm, reference = CordicKinematics(), Kinematics()
+        for x, y in workspace(310, 9.0):
+            try:
+                q1, q2 = reference.inverse(x, y)
+            except ValueError:
+                continue
+            shoulder, elbow = arm.duties(to_fixed(x), to_fixed(y))
+            self.assertLessEqual(abs(shoulder - translate(math.degrees(q1))), 1)
+            self.assertLessEqual(abs(elbow - translate(math.degrees(q2))), 1)
+
+    def test_knob_to_fixed(self):
+        """Test the integer knob mapping against knob_to_xy"""
+        for knob1, knob2 in ((0, 0), (65535, 65535), (12345, 54321), (32768, 100)):
+            x, y = knob_to_fixed(knob1, knob2)
+            ex, ey = knob_to_xy(knob1, knob2)
+            self.assertLessEqual(abs(x / 16 - ex), 1 / 16)
+            self.assertLessEqual(abs(y / 16 - ey), 1 / 16)
+
+    def test_small_integers(self):
+        """Test that no intermediate value reaches 2**30 (a MicroPython big int)"""
+        largest = [0]
+
+        def tracer(frame, event, arg):
+            if frame.f_code.co_filename == cordic_ik.__file__:
+                for value in frame.f_locals.values():
+                    if type(value) is int:
+                        largest[0] = max(largest[0], abs(value))
+            return tracer
+
+        arms = [CordicKinematics(), CordicKinematics(130, 170)]
+        sys.settrace(tracer)
+        try:
+            for x, y in workspace(310, 20.0) + [(310, 0), (0, -310), (-219, 219)]:
+                for arm in arms:
+                    try:
+                        arm.inverse_cdeg(to_fixed(x), to_fixed(y))
+                    except ValueError:
+                        pass
+        finally:
+            sys.settrace(None)
+        self.assertLess(largest[0], 1 << 30)
+
+    def test_limits(self):
+        """Test out of reach, too close and oversized arms"""
+        with self.assertRaises(ValueError):
+            CordicKinematics().inverse_cdeg(to_fixed(311), 0)
+        with self.assertRaises(ValueError):
+            CordicKinematics(130, 170).inverse_cdeg(to_fixed(10), to_fixed(10))
+        with self.assertRaises(ValueError):
+            CordicKinematics(200, 200)
+        self.assertEqual(CordicKinematics().inverse_cdeg(to_fixed(310), 0), (0, 0))
+
+    def test_native_decorators(self):
+        """
+        Test that the CORDIC steps use the literal @micropython.native directive
+        (the only form the MicroPython compiler honours). Only the CPython
+        stand-in runs here; native compilation on the Pico is unverified.
+        """
+        with open(cordic_ik.__file__) as f:
+            tree = ast.parse(f.read())
+        decorated = {node.name: [ast.unparse(d) for d in node.decorator_list]
+                     for node in ast.walk(tree) if isinstance(node, ast.FunctionDef) and node.decorator_list}
+        self.assertEqual(decorated, {"atan2_fixed": ["micropython.native"], "rotate_fixed": ["micropython.native"],
+                                     "inverse_cdeg": ["micropython.native"], "native": ["staticmethod"]})
+        function = lambda: 1
+        self.assertIs(cordic_ik.micropython.native(function), function)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import math
+from array import array
+
+from kinematics import L1, L2, inverse_kinematics, translate, knob_to_xy
+
+# Knob lookup table: maps quantized knob readings straight to servo duties.
+# Built once at startup (or loaded from flash) so the control loop does a
+# table lookup with integer bilinear interpolation instead of trig.
+
+TABLE_MAGIC = 0x4B54  # "KT", marks a saved table file
+
+class KnobDutyTable:
+    """
+    Grid of (shoulder_duty, elbow_duty) pairs indexed by the top `bits` bits of
+    each 16-bit knob reading. Unreachable grid nodes store a duty of 0, which
+    translate() can never return.
+    """
+
+    def __init__(self, bits=6, tolerance=8):
+        if not 1 <= bits <= 10:
+            raise ValueError("Table resolution must be between 1 and 10 bits")
+        self.bits = bits
+        self.shift = 16 - bits
+        self.mask = (1 << self.shift) - 1
+        self.size = (1 << bits) + 1  # Grid nodes per axis, last node sits past 65535
+        self.tolerance = tolerance  # Largest interpolation error (duty steps) a cell may have
+        self.table = array('H', bytes(2 * 2 * self.size * self.size))
+        self.exact_cells = bytearray((1 << bits) * (1 << bits))  # 1 = interpolation too coarse
+
+    def build(self):
+        """Fill the table by running the inverse kinematics at every grid node."""
+        table, size, shift = self.table, self.size, self.shift
+        for j in range(size):
+            for i in range(size):
+                shoulder_duty, elbow_duty, _ = self.solve(min(i << shift, 65535), min(j << shift, 65535))
+                index = 2 * (j * size + i)
+                table[index] = shoulder_duty
+                table[index + 1] = elbow_duty
+        self.mark_exact_cells()
+        return self
+
+    def mark_exact_cells(self):
+        """
+        Flag the cells where bilinear interpolation misses the trig result by
+        more than the tolerance (next to the base the shoulder angle swings too
+        quickly to interpolate). Lookups in flagged cells are solved exactly.
+        """
+        cells, shift, tolerance = 1 << self.bits, self.shift, self.tolerance
+        half, quarter = 1 << (shift - 1), 1 << (shift - 2)
+        for j in range(cells):
+            for i in range(cells):
+                self.exact_cells[j * cells + i] = 0
+                for dx, dy in ((half, half), (quarter, quarter), (3 * quarter, quarter),
+                               (quarter, 3 * quarter), (3 * quarter, 3 * quarter)):
+                    knob1_value, knob2_value = (i << shift) + dx, (j << shift) + dy
+                    shoulder, elbow, reachable = self.lookup(knob1_value, knob2_value)
+                    if not reachable:
+                        break
+                    exact_shoulder, exact_elbow, _ = self.solve(knob1_value, knob2_value)
+                    if abs(shoulder - exact_shoulder) > tolerance or abs(elbow - exact_elbow) > tolerance:
+                        self.exact_cells[j * cells + i] = 1
+                        break
+
+    def lookup(self, knob1_value, knob2_value):
+        """
+        Return (shoulder_duty, elbow_duty, reachable) for two raw knob readings.
+        A cell only counts as reachable when all four of its corners are, so
+        positions right on the edge of the workspace are rejected rather than
+        interpolated towards a duty of 0. Cells flagged by mark_exact_cells()
+        are solved exactly instead.
+        """
+        shift, mask, size, table = self.shift, self.mask, self.size, self.table
+        i, fx = knob1_value >> shift, knob1_value & mask
+        j, fy = knob2_value >> shift, knob2_value & mask
+        index = 2 * (j * size + i)
+        below = index + 2 * size
+
+        s00, e00 = table[index], table[index + 1]
+        s10, e10 = table[index + 2], table[index + 3]
+        s01, e01 = table[below], table[below + 1]
+        s11, e11 = table[below + 2], table[below + 3]
+        if not (s00 and s10 and s01 and s11):
+            return 0, 0, False
+        if self.exact_cells[(j << self.bits) + i]:
+            return self.solve(knob1_value, knob2_value)
+
+        # Interpolate along x on both rows, then along y
+        s0 = s00 + (((s10 - s00) * fx) >> shift)
+        s1 = s01 + (((s11 - s01) * fx) >> shift)
+        e0 = e00 + (((e10 - e00) * fx) >> shift)
+        e1 = e01 + (((e11 - e01) * fx) >> shift)
+        return s0 + (((s1 - s0) * fy) >> shift), e0 + (((e1 - e0) * fy) >> shift), True
+
+    def solve(self, knob1_value, knob2_value):
+        """Exact (trig) duties for one knob position, used where the table is too coarse."""
+        try:
+            q1, q2 = inverse_kinematics(*knob_to_xy(knob1_value, knob2_value))
+        except ValueError:
+            return 0, 0, False
+        return translate(math.degrees(q1)), translate(math.degrees(q2)), True
+
+    def save(self, path):
+        """Store the table in a file so the next boot can skip the build."""
+        with open(path, 'wb') as f:
+            f.write(array('H', [TABLE_MAGIC, self.bits, self.tolerance, L1, L2]))
+            f.write(self.table)
+            f.write(self.exact_cells)
+
+    @classmethod
+    def load(cls, path):
+        """Load a table written by save(). Raises ValueError if it does not match this arm."""
+        header = array('H', [0, 0, 0, 0, 0])
+        with open(path, 'rb') as f:
+            f.readinto(header)
+            if header[0] != TABLE_MAGIC or header[3] != L1 or header[4] != L2:
+                raise ValueError("Knob table does not match this arm")
+            knob_table = cls(header[1], header[2])
+            if (f.readinto(knob_table.table) != 2 * len(knob_table.table)
+                    or f.readinto(knob_table.exact_cells) != len(knob_table.exact_cells)):
+                raise ValueError("Knob table file is truncated")
+        return knob_table
+
+    @classmethod
+    def load_or_build(cls, path, bits=6, tolerance=8):
+        """Load the table from flash, or build it and save it for next time."""
+        try:
+            knob_table = cls.load(path)
+            if knob_table.bits == bits and knob_table.tolerance == tolerance:
+                return knob_table
+        except (OSError, ValueError):
+            pass
+        knob_table = cls(bits, tolerance).build()
+        try:
+            knob_table.save(path)
+        except OSError:
+            pass  # Read-only filesystem, keep the table in RAM only
+        return knob_table
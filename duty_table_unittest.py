@@ -0,0 +1,58 @@
+import math
+import os
+import tempfile
+import unittest
+
+from kinematics import inverse_kinematics, translate, knob_to_xy, xy_to_knob
+from duty_table import KnobDutyTable
+
+def exact_duties(knob1_value, knob2_value):
+    x, y = knob_to_xy(knob1_value, knob2_value)
+    q1, q2 = inverse_kinematics(x, y)
+    return translate(math.degrees(q1)), translate(math.degrees(q2))
+
+class TestKnobDutyTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.knob_table = KnobDutyTable(6).build()
+
+    def test_grid_nodes_exact(self):
+        """Test that lookups on grid nodes return the exact duties"""
+        for knob1_value in range(0, 65536, 4096):
+            for knob2_value in range(0, 65536, 4096):
+                shoulder, elbow, reachable = self.knob_table.lookup(knob1_value, knob2_value)
+                if reachable:
+                    self.assertEqual((shoulder, elbow), exact_duties(knob1_value, knob2_value))
+
+    def test_interpolation_error(self):
+        """Test that interpolated duties stay close to the trig result"""
+        worst = 0
+        for knob1_value in range(517, 65536, 1531):
+            for knob2_value in range(263, 65536, 1777):
+                shoulder, elbow, reachable = self.knob_table.lookup(knob1_value, knob2_value)
+                if not reachable:
+                    continue
+                exact_shoulder, exact_elbow = exact_duties(knob1_value, knob2_value)
+                worst = max(worst, abs(shoulder - exact_shoulder), abs(elbow - exact_elbow))
+        # Interpolation error can exceed the per-cell tolerance a little between samples
+        self.assertLessEqual(worst, 2 * self.knob_table.tolerance)
+
+    def test_unreachable(self):
+        """Test that a knob position outside the arm's reach is flagged"""
+        self.assertFalse(self.knob_table.lookup(0, 65535)[2])
+        self.assertEqual(knob_to_xy(0, 65535), (310.0, 0.0))
+        self.assertEqual(xy_to_knob(310, 0), (0, 65535))
+
+    def test_save_and_load(self):
+        """Test that a saved table loads back identically"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "knob_table.bin")
+            self.knob_table.save(path)
+            loaded = KnobDutyTable.load_or_build(path, 6)
+            self.assertEqual(loaded.table, self.knob_table.table)
+            self.assertEqual(loaded.exact_cells, self.knob_table.exact_cells)
+            rebuilt = KnobDutyTable.load_or_build(path, 4)
+            self.assertEqual(rebuilt.bits, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# The arm code as one package, without import-time side effects.
+# The modules stay flat at the top of the tree, because that is how they are
+# copied to the Pico and how the scripts import them. This package groups
+# what they export by role and imports each module the first time one of its
+# names is used, so `import etch_a_sketch` costs next to nothing and
+# machine, numpy and matplotlib only load when code that needs them runs.
+#
+#     import etch_a_sketch as eas
+#     q1, q2 = eas.inverse_kinematics(100, 200)  # Loads kinematics only
+#     eas.WorkspaceMap()                          # Loads numpy here
+
+_EXPORTS = {}
+
+def _export(module, *names):
+    for name in names:
+        _EXPORTS[name] = module
+
+# Kinematics
+_export("kinematics", "L1", "L2", "Kinematics", "inverse_kinematics", "forward_kinematics", "knob_to_xy", "xy_to_knob")
+
+# Translation: angles -> servo duties
+_export("kinematics", "PWM_MIN", "PWM_MAX", "DUTY_PER_DEGREE", "PEN_RESOLUTION", "translate")
+_export("servo_translator", "translate_cdeg")
+_export("cordic_ik", "CordicKinematics")
+_export("duty_table", "KnobDutyTable")
+_export("calibration", "Calibration", "CalibrationModel", "CorrectionTable", "run_calibration")
+
+# Input
+_export("knob_input", "KnobInput")
+_export("gcode", "GCodeError", "plot_job")
+_export("svg_import", "load_svg", "polyline_source")
+
+# Motion planning
+_export("motion_profile", "MotionLimiter", "TrapezoidalProfile")
+_export("motion_pipeline", "line_source", "path_source", "interpolate", "solve_ik", "to_duty", "timed_sink", "plot_path")
+_export("simplify", "simplify", "simplify_polyline")
+_export("stroke_order", "optimize")
+_export("page_placement", "PageProfile", "Placement", "A4", "LETTER", "place")
+
+# Output and runtime (machine is imported when the pins are created)
+_export("servo_bank", "ServoBank")
+_export("scheduler", "FixedRateScheduler")
+_export("control_runtime", "ControlRuntime", "BoundedQueue")
+_export("telemetry", "Telemetry")
+_export("config_store", "Config", "ConfigStore")
+
+# Host tools (numpy, and matplotlib for rendering)
+_export("batch_kinematics", "inverse_kinematics_batch", "forward_kinematics_batch", "translate_batch",
+        "untranslate_batch", "solve_path")
+_export("workspace_map", "WorkspaceMap", "ELBOW_DOWN", "ELBOW_UP")
+_export("offline_render", "DutyRecorder", "render")
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module 'etch_a_sketch' has no attribute {name!r}") from None
+    value = getattr(__import__(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
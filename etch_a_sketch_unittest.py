@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import etch_a_sketch
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must import without side effects or heavy dependencies
+LIBRARY_MODULES = ["kinematics", "servo_translator", "duty_table", "knob_input", "motion_profile",
+                   "motion_pipeline", "scheduler", "telemetry", "servo_bank", "gcode", "svg_import",
+                   "stroke_order", "simplify", "calibration", "config_store", "page_placement",
+                   "page_calibration", "etch_a_sketch"]
+
+def run(code):
+    """Run code in a fresh interpreter in the repository, returning its output."""
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True, capture_output=True, text=True)
+    return result.stdout
+
+HEAVY = "sorted({m.split('.')[0] for m in sys.modules} & {'numpy', 'matplotlib', 'machine'})"
+
+class TestPackage(unittest.TestCase):
+    def test_imports_are_light(self):
+        """Test that importing the library loads no machine, numpy or matplotlib and prints nothing"""
+        for module in LIBRARY_MODULES:
+            output = run(f"import sys, io; sys.stdout = io.StringIO(); import {module}; "
+                         f"printed = sys.stdout.getvalue(); sys.stdout = sys.__stdout__; print({HEAVY}, repr(printed))")
+            self.assertEqual(output.strip(), "[] ''", module)
+
+    def test_scripts_import_without_hardware(self):
+        """Test that the scripts with a main() only touch hardware when run"""
+        output = run("import sys, importlib.util\n"
+                     "spec = importlib.util.spec_from_file_location('final_testing', 'Final_testing_InverseK(James).py')\n"
+                     "module = importlib.util.module_from_spec(spec)\n"
+                     "spec.loader.exec_module(module)\n"
+                     f"print({HEAVY}, callable(module.main))")
+        self.assertEqual(output.strip(), "[] True")
+
+    def test_lazy_exports(self):
+        """Test that a module is imported the first time one of its names is used"""
+        output = run("import sys, etch_a_sketch\n"
+                     "print('kinematics' in sys.modules)\n"
+                     "etch_a_sketch.translate(90)\n"
+                     f"print('kinematics' in sys.modules, {HEAVY})\n"
+                     "etch_a_sketch.WorkspaceMap\n"
+                     f"print({HEAVY})")
+        self.assertEqual(output.split("\n")[:3], ["False", "True []", "['numpy']"])
+
+    def test_exports(self):
+        """Test that every export resolves to the name in its module"""
+        import kinematics
+        self.assertIs(etch_a_sketch.inverse_kinematics, kinematics.inverse_kinematics)
+        for name, module in etch_a_sketch._EXPORTS.items():
+            self.assertIs(getattr(etch_a_sketch, name), getattr(__import__(module), name))
+        self.assertIn("ServoBank", dir(etch_a_sketch))
+        with self.assertRaises(AttributeError):
+            etch_a_sketch.not_a_name
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import math
+
+from motion_pipeline import solve_ik, to_duty, timed_sink
+from motion_profile import limit_motion
+
+# Streaming G-code interpreter for plot jobs.
+# Supported subset (one command per line, comments after ';' or in brackets):
+#     G0 / G1 X.. Y.. F..   rapid / feed move, modal like real G-code
+#     G4 P<ms> or S<s>      dwell
+#     M3 / M5               pen down / pen up (a Z word works too: Z <= 0 is down)
+#     G20 / G21             inches / millimetres
+#     G90 / G91             absolute / relative coordinates
+# A job is read one line at a time and flows through generators, so memory
+# stays bounded however large the job file is:
+#     read_lines -> parse -> job_points -> solve_ik -> to_duty -> timed_sink
+
+MOVE, PEN, DWELL = 0, 1, 2
+
+DEFAULT_FEED = 600  # mm/min for G1 moves before any F word
+RAPID_FEED = 3000  # mm/min for G0 moves
+
+class GCodeError(ValueError):
+    """Raised for a malformed or unsupported line, with its line number."""
+
+    def __init__(self, message, line_number):
+        super().__init__(f"Line {line_number}: {message}")
+        self.line_number = line_number
+
+def read_lines(path):
+    """Yield the lines of a job file one at a time."""
+    with open(path) as f:
+        for line in f:
+            yield line
+
+def _strip_comment(line):
+    cut = line.find(';')
+    if cut >= 0:
+        line = line[:cut]
+    while '(' in line:
+        start = line.find('(')
+        end = line.find(')', start)
+        if end < 0:
+            return line[:start]
+        line = line[:start] + ' ' + line[end + 1:]
+    return line
+
+def _split_words(text):
+    """Split 'G1X10 Y-2.5' into [('G', '1'), ('X', '10'), ('Y', '-2.5')]."""
+    words = []
+    for token in text.split():
+        if not token[0].isalpha():
+            raise ValueError("Word does not start with a letter")
+        letter, number = token[0], token[1:]
+        if number and not number.lstrip('+-.0123456789'):
+            words.append((letter, number))
+            continue
+        # Words packed without spaces: scan for the next letter
+        start = 0
+        for i in range(1, len(token) + 1):
+            if i == len(token) or token[i].isalpha():
+                words.append((token[start], token[start + 1:i]))
+                start = i
+    return words
+
+def parse(lines, strict=True):
+    """
+    Turn G-code lines into commands:
+        (MOVE, x, y, feed)   absolute target in mm, feed in mm/min
+        (PEN, down)
+        (DWELL, seconds)
+    Unsupported codes raise GCodeError, or are skipped when strict is False.
+    """
+    motion = 0  # Modal G0/G1
+    scale = 1.0  # mm per unit
+    relative = False
+    x = y = 0.0
+    feed = DEFAULT_FEED
+    pen_down = None
+
+    for line_number, line in enumerate(lines, 1):
+        text = _strip_comment(line).strip().upper()
+        if not text or text == '%':
+            continue
+        try:
+            words = _split_words(text)
+            codes = []
+            values = {}
+            for letter, number in words:
+                if letter in 'GM':
+                    codes.append((letter, int(float(number))))
+                elif letter == 'N':
+                    continue  # Line numbers are ignored
+                else:
+                    values[letter] = float(number)
+        except (ValueError, IndexError):
+            raise GCodeError(f"Malformed line {line.strip()!r}", line_number) from None
+
+        dwell = False
+        for letter, code in codes:
+            if letter == 'G' and code in (0, 1):
+                motion = code
+            elif letter == 'G' and code == 4:
+                dwell = True
+            elif letter == 'G' and code in (20, 21):
+                scale = 25.4 if code == 20 else 1.0
+            elif letter == 'G' and code in (90, 91):
+                relative = code == 91
+            elif letter == 'M' and code in (3, 5):
+                if pen_down != (code == 3):
+                    pen_down = code == 3
+                    yield PEN, pen_down
+            elif letter == 'M' and code in (0, 2, 30):
+                return  # Program stop/end
+            elif strict:
+                raise GCodeError(f"Unsupported command {letter}{code}", line_number)
+
+        if dwell:
+            seconds = values['P'] / 1000 if 'P' in values else values.get('S', 0.0)
+            yield DWELL, seconds
+            continue
+        if 'F' in values:
+            feed = values['F'] * scale
+            if feed <= 0:
+                raise GCodeError("Feed rate must be positive", line_number)
+        if 'Z' in values and pen_down != (values['Z'] <= 0):
+            pen_down = values['Z'] <= 0
+            yield PEN, pen_down
+        if 'X' in values or 'Y' in values:
+            if relative:
+                x += values.get('X', 0.0) * scale
+                y += values.get('Y', 0.0) * scale
+            else:
+                x = values['X'] * scale if 'X' in values else x
+                y = values['Y'] * scale if 'Y' in values else y
+            yield MOVE, x, y, RAPID_FEED if motion == 0 else feed
+
+def job_points(commands, rate_hz=50, start=None):
+    """
+    Turn commands into (x, y, pen_down) points, one per control tick: moves
+    are split so the pen advances feed / 60 / rate_hz mm per tick, and a
+    dwell repeats the current point for its duration. start is the (x, y)
+    the pen is at before the job; without it the first move is a jump.
+    """
+    position = start
+    pen_down = False
+    for command in commands:
+        kind = command[0]
+        if kind == MOVE:
+            x, y, feed = command[1], command[2], command[3]
+            if position is not None:
+                px, py = position
+                step = feed / 60 / rate_hz
+                steps = int(math.ceil(math.hypot(x - px, y - py) / step - 1e-9))
+                for i in range(1, steps):
+                    yield px + (x - px) * i / steps, py + (y - py) * i / steps, pen_down
+            yield x, y, pen_down
+            position = (x, y)
+        elif kind == PEN:
+            pen_down = command[1]
+            if position is not None:
+                yield position[0], position[1], pen_down
+        elif kind == DWELL and position is not None:
+            for _ in range(int(round(command[1] * rate_hz))):
+                yield position[0], position[1], pen_down
+
+def plot_job(path, write, rate_hz=50, on_unreachable=None, limiter=None, start=None):
+    """
+    Stream a G-code job file to write(shoulder_duty, elbow_duty, pen_down)
+    at the control rate. Returns the scheduler, whose stats report overruns.
+    """
+    points = job_points(parse(read_lines(path)), rate_hz, start)
+    duties = to_duty(solve_ik(points, on_unreachable=on_unreachable))
+    if limiter is not None:
+        duties = limit_motion(duties, limiter)
+    return timed_sink(duties, write, rate_hz)
+
+if __name__ == "__main__":
+    # Plot a job on the arm: pen state is shown on the pen up/down LED (GP20)
+    import sys
+    from machine import Pin
+    from servo_bank import ServoBank
+
+    servos = ServoBank.from_pins(0, 1, 2, freq=50)
+    led_updown = Pin(20, Pin.OUT)
+
+    def write(shoulder, elbow, pen_down):
+        servos.write(shoulder, elbow)
+        led_updown.value(0 if pen_down else 1)  # LED off = pen down, as in single_file
+
+    job = sys.argv[1] if len(sys.argv) > 1 else "job.gcode"
+    scheduler = plot_job(job, write, on_unreachable=lambda x, y, e: print(f"Skipping ({x:.1f}, {y:.1f}): {e}"))
+    print(scheduler.report())
+    print(servos.report())
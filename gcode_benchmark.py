@@ -0,0 +1,53 @@
+import math
+import os
+import sys
+import tempfile
+import time
+
+from gcode import parse, job_points, read_lines
+
+# Benchmark: G-code parsing throughput on a generated multi-megabyte job.
+# Usage: python gcode_benchmark.py [megabytes]
+
+def write_job(path, megabytes):
+    """Write a spiral job of roughly the given size, with pen lifts and comments."""
+    target = megabytes * 1024 * 1024
+    size = lines = 0
+    with open(path, "w") as f:
+        f.write("; generated benchmark job\nG21 G90\nF1200\n")
+        i = 0
+        while size < target:
+            t = i / 50
+            r = 60 + 80 * (0.5 + 0.5 * math.sin(t / 13))
+            if i % 500 == 0:
+                line = f"M5\nG0 X{r * math.cos(t):.3f} Y{150 + r * math.sin(t) / 2:.3f}\nM3\n"
+            else:
+                line = f"G1 X{r * math.cos(t):.3f} Y{150 + r * math.sin(t) / 2:.3f} ; seg {i}\n"
+            f.write(line)
+            size += len(line)
+            lines += line.count("\n")
+            i += 1
+    return size, lines
+
+def timed(function):
+    start = time.perf_counter()
+    count = function()
+    return count, time.perf_counter() - start
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "job.gcode")
+        size, lines = write_job(path, megabytes)
+        print(f"Job: {size / 1e6:.1f} MB, {lines:,} lines")
+
+        _, read_time = timed(lambda: sum(1 for _ in read_lines(path)))
+        commands, parse_time = timed(lambda: sum(1 for _ in parse(read_lines(path))))
+        points, points_time = timed(lambda: sum(1 for _ in job_points(parse(read_lines(path)))))
+
+    for name, seconds in (("read lines", read_time), ("parse", parse_time), ("parse + job_points", points_time)):
+        print(f"{name:20s} {seconds:7.2f} s  {size / 1e6 / seconds:7.1f} MB/s  {lines / seconds:>12,.0f} lines/s")
+    print(f"{commands:,} commands, {points:,} control-tick points")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import math
+import os
+import tempfile
+import unittest
+
+from gcode import MOVE, PEN, DWELL, RAPID_FEED, DEFAULT_FEED, GCodeError, parse, job_points, plot_job
+
+class TestGCode(unittest.TestCase):
+    def test_moves_are_modal(self):
+        """Test that G0/G1 stay in force and missing axes keep their value"""
+        commands = list(parse(["G1 X10 Y20 F1200", "X15", "G0 Y5"]))
+        self.assertEqual(commands, [(MOVE, 10, 20, 1200), (MOVE, 15, 20, 1200), (MOVE, 15, 5, RAPID_FEED)])
+
+    def test_default_feed(self):
+        """Test that G1 without any F word uses the default feed"""
+        self.assertEqual(list(parse(["G1 X1 Y1"])), [(MOVE, 1, 1, DEFAULT_FEED)])
+
+    def test_comments_and_packed_words(self):
+        """Test comments, blank lines, line numbers and words without spaces"""
+        lines = ["; header", "%", "", "N10 G1X10Y-2.5 (move) ; trailing", "g1 x1 y1"]
+        self.assertEqual([c[1:3] for c in parse(lines)], [(10, -2.5), (1, 1)])
+
+    def test_pen_and_dwell(self):
+        """Test pen commands from M3/M5 and Z, and both dwell forms"""
+        lines = ["M3", "M3", "G4 P250", "M5", "G4 S1.5", "G1 Z-1", "G1 Z2"]
+        self.assertEqual(list(parse(lines)), [(PEN, True), (DWELL, 0.25), (PEN, False), (DWELL, 1.5),
+                                              (PEN, True), (PEN, False)])
+
+    def test_units_and_relative(self):
+        """Test inch units and relative moves"""
+        commands = list(parse(["G20 G90 G1 X1 Y2", "G91 X1", "G21 Y10"]))
+        self.assertEqual([c[1:3] for c in commands], [(25.4, 50.8), (50.8, 50.8), (50.8, 60.8)])
+
+    def test_program_end(self):
+        """Test that M2 stops the job"""
+        self.assertEqual(len(list(parse(["G1 X1 Y1", "M2", "G1 X2 Y2"]))), 1)
+
+    def test_errors(self):
+        """Test that malformed and unsupported lines report their line number"""
+        with self.assertRaises(GCodeError) as context:
+            list(parse(["G1 X1", "G1 Xabc"]))
+        self.assertEqual(context.exception.line_number, 2)
+        with self.assertRaises(GCodeError):
+            list(parse(["G28"]))
+        self.assertEqual(list(parse(["G28", "G1 X1 Y1"], strict=False)), [(MOVE, 1, 1, DEFAULT_FEED)])
+
+    def test_job_points_follow_feed(self):
+        """Test that moves are split into feed-rate steps and dwells hold the pen still"""
+        commands = [(MOVE, 0, 100, RAPID_FEED), (PEN, True), (MOVE, 10, 100, 600), (DWELL, 0.1)]
+        points = list(job_points(commands, rate_hz=50))
+        self.assertEqual(points[0], (0, 100, False))
+        self.assertEqual(points[1], (0, 100, True))
+        # 600 mm/min at 50 Hz is 0.2 mm per tick, so 10 mm takes 50 ticks
+        move = points[2:52]
+        self.assertEqual(len(move), 50)
+        self.assertTrue(all(math.isclose(b[0] - a[0], 0.2) for a, b in zip(move, move[1:])))
+        self.assertEqual(points[52:], [(10, 100, True)] * 5)
+
+    def test_plot_job(self):
+        """Test that a job file streams to duty writes"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "job.gcode")
+            with open(path, "w") as f:
+                f.write("G0 X0 Y300\nM3\nG1 X5 Y300 F60000\nG1 X80 Y300\nG1 X20 Y250\nM5\n")
+            writes, unreachable = [], []
+            scheduler = plot_job(path, lambda *item: writes.append(item), rate_hz=1000,
+                                 on_unreachable=lambda x, y, e: unreachable.append((x, y)))
+        self.assertEqual(scheduler.ticks, len(writes))
+        self.assertTrue(unreachable)
+        self.assertTrue(all(2300 <= s <= 7500 and 2300 <= e <= 7500 for s, e, pen in writes))
+        self.assertEqual([pen for s, e, pen in writes][:2], [False, True])
+        self.assertFalse(writes[-1][2])
+
+if __name__ == '__main__':
+    unittest.main()
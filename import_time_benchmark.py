@@ -0,0 +1,67 @@
+import sys
+import time
+
+# Benchmark: import (boot) time of the modules single_file.py loads before its
+# control loop starts, checked against a budget, and a check that none of
+# them pulls in numpy or matplotlib (or machine and asyncio, on CPython).
+# On CPython each module is timed in a fresh interpreter (median of several
+# runs, bytecode already cached); on MicroPython they are timed in boot
+# order in one interpreter, as on a real start-up.
+# Usage: python import_time_benchmark.py [runs]
+#        mpremote run import_time_benchmark.py   (on the Pico, with the modules copied over)
+
+BOOT_MODULES = ["kinematics", "duty_table", "scheduler", "control_runtime", "telemetry", "motion_profile", "knob_input",
+                "servo_bank", "calibration", "config_store", "etch_a_sketch"]
+HEAVY_MODULES = ("numpy", "matplotlib", "machine", "asyncio")
+
+# Budgets in ms for importing all of BOOT_MODULES
+BUDGET_MS = {"cpython": 60, "micropython": 400}
+
+def cpython_times(runs):
+    """Median import time (ms) of each module in a fresh interpreter, plus the whole boot set."""
+    import statistics
+    import subprocess
+    timer = "import time; t = time.perf_counter(); import {0}; print((time.perf_counter() - t) * 1000)"
+    times = {}
+    for label, modules in [(m, m) for m in BOOT_MODULES] + [("total", ", ".join(BOOT_MODULES))]:
+        command = [sys.executable, "-c", timer.format(modules)]
+        subprocess.run(command, check=True, capture_output=True)  # Warm the bytecode cache
+        samples = [float(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+                   for _ in range(runs)]
+        times[label] = statistics.median(samples)
+    return times
+
+def micropython_times():
+    """Import time (ms) of each module in boot order, plus the total."""
+    times = {}
+    start = time.ticks_us()
+    for module in BOOT_MODULES:
+        t = time.ticks_us()
+        __import__(module)
+        times[module] = time.ticks_diff(time.ticks_us(), t) / 1000
+    times["total"] = time.ticks_diff(time.ticks_us(), start) / 1000
+    return times
+
+def heavy_imports():
+    """Heavy modules that importing the boot set loads (CPython only: machine is built into the Pico)."""
+    import subprocess
+    check = ("import sys; import {0}; print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}} & {1!r})))"
+             .format(", ".join(BOOT_MODULES), set(HEAVY_MODULES)))
+    return subprocess.run([sys.executable, "-c", check], check=True, capture_output=True, text=True).stdout.split()
+
+def main():
+    implementation = sys.implementation.name
+    if implementation == "micropython":
+        times, heavy = micropython_times(), []
+    else:
+        runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+        times, heavy = cpython_times(runs), heavy_imports()
+    for module in BOOT_MODULES:
+        print(f"{module:16s} {times[module]:8.2f} ms")
+    budget = BUDGET_MS[implementation]
+    verdict = "within" if times["total"] <= budget else "OVER"
+    print(f"{'boot imports':16s} {times['total']:8.2f} ms ({verdict} the {budget} ms {implementation} budget)")
+    print("Heavy modules loaded: " + (", ".join(heavy) if heavy else "none"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import math
+
+# Hardware-free copy of the arm maths used by single_file.py.
+# Importing this module never touches machine, so it can be used by the
+# host-side tools as the scalar reference implementation.
+
+# Arm length constants
+L1, L2 = 155, 155  # Lengths of the first and second arm segments (in mm)
+
+# Safe PWM bounds for servos
+PWM_MIN, PWM_MAX = 2300, 7500
+DUTY_PER_DEGREE = 65535 * (2500 - 500) / 180 / 20000  # About 36.4 duty steps per degree
+
+# How far one shoulder duty step moves the pen at full reach; detail finer
+# than this cannot show on paper
+PEN_RESOLUTION = (L1 + L2) * math.radians(1 / DUTY_PER_DEGREE)  # About 0.15 mm
+
+# Inverse Kinematics Function
+def inverse_kinematics(x, y, elbow=-1):
+    """
+    Compute shoulder (q1) and elbow (q2) angles for given (x, y) position.
+    Returns angles in radians. elbow=-1 gives the negative elbow angle used by
+    the control code, elbow=1 the mirrored solution.
+    """
+    r_squared = x**2 + y**2
+    if r_squared > (L1 + L2)**2:
+        raise ValueError("Target is out of reach")
+
+    q2 = elbow * math.acos((r_squared - L1**2 - L2**2) / (2 * L1 * L2))  # Elbow angle
+    q1 = math.atan2(y, x) - math.atan2(L2 * math.sin(q2), L1 + L2 * math.cos(q2))  # Shoulder angle
+
+    return q1, q2
+
+# Forward Kinematics Function
+def forward_kinematics(q1, q2):
+    """
+    Compute end-effector position (x, y) based on joint angles q1 and q2.
+    Returns x, y coordinates of the end effector.
+    """
+    x1, y1 = L1 * math.cos(q1), L1 * math.sin(q1)
+    x2, y2 = x1 + L2 * math.cos(q1 + q2), y1 + L2 * math.sin(q1 + q2)
+    return x1, y1, x2, y2
+
+# The kernel below is marked for MicroPython's native code emitter. The
+# directive only takes effect written literally as @micropython.native; on
+# CPython a stand-in returns the function unchanged. The speed-up on the Pico
+# has not been measured yet. (Viper would not help: the maths is floating
+# point, which viper handles as boxed objects.)
+try:
+    import micropython
+except ImportError:
+    class micropython:
+        """CPython stand-in: @micropython.native leaves the function unchanged."""
+
+        @staticmethod
+        def native(function):
+            return function
+
+# Kinematics kernel: the geometry constants of one arm, computed once
+class Kinematics:
+    """
+    Inverse and forward kinematics for one arm geometry. Everything derived
+    from the link lengths is computed here instead of on every call, and arms
+    with equal links (L1 == L2) use a shorter symmetric inverse solution.
+    """
+
+    __slots__ = ("l1", "l2", "elbow", "symmetric", "reach_squared", "inner_squared",
+                 "link_squares", "two_l1_l2", "inverse")
+
+    def __init__(self, l1=L1, l2=L2, elbow=-1, specialise=True):
+        self.l1, self.l2 = l1, l2
+        self.elbow = elbow  # -1 as inverse_kinematics(), 1 for the mirrored solution
+        self.symmetric = specialise and l1 == l2
+        self.reach_squared = (l1 + l2) ** 2
+        self.inner_squared = (l1 - l2) ** 2
+        self.link_squares = l1 * l1 + l2 * l2
+        self.two_l1_l2 = 2 * l1 * l2
+        self.inverse = self._inverse_symmetric if self.symmetric else self._inverse_general
+
+    @micropython.native
+    def _inverse_general(self, x, y):
+        """Shoulder and elbow angles (radians) for (x, y), like inverse_kinematics()."""
+        r_squared = x * x + y * y
+        if r_squared > self.reach_squared:
+            raise ValueError("Target is out of reach")
+        if r_squared < self.inner_squared:
+            raise ValueError("Target is too close")
+        q2 = self.elbow * math.acos((r_squared - self.link_squares) / self.two_l1_l2)
+        q1 = math.atan2(y, x) - math.atan2(self.l2 * math.sin(q2), self.l1 + self.l2 * math.cos(q2))
+        return q1, q2
+
+    @micropython.native
+    def _inverse_symmetric(self, x, y):
+        """
+        The same for equal links: cos(q2) = r^2 / (2 L^2) - 1, and the link
+        triangle is isosceles, so the shoulder offset is exactly q2 / 2.
+        """
+        r_squared = x * x + y * y
+        if r_squared > self.reach_squared:
+            raise ValueError("Target is out of reach")
+        q2 = self.elbow * math.acos(r_squared / self.two_l1_l2 - 1.0)
+        return math.atan2(y, x) - 0.5 * q2, q2
+
+    @micropython.native
+    def forward(self, q1, q2):
+        """Elbow and pen positions (x1, y1, x2, y2), like forward_kinematics()."""
+        l1, l2 = self.l1, self.l2
+        x1, y1 = l1 * math.cos(q1), l1 * math.sin(q1)
+        q12 = q1 + q2
+        return x1, y1, x1 + l2 * math.cos(q12), y1 + l2 * math.sin(q12)
+
+# Translate Function: Convert angle to PWM signal
+def translate(angle: float) -> int:
+    """Translate angle (degrees) to a PWM value."""
+    pulse_width = 500 + (2500 - 500) * angle / 180
+    duty_cycle = pulse_width / 20000  # Convert to duty cycle (0-1)
+    duty_u16_value = int(duty_cycle * 65535)  # Convert to 16-bit scale
+    return max(PWM_MIN, min(PWM_MAX, duty_u16_value))  # Clamp to safe limits
+
+# Knob mapping: ADC readings (0-65535) to arm coordinates, as in single_file.py
+def knob_to_xy(knob1_value, knob2_value):
+    """Map the two knob readings to an (x, y) target in mm."""
+    x = -1*(-310 + 2*(knob1_value * (L1 + L2)/ 65535))  # Map ADC to -L1-L2 to L1+L2 range
+    y = -1*(knob2_value * (L1 + L2) / 65535) + 310
+    return x, y
+
+def xy_to_knob(x, y):
+    """Inverse of knob_to_xy: the knob readings that would produce (x, y)."""
+    knob1_value = (310 - x) * 65535 / (2 * (L1 + L2))
+    knob2_value = (310 - y) * 65535 / (L1 + L2)
+    return max(0, min(65535, round(knob1_value))), max(0, min(65535, round(knob2_value)))
@@ -0,0 +1,225 @@
+import ast
+import gc
+import io
+import math
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from fractions import Fraction
+
+# Cross-implementation benchmark for the copies of inverse_kinematics,
+# forward_kinematics and translate spread across the repo.
+#
+# Each file is parsed rather than imported: only its function definitions and
+# literal constants (L1, L2, PWM_MIN, ...) are executed, so scripts that set up
+# hardware, open matplotlib windows or loop forever at module level can still
+# be measured. Usage: python kinematics_benchmark.py [grid_step_mm]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (label, file, calling convention) for every inverse kinematics variant.
+# "radians" variants take (x, y) and return (q1, q2) in radians.
+# "degrees" variants take (x, y, l1, l2) and return (alpha, beta) in degrees.
+IK_VARIANTS = [
+    ("kinematics.py", "kinematics.py", "radians"),
+    ("Demonstration_code.py", "Demonstration_code.py", "radians"),
+    ("Combined_matplotlib.py", "Combined_matplotlib.py", "radians"),
+    ("JamesTest", "JamesTest", "radians"),
+    ("Final_testing_InverseK(James).py", "Final_testing_InverseK(James).py", "radians"),
+    ("Inverse_kinemattics.py", "Inverse_kinemattics.py", "degrees"),
+]
+
+TRANSLATE_VARIANTS = [
+    "kinematics.py", "single_file.py", "Demonstration_code.py", "JamesTest",
+    "Final_testing_InverseK(James).py", "Testingmaybe2.py", "servo_translator.py",
+]
+
+FUNCTIONS = ("inverse_kinematics", "forward_kinematics", "translate", "translate_cdeg")
+
+# ============================ Loading ============================
+def load_variant(filename):
+    """
+    Return a namespace holding the kinematics functions and literal constants of
+    one file, without running anything else in it. Raises SyntaxError for files
+    that do not parse.
+    """
+    path = os.path.join(HERE, filename)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename)
+
+    kept = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in FUNCTIONS:
+            kept.append(node)
+        elif isinstance(node, ast.Assign):
+            try:
+                ast.literal_eval(node.value)
+            except ValueError:
+                continue
+            kept.append(node)
+    namespace = {"math": math}
+    exec(compile(ast.Module(body=kept, type_ignores=[]), path, "exec"), namespace)
+    return namespace
+
+# ============================ Measurements ============================
+def workspace_grid(step, reach):
+    """Dense grid over the upper half of the workspace, where the knobs can point."""
+    points = []
+    y = 0.0
+    while y <= reach:
+        x = -reach
+        while x <= reach:
+            if x * x + y * y <= reach * reach:
+                points.append((x, y))
+            x += step
+        y += step
+    return points
+
+def timer_overhead():
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(10000):
+        start = clock()
+        samples.append(clock() - start)
+    return min(samples)
+
+def time_calls(function, argument_list, overhead, repeat=3):
+    """
+    Time every call separately. Returns (calls/s, worst ns, p99 ns, results),
+    keeping the best of `repeat` passes so one-off scheduler hiccups do not
+    dominate the worst case. The garbage collector is paused while timing.
+    """
+    clock = time.perf_counter_ns
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            latencies, results = [], []
+            total_start = clock()
+            for arguments in argument_list:
+                start = clock()
+                try:
+                    result = function(*arguments)
+                except ValueError:
+                    result = None
+                latencies.append(clock() - start - overhead)
+                results.append(result)
+            total = (clock() - total_start) / 1e9
+            latencies.sort()
+            run = (len(argument_list) / total, latencies[-1], latencies[int(0.99 * (len(latencies) - 1))])
+            best = run if best is None else (max(best[0], run[0]), min(best[1], run[1]), min(best[2], run[2]))
+    finally:
+        gc.enable()
+    return best + (results,)
+
+def reference_forward(q1, q2, l1, l2):
+    x1, y1 = l1 * math.cos(q1), l1 * math.sin(q1)
+    return x1 + l2 * math.cos(q1 + q2), y1 + l2 * math.sin(q1 + q2)
+
+def benchmark_ik(label, filename, convention, points, overhead):
+    try:
+        namespace = load_variant(filename)
+    except SyntaxError as e:
+        return {"label": label, "error": f"does not parse (line {e.lineno})"}
+    l1, l2 = namespace.get("L1", 155), namespace.get("L2", 155)
+    inverse = namespace["inverse_kinematics"]
+    if convention == "degrees":
+        argument_list = [(x, y, l1, l2) for x, y in points]
+    else:
+        argument_list = points
+
+    with redirect_stdout(io.StringIO()):  # Some variants print on every call
+        rate, worst, p99, results = time_calls(inverse, argument_list, overhead)
+
+    forward = namespace.get("forward_kinematics")
+    worst_error, solved = 0.0, 0
+    for (x, y), result in zip(points, results):
+        if result is None:
+            continue
+        solved += 1
+        q1, q2 = result
+        if convention == "degrees":
+            q1, q2 = math.radians(q1), math.radians(q2)
+        if forward is not None:
+            x2, y2 = forward(q1, q2)[2:]
+        else:
+            x2, y2 = reference_forward(q1, q2, l1, l2)
+        worst_error = max(worst_error, math.hypot(x2 - x, y2 - y))
+    return {"label": label, "rate": rate, "worst": worst, "p99": p99,
+            "solved": solved, "error": worst_error}
+
+def exact_translate(angle):
+    duty = int((500 + Fraction(angle) * 2000 / 180) / 20000 * 65535)
+    return max(2300, min(7500, duty))
+
+def benchmark_translate(filename, angles, overhead):
+    namespace = load_variant(filename)
+    translate = namespace["translate"]
+    rate, worst, p99, results = time_calls(translate, [(angle,) for angle in angles], overhead)
+    duty_error = max(abs(result - exact_translate(angle)) for angle, result in zip(angles, results))
+    return {"label": filename, "rate": rate, "worst": worst, "p99": p99, "error": duty_error}
+
+def benchmark_kernel(points, overhead):
+    """
+    The Kinematics kernel (single_file.py and servo_translator.py use it)
+    against the reference inverse_kinematics() in kinematics.py.
+    """
+    from kinematics import L1, L2, Kinematics, inverse_kinematics
+    rows = [("inverse_kinematics()", inverse_kinematics),
+            ("Kinematics, general path", Kinematics(L1, L2, specialise=False).inverse),
+            ("Kinematics, symmetric path", Kinematics(L1, L2).inverse)]
+    results = []
+    for label, inverse in rows:
+        rate, worst, p99, _ = time_calls(inverse, points, overhead)
+        results.append({"label": label, "rate": rate, "worst": worst, "p99": p99})
+    return results
+
+# ============================ Report ============================
+def main():
+    step = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    points = workspace_grid(step, 310)
+    overhead = timer_overhead()
+    print(f"Inverse kinematics over {len(points)} workspace points ({step} mm grid), timer overhead {overhead} ns")
+    print(f"{'variant':34s} {'calls/s':>11s} {'p99 us':>8s} {'worst us':>9s} {'solved':>7s} {'round trip mm':>14s}")
+    ik_results = []
+    for label, filename, convention in IK_VARIANTS:
+        result = benchmark_ik(label, filename, convention, points, overhead)
+        if isinstance(result["error"], str):
+            print(f"{label:34s} {result['error']}")
+            continue
+        ik_results.append(result)
+        print(f"{label:34s} {result['rate']:>11,.0f} {result['p99'] / 1000:>8.2f} {result['worst'] / 1000:>9.2f} "
+              f"{result['solved']:>7d} {result['error']:>14.2e}")
+
+    print()
+    print("Kinematics kernel (precomputed constants) against the reference")
+    print(f"{'variant':34s} {'calls/s':>11s} {'p99 us':>8s} {'worst us':>9s} {'speedup':>8s}")
+    kernel_results = benchmark_kernel(points, overhead)
+    for result in kernel_results:
+        print(f"{result['label']:34s} {result['rate']:>11,.0f} {result['p99'] / 1000:>8.2f} "
+              f"{result['worst'] / 1000:>9.2f} {result['rate'] / kernel_results[0]['rate']:>7.2f}x")
+
+    angles = [i / 4 for i in range(-80, 800)]
+    print()
+    print(f"translate over {len(angles)} angles from -20 to 200 degrees")
+    print(f"{'variant':34s} {'calls/s':>11s} {'p99 us':>8s} {'worst us':>9s} {'max duty error':>15s}")
+    translate_results = []
+    for filename in TRANSLATE_VARIANTS:
+        result = benchmark_translate(filename, angles, overhead)
+        translate_results.append(result)
+        print(f"{filename:34s} {result['rate']:>11,.0f} {result['p99'] / 1000:>8.2f} {result['worst'] / 1000:>9.2f} "
+              f"{result['error']:>15d}")
+
+    accurate = [result for result in ik_results if result["error"] < 1e-6]
+    if accurate:
+        best = max(accurate, key=lambda result: result["rate"])
+        print()
+        print(f"Fastest inverse kinematics with exact round trips: {best['label']}")
+    exact = [result for result in translate_results if result["error"] <= 1]
+    if exact:
+        best = max(exact, key=lambda result: result["rate"])
+        print(f"Fastest translate within one duty step: {best['label']}")
+
+if __name__ == "__main__":
+    main()
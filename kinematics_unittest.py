@@ -0,0 +1,95 @@
+import ast
+import math
+import unittest
+
+import kinematics
+import servo_translator
+from kinematics import L1, L2, Kinematics, inverse_kinematics, forward_kinematics
+
+def grid(reach, step=7.0):
+    points = []
+    y = -reach
+    while y <= reach:
+        x = -reach
+        while x <= reach:
+            points.append((x, y))
+            x += step
+        y += step
+    return points
+
+class TestKinematics(unittest.TestCase):
+    def test_matches_reference(self):
+        """Test that both inverse paths agree with inverse_kinematics()"""
+        symmetric, general = Kinematics(), Kinematics(specialise=False)
+        self.assertTrue(symmetric.symmetric)
+        self.assertFalse(general.symmetric)
+        for x, y in grid(L1 + L2 + 5):
+            try:
+                expected = inverse_kinematics(x, y)
+            except ValueError:
+                self.assertRaises(ValueError, symmetric.inverse, x, y)
+                self.assertRaises(ValueError, general.inverse, x, y)
+                continue
+            for arm in (symmetric, general):
+                q1, q2 = arm.inverse(x, y)
+                self.assertAlmostEqual(q1, expected[0], places=9)
+                self.assertAlmostEqual(q2, expected[1], places=9)
+
+    def test_mirrored_elbow(self):
+        """Test that elbow=1 matches inverse_kinematics(..., elbow=1)"""
+        arm = Kinematics(elbow=1)
+        for x, y in ((100, 200), (-150, 50), (0, 310)):
+            for got, expected in zip(arm.inverse(x, y), inverse_kinematics(x, y, 1)):
+                self.assertAlmostEqual(got, expected, places=9)
+
+    def test_unequal_links(self):
+        """Test the general path on an arm with unequal links, including its inner limit"""
+        arm = Kinematics(130, 170)
+        self.assertFalse(arm.symmetric)
+        with self.assertRaises(ValueError):
+            arm.inverse(10, 20)  # Closer than 170 - 130
+        with self.assertRaises(ValueError):
+            arm.inverse(300, 10)
+        for x, y in ((100, 150), (-200, 60), (40, -250)):
+            _, _, x2, y2 = arm.forward(*arm.inverse(x, y))
+            self.assertAlmostEqual(x2, x, places=9)
+            self.assertAlmostEqual(y2, y, places=9)
+
+    def test_forward(self):
+        """Test that forward() matches forward_kinematics()"""
+        arm = Kinematics()
+        for q1, q2 in ((0.3, -0.4), (2.0, -1.5), (-1.0, 0.7)):
+            for got, expected in zip(arm.forward(q1, q2), forward_kinematics(q1, q2)):
+                self.assertAlmostEqual(got, expected, places=9)
+
+    def test_servo_translator_degrees(self):
+        """Test that servo_translator.inverse_kinematics still returns the positive-elbow solution in degrees"""
+        l1, l2 = 15, 10
+        for x, y in ((10, 10), (20, 0), (-12, 8)):
+            beta = math.acos((x * x + y * y - l1 * l1 - l2 * l2) / (2 * l1 * l2))
+            alpha = math.atan2(y, x) - math.atan2(l2 * math.sin(beta), l1 + l2 * math.cos(beta))
+            got = servo_translator.inverse_kinematics(x, y, l1, l2)
+            self.assertAlmostEqual(got[0], math.degrees(alpha), places=9)
+            self.assertAlmostEqual(got[1], math.degrees(beta), places=9)
+        with self.assertRaises(ValueError):
+            servo_translator.inverse_kinematics(30, 0, l1, l2)
+        with self.assertRaises(ValueError):
+            servo_translator.inverse_kinematics(1, 1, l1, l2)
+
+    def test_native_decorators(self):
+        """
+        Test that the kernel uses the literal @micropython.native directive (the
+        only form the MicroPython compiler honours) and that the CPython
+        stand-in is a no-op. Native compilation on the Pico is unverified here.
+        """
+        with open(kinematics.__file__) as f:
+            tree = ast.parse(f.read())
+        decorated = {node.name: [ast.unparse(d) for d in node.decorator_list]
+                     for node in ast.walk(tree) if isinstance(node, ast.FunctionDef) and node.decorator_list}
+        for name in ("_inverse_general", "_inverse_symmetric", "forward"):
+            self.assertEqual(decorated[name], ["micropython.native"])
+        function = lambda: 1
+        self.assertIs(kinematics.micropython.native(function), function)
+
+if __name__ == '__main__':
+    unittest.main()
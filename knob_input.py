@@ -0,0 +1,64 @@
+# Knob input layer: oversampling, filtering and change detection.
+# A single read_u16() is noisy enough to make the arm jitter, so each knob is
+# oversampled, smoothed with an EMA or a running median, and only reported
+# as changed once the smoothed value has moved past a deadband. While nobody
+# touches the knobs, poll() keeps returning False and the control loop can
+# skip the kinematics and servo writes.
+
+EMA, MEDIAN = "ema", "median"
+
+class KnobInput:
+    """
+    Filtered view of one ADC. Uses integer arithmetic only, so it costs the
+    Pico no floating point per tick.
+    """
+
+    def __init__(self, adc, oversample=4, mode=EMA, ema_shift=2, median_window=5, deadband=128):
+        if mode not in (EMA, MEDIAN):
+            raise ValueError("Filter mode must be 'ema' or 'median'")
+        if oversample < 1:
+            raise ValueError("Oversample count must be at least 1")
+        self.adc = adc
+        self.oversample = oversample
+        self.mode = mode
+        self.ema_shift = ema_shift  # EMA weight of a new sample is 1 / 2**ema_shift
+        self.deadband = deadband  # Smallest filtered movement reported as a change
+        self.ema = None  # Filtered value scaled by 2**ema_shift, keeps the fraction
+        self.window = [0] * median_window
+        self.window_index = 0
+        self.window_count = 0
+        self.filtered = None  # Latest filtered reading
+        self.value = None  # Last reported (changed) reading
+
+    def sample(self):
+        """Average `oversample` raw readings."""
+        total = 0
+        for _ in range(self.oversample):
+            total += self.adc.read_u16()
+        return total // self.oversample
+
+    def read(self):
+        """Take a new oversampled reading and return the filtered value."""
+        raw = self.sample()
+        if self.mode == EMA:
+            if self.ema is None:
+                self.ema = raw << self.ema_shift
+            else:
+                self.ema += raw - (self.ema >> self.ema_shift)
+            self.filtered = self.ema >> self.ema_shift
+        else:
+            self.window[self.window_index] = raw
+            self.window_index = (self.window_index + 1) % len(self.window)
+            if self.window_count < len(self.window):
+                self.window_count += 1
+            recent = sorted(self.window[:self.window_count]) if self.window_count < len(self.window) else sorted(self.window)
+            self.filtered = recent[len(recent) // 2]
+        return self.filtered
+
+    def poll(self):
+        """Read the knob and return True if it moved beyond the deadband since the last change."""
+        filtered = self.read()
+        if self.value is None or abs(filtered - self.value) > self.deadband:
+            self.value = filtered
+            return True
+        return False
@@ -0,0 +1,52 @@
+import random
+import unittest
+
+import sim_machine
+from knob_input import KnobInput, EMA, MEDIAN
+
+class TestKnobInput(unittest.TestCase):
+    def setUp(self):
+        sim_machine.reset()
+        self.adc = sim_machine.ADC(27)
+
+    def test_oversample(self):
+        """Test that each read averages the requested number of samples"""
+        sim_machine.script_adc(27, [100, 200, 300, 400])
+        knob = KnobInput(self.adc, oversample=4)
+        self.assertEqual(knob.read(), 250)
+
+    def test_ema_converges(self):
+        """Test that the EMA settles on a steady input without losing the fraction"""
+        sim_machine.script_adc(27, [0] + [1001] * 60)
+        knob = KnobInput(self.adc, oversample=1, mode=EMA, ema_shift=2)
+        values = [knob.read() for _ in range(61)]
+        self.assertEqual(values[0], 0)
+        self.assertLess(values[1], 1001)
+        self.assertEqual(values[-1], 1001)
+
+    def test_median_rejects_spikes(self):
+        """Test that the median filter ignores single-sample spikes"""
+        sim_machine.script_adc(27, [5000, 5010, 65535, 4990, 5005, 0, 5000])
+        knob = KnobInput(self.adc, oversample=1, mode=MEDIAN, median_window=5)
+        values = [knob.read() for _ in range(7)]
+        self.assertTrue(all(4900 < value < 5100 for value in values[3:]), values)
+
+    def test_deadband(self):
+        """Test that noise inside the deadband is not reported and real movement is"""
+        random.seed(2)
+        noisy = [30000 + random.randint(-200, 200) for _ in range(400)]
+        sim_machine.script_adc(27, noisy + [40000] * 80)
+        knob = KnobInput(self.adc, oversample=4, deadband=128)
+        changes = [knob.poll() for _ in range(120)]
+        self.assertTrue(changes[0])
+        self.assertEqual(sum(changes[20:100]), 0)
+        self.assertGreater(sum(changes[100:]), 0)
+        self.assertGreater(knob.value, 39000)
+
+    def test_invalid_mode(self):
+        """Test that an unknown filter mode is rejected"""
+        with self.assertRaises(ValueError):
+            KnobInput(self.adc, mode="mean")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import math
+
+from kinematics import inverse_kinematics
+from servo_translator import translate
+from scheduler import FixedRateScheduler
+from motion_profile import limit_motion
+from simplify import simplify
+
+# Streaming motion pipeline.
+# A drawing flows through a chain of generator stages:
+#     path source -> [simplify] -> interpolate -> solve_ik -> to_duty -> timed_sink
+# Every stage takes an iterable and yields items one at a time, so stages can
+# be tested on their own and memory stays bounded however long the drawing is.
+# Points are (x, y, pen_down) tuples in mm.
+
+# ============================ Sources ============================
+def line_source(x1, y1, x2, y2, pen_down=True):
+    """Yield the two end points of a straight line."""
+    yield x1, y1, pen_down
+    yield x2, y2, pen_down
+
+def path_source(points, pen_down=True):
+    """Yield (x, y, pen_down) for every (x, y) in an iterable of points."""
+    for x, y in points:
+        yield x, y, pen_down
+
+# ============================ Stages ============================
+def interpolate(points, max_step=1.0):
+    """
+    Insert evenly spaced points so that no two consecutive points are more than
+    max_step mm apart. Each segment takes the pen state of its end point.
+    """
+    previous = None
+    for x, y, pen_down in points:
+        if previous is not None:
+            px, py = previous
+            steps = int(math.ceil(math.hypot(x - px, y - py) / max_step - 1e-9))
+            for i in range(1, steps):
+                yield px + (x - px) * i / steps, py + (y - py) * i / steps, pen_down
+        yield x, y, pen_down
+        previous = (x, y)
+
+def solve_ik(points, ik=inverse_kinematics, on_unreachable=None):
+    """
+    Yield (q1, q2, pen_down) for every reachable point. Unreachable points are
+    dropped and passed to on_unreachable(x, y, error) if it is given.
+    """
+    for x, y, pen_down in points:
+        try:
+            q1, q2 = ik(x, y)
+        except ValueError as e:
+            if on_unreachable is not None:
+                on_unreachable(x, y, e)
+            continue
+        yield q1, q2, pen_down
+
+def to_duty(angles):
+    """Translate (q1, q2, pen_down) in radians into (shoulder_duty, elbow_duty, pen_down)."""
+    for q1, q2, pen_down in angles:
+        yield translate(math.degrees(q1)), translate(math.degrees(q2)), pen_down
+
+# ============================ Sink ============================
+_END = object()  # Marks the end of timed_sink()'s items
+
+def timed_sink(items, write, rate_hz=50, scheduler=None):
+    """
+    Call write(*item) for each item, one item per tick of a fixed-rate
+    scheduler, so output follows a timebase rather than a sleep per point.
+    Returns the scheduler, whose stats report overruns and jitter.
+    """
+    if scheduler is None:
+        scheduler = FixedRateScheduler(rate_hz)
+    iterator = iter(items)
+    pending = [next(iterator, _END)]
+    if pending[0] is _END:
+        return scheduler
+
+    def step():
+        write(*pending[0])
+        # Only running out of items ends the path; a StopIteration from write() propagates
+        pending[0] = next(iterator, _END)
+        if pending[0] is _END:
+            scheduler.stop()
+
+    scheduler.run(step)
+    return scheduler
+
+def plot_path(points, write, rate_hz=50, max_step=1.0, on_unreachable=None, limiter=None,
+              simplify_tolerance=None, simplify_stats=None):
+    """
+    Run a full pipeline from (x, y, pen_down) points to timed servo duty writes.
+    With a motion_profile.MotionLimiter, the duties are ramped at its
+    velocity and acceleration limits before they reach the sink. With a
+    simplify_tolerance (mm), redundant points are dropped before any IK runs,
+    and the counts go into simplify_stats if given.
+    """
+    if simplify_tolerance is not None:
+        points = simplify(points, simplify_tolerance, simplify_stats)
+    duties = to_duty(solve_ik(interpolate(points, max_step), on_unreachable=on_unreachable))
+    if limiter is not None:
+        duties = limit_motion(duties, limiter)
+    return timed_sink(duties, write, rate_hz)
@@ -0,0 +1,79 @@
+import math
+import unittest
+
+import sim_machine
+from kinematics import inverse_kinematics, forward_kinematics, translate
+from motion_pipeline import line_source, path_source, interpolate, solve_ik, to_duty, timed_sink, plot_path
+
+class TestMotionPipeline(unittest.TestCase):
+    def test_interpolate(self):
+        """Test that interpolation spaces points evenly without exceeding the step"""
+        points = list(interpolate(line_source(0, 100, 10, 100), max_step=2.5))
+        self.assertEqual([x for x, y, pen in points], [0, 2.5, 5, 7.5, 10])
+        self.assertEqual(len(list(interpolate(line_source(5, 5, 10, 10), math.hypot(5, 5) / 10))), 11)
+
+    def test_interpolate_keeps_pen_state(self):
+        """Test that each segment takes the pen state of its end point"""
+        points = list(path_source([(0, 100)], pen_down=False)) + list(path_source([(4, 100)]))
+        pens = [pen for x, y, pen in interpolate(points, max_step=1)]
+        self.assertEqual(pens, [False, True, True, True, True])
+
+    def test_solve_ik(self):
+        """Test that reachable points are solved and unreachable ones reported"""
+        unreachable = []
+        points = [(100, 100, True), (400, 0, True), (0, 200, False)]
+        angles = list(solve_ik(points, on_unreachable=lambda x, y, e: unreachable.append((x, y))))
+        self.assertEqual(unreachable, [(400, 0)])
+        self.assertEqual(len(angles), 2)
+        x, y = forward_kinematics(angles[1][0], angles[1][1])[2:]
+        self.assertAlmostEqual(x, 0, places=6)
+        self.assertAlmostEqual(y, 200, places=6)
+        self.assertFalse(angles[1][2])
+
+    def test_to_duty(self):
+        """Test that angles are translated into servo duties"""
+        q1, q2 = inverse_kinematics(100, 150)
+        duties = list(to_duty([(q1, q2, True)]))
+        self.assertEqual(duties, [(translate(math.degrees(q1)), translate(math.degrees(q2)), True)])
+
+    def test_streaming(self):
+        """Test that stages pull lazily, so an endless source still works"""
+        def endless():
+            while True:
+                yield 0, 150, True
+        stream = to_duty(solve_ik(interpolate(endless())))
+        self.assertEqual(len([next(stream) for _ in range(1000)]), 1000)
+
+class TestTimedSink(unittest.TestCase):
+    def setUp(self):
+        self.clock = sim_machine.install(virtual_time=True)
+
+    def tearDown(self):
+        sim_machine.uninstall()
+
+    def test_timebase(self):
+        """Test that the sink writes one item per tick of the timebase"""
+        written = []
+        scheduler = timed_sink([(i,) for i in range(5)], lambda value: written.append((self.clock.now, value)), rate_hz=20)
+        self.assertEqual([value for t, value in written], [0, 1, 2, 3, 4])
+        for i, (t, value) in enumerate(written):
+            self.assertAlmostEqual(t - written[0][0], i * 0.05, places=5)
+        self.assertEqual(scheduler.ticks, 5)
+
+    def test_sink_write_errors_propagate(self):
+        """Test that a StopIteration raised by write() is not mistaken for the end of the path"""
+        def write(value):
+            if value == 2:
+                raise StopIteration("from write")
+        with self.assertRaises(StopIteration):
+            timed_sink([(i,) for i in range(5)], write, rate_hz=20)
+        self.assertEqual(timed_sink([], write).ticks, 0)
+
+    def test_plot_path(self):
+        """Test the whole pipeline from points to servo writes"""
+        written = []
+        plot_path(line_source(0, 150, 10, 150), lambda shoulder, elbow, pen: written.append(shoulder), max_step=1)
+        self.assertEqual(len(written), 11)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import math
+
+from kinematics import DUTY_PER_DEGREE
+
+# Trapezoidal velocity/acceleration motion profiles for servo moves.
+# Joint positions are servo duty values (duty_u16), so limits given in degrees
+# are converted with DUTY_PER_DEGREE. Moves ramp up at the acceleration limit,
+# cruise at no more than the velocity limit and ramp down to stop on target.
+
+def degrees_to_duty(degrees):
+    """Convert an angle, speed or acceleration in degrees to duty steps."""
+    return degrees * DUTY_PER_DEGREE
+
+# ============================ Offline profiles ============================
+class TrapezoidalProfile:
+    """
+    Time-parameterised single-joint move from start to target. If a duration
+    longer than the fastest possible one is given, the cruise speed is lowered
+    so the move takes exactly that long (used to make joints finish together).
+    """
+
+    def __init__(self, start, target, v_max, a_max, duration=None):
+        if v_max <= 0 or a_max <= 0:
+            raise ValueError("Velocity and acceleration limits must be positive")
+        self.start = start
+        self.distance = abs(target - start)
+        self.direction = 1 if target >= start else -1
+        self.a_max = a_max
+
+        d, a = self.distance, a_max
+        if d * a < v_max * v_max:
+            # Never reaches v_max: accelerate then decelerate (triangle)
+            fastest = 2 * math.sqrt(d / a)
+            self.v_peak = math.sqrt(d * a)
+        else:
+            fastest = d / v_max + v_max / a
+            self.v_peak = v_max
+        self.duration = fastest
+        if duration is not None and duration > fastest:
+            # Solve d = v * T - v^2 / a for the slower cruise speed v
+            self.duration = duration
+            self.v_peak = (a * duration - math.sqrt(max(0.0, a * a * duration * duration - 4 * a * d))) / 2
+
+    def position(self, t):
+        """Joint position t seconds after the start of the move."""
+        d, a, v, T = self.distance, self.a_max, self.v_peak, self.duration
+        if t <= 0 or d == 0:
+            travelled = 0.0
+        elif t >= T:
+            travelled = d
+        else:
+            t_acc = v / a
+            if t < t_acc:
+                travelled = 0.5 * a * t * t
+            elif t < T - t_acc:
+                travelled = 0.5 * a * t_acc * t_acc + v * (t - t_acc)
+            else:
+                travelled = d - 0.5 * a * (T - t) * (T - t)
+        return self.start + self.direction * travelled
+
+def plan_move(start, target, v_max, a_max):
+    """
+    Plan a synchronised multi-joint move. start, target, v_max and a_max are
+    tuples with one entry per joint. Returns (profiles, duration); every joint
+    starts and finishes together, so the joints move in a straight line.
+    """
+    fastest = max(TrapezoidalProfile(s, t, v, a).duration for s, t, v, a in zip(start, target, v_max, a_max))
+    profiles = [TrapezoidalProfile(s, t, v, a, fastest) for s, t, v, a in zip(start, target, v_max, a_max)]
+    return profiles, fastest
+
+def move_setpoints(start, target, v_max, a_max, rate_hz=50):
+    """Yield integer duty setpoints, one per control tick, for a planned move ending exactly on target."""
+    profiles, duration = plan_move(start, target, v_max, a_max)
+    ticks = int(math.ceil(duration * rate_hz))
+    for tick in range(1, ticks):
+        t = tick / rate_hz
+        yield tuple(int(round(profile.position(t))) for profile in profiles)
+    yield tuple(int(round(value)) for value in target)
+
+# ============================ Online limiter ============================
+class MotionLimiter:
+    """
+    Tracks a moving target (such as the knob position) one control tick at a
+    time, limiting each joint's velocity and acceleration. Each joint slows
+    down in time to stop on its target, so large jumps do not slam the arm or
+    overshoot. The first step jumps straight to the target, because the real
+    servo position is unknown at power-up.
+    """
+
+    def __init__(self, v_max, a_max, rate_hz=50):
+        self.v_max = v_max
+        self.a_max = a_max
+        self.dt = 1 / rate_hz
+        self.position = None
+        self.velocity = [0.0] * len(v_max)
+
+    def step(self, target):
+        """Advance one tick towards target and return the new setpoint as integers."""
+        if self.position is None:
+            self.position = [float(value) for value in target]
+            return tuple(int(value) for value in target)
+
+        dt = self.dt
+        setpoint = []
+        for joint, goal in enumerate(target):
+            position, velocity = self.position[joint], self.velocity[joint]
+            a, dv_max = self.a_max[joint], self.a_max[joint] * dt
+            error = goal - position
+
+            if abs(error) <= abs(velocity) * dt + 0.5 * dv_max * dt and abs(velocity) <= dv_max:
+                # Close enough to stop this tick
+                position, velocity = float(goal), 0.0
+            else:
+                # Fastest speed that can still stop on target when slowing by
+                # a * dt per tick (the discrete form of sqrt(2 * a * error)), capped by v_max
+                wanted = min(self.v_max[joint], dv_max * (math.sqrt(0.25 + 2 * abs(error) / (dv_max * dt)) - 0.5))
+                wanted = wanted if error > 0 else -wanted
+                velocity += max(-dv_max, min(dv_max, wanted - velocity))
+                position += velocity * dt
+
+            self.position[joint], self.velocity[joint] = position, velocity
+            setpoint.append(int(round(position)))
+        return tuple(setpoint)
+
+    def settled(self, target, tolerance=0):
+        """True when every joint is within tolerance of target and at rest."""
+        return self.position is not None and all(
+            abs(goal - position) <= tolerance and velocity == 0.0
+            for goal, position, velocity in zip(target, self.position, self.velocity))
+
+def limit_motion(duties, limiter, tolerance=36):
+    """
+    Pipeline stage: turn a stream of (shoulder_duty, elbow_duty, pen_down)
+    waypoints into setpoints at the control rate. Each waypoint is held until
+    the limiter is within tolerance of it (about one degree by default), so no
+    waypoint is skipped, then the stream settles on the final waypoint.
+    """
+    target = pen_down = None
+    for shoulder, elbow, pen_down in duties:
+        target = (shoulder, elbow)
+        while True:
+            setpoint = limiter.step(target)
+            yield setpoint[0], setpoint[1], pen_down
+            if max(abs(setpoint[0] - shoulder), abs(setpoint[1] - elbow)) <= tolerance:
+                break
+    if target is not None:
+        while not limiter.settled(target):
+            setpoint = limiter.step(target)
+            yield setpoint[0], setpoint[1], pen_down
@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from motion_profile import (TrapezoidalProfile, MotionLimiter, plan_move, move_setpoints, limit_motion,
+                            degrees_to_duty)
+
+V_MAX, A_MAX = degrees_to_duty(180), degrees_to_duty(900)
+
+class TestTrapezoidalProfile(unittest.TestCase):
+    def test_trapezoid(self):
+        """Test a long move that reaches cruise speed"""
+        profile = TrapezoidalProfile(0, 1000, v_max=500, a_max=1000)
+        self.assertAlmostEqual(profile.duration, 2.5)
+        self.assertAlmostEqual(profile.position(0.5), 125)
+        self.assertAlmostEqual(profile.position(1.25), 500)
+        self.assertAlmostEqual(profile.position(2.5), 1000)
+
+    def test_triangle(self):
+        """Test a short move that never reaches cruise speed"""
+        profile = TrapezoidalProfile(100, 50, v_max=500, a_max=1000)
+        self.assertAlmostEqual(profile.duration, 2 * (50 / 1000) ** 0.5)
+        self.assertAlmostEqual(profile.position(profile.duration / 2), 75)
+        self.assertEqual(profile.position(10), 50)
+
+    def test_synchronised_move(self):
+        """Test that all joints finish together on target"""
+        profiles, duration = plan_move((2300, 5000), (7500, 4800), (V_MAX, V_MAX), (A_MAX, A_MAX))
+        self.assertTrue(all(profile.duration == duration for profile in profiles))
+        self.assertAlmostEqual(profiles[1].position(duration / 2), 4900)
+        setpoints = list(move_setpoints((2300, 5000), (7500, 4800), (V_MAX, V_MAX), (A_MAX, A_MAX), rate_hz=50))
+        self.assertEqual(setpoints[-1], (7500, 4800))
+        steps = [abs(b[0] - a[0]) for a, b in zip(setpoints, setpoints[1:])]
+        self.assertLessEqual(max(steps), V_MAX / 50 + 1)
+
+class TestMotionLimiter(unittest.TestCase):
+    def test_limits_and_no_overshoot(self):
+        """Test that random jumps are ramped within the limits and land on target"""
+        random.seed(1)
+        for _ in range(200):
+            start, target = random.randint(2300, 7500), random.randint(2300, 7500)
+            limiter = MotionLimiter((V_MAX,), (A_MAX,), rate_hz=50)
+            limiter.step((start,))
+            previous_velocity = 0.0
+            setpoints = []
+            for _ in range(500):
+                setpoints.append(limiter.step((target,))[0])
+                velocity = limiter.velocity[0]
+                self.assertLessEqual(abs(velocity), V_MAX + 1e-6)
+                self.assertLessEqual(abs(velocity - previous_velocity), A_MAX / 50 + 1e-6)
+                previous_velocity = velocity
+                if limiter.settled((target,)):
+                    break
+            self.assertTrue(limiter.settled((target,)))
+            direction = 1 if target >= start else -1
+            self.assertLessEqual(max((value - target) * direction for value in setpoints), 3)
+
+    def test_first_step_jumps(self):
+        """Test that the first command goes straight to the target"""
+        limiter = MotionLimiter((V_MAX, V_MAX), (A_MAX, A_MAX))
+        self.assertEqual(limiter.step((4000, 5000)), (4000, 5000))
+
+    def test_limit_motion_visits_every_waypoint(self):
+        """Test that the pipeline stage passes near every waypoint and settles on the last"""
+        waypoints = [(2300, 2300, True), (7500, 2300, True), (7500, 7500, False), (3000, 4000, True)]
+        limiter = MotionLimiter((V_MAX, V_MAX), (A_MAX, A_MAX))
+        setpoints = list(limit_motion(iter(waypoints), limiter, tolerance=36))
+        for shoulder, elbow, pen_down in waypoints:
+            self.assertTrue(any(abs(s - shoulder) <= 36 and abs(e - elbow) <= 36 and p == pen_down
+                                for s, e, p in setpoints))
+        self.assertEqual(setpoints[-1], (3000, 4000, True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import sys
+import time
+from array import array
+
+import numpy as np
+import matplotlib.image
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D
+
+from kinematics import L1, L2
+from batch_kinematics import untranslate_batch, forward_kinematics_batch
+from sim_machine import LOG_MAGIC, OP_DUTY
+
+# Headless renderer: servo duty recordings -> PNG.
+# Each chunk of (shoulder_duty, elbow_duty, pen_down) samples is turned back
+# into angles, run through vectorized forward kinematics and drawn straight
+# onto an Agg canvas, so a recording of any length renders with memory
+# bounded by the chunk size. What is drawn is where the servos were told to
+# go, clamping included, which is what a drawing on the bench would show.
+#
+# Recordings come from:
+#     DutyRecorder      a sink for motion_pipeline.timed_sink/plot_path, saving
+#                       raw little-endian uint16 (shoulder, elbow, pen) triples
+#     recording_chunks  such a file, read with np.memmap
+#     pwm_log_chunks    a sim_machine PWM log (pen always down)
+#
+# Usage: python offline_render.py recording.u16 out.png [pixels_per_mm]
+#        python offline_render.py --pwm-log run.bin out.png [pixels_per_mm]
+
+CHUNK = 1 << 18  # Samples per chunk
+
+# Upper half-plane in front of the arm, like the matplotlib simulator
+DEFAULT_EXTENT = (-L1 - L2 - 10, -10, L1 + L2 + 10, L1 + L2 + 10)
+
+# ============================ Recording ============================
+class DutyRecorder:
+    """Sink that appends (shoulder, elbow, pen_down) writes to a raw uint16 file."""
+
+    def __init__(self, path, buffer_samples=4096):
+        self.file = open(path, 'wb')
+        self.buffer = array('H')
+        self.buffer_samples = buffer_samples
+        self.samples = 0
+
+    def __call__(self, shoulder, elbow, pen_down):
+        self.buffer.append(shoulder)
+        self.buffer.append(elbow)
+        self.buffer.append(1 if pen_down else 0)
+        self.samples += 1
+        if len(self.buffer) >= 3 * self.buffer_samples:
+            self.flush()
+
+    def flush(self):
+        if sys.byteorder != 'little':
+            self.buffer.byteswap()
+        self.file.write(self.buffer)
+        self.buffer = array('H')
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def recording_chunks(path, chunk=CHUNK):
+    """Yield (shoulder, elbow, pen_down) arrays from a DutyRecorder file."""
+    samples = np.memmap(path, dtype='<u2', mode='r')
+    samples = samples[:len(samples) - len(samples) % 3].reshape(-1, 3)
+    for start in range(0, len(samples), chunk):
+        block = samples[start:start + chunk]
+        yield block[:, 0], block[:, 1], block[:, 2] != 0
+
+def pwm_log_chunks(path, shoulder_gpio=0, elbow_gpio=1, chunk=CHUNK):
+    """
+    Yield (shoulder, elbow, pen_down) arrays from a sim_machine PWM log, one
+    sample per duty write to either servo once both have been written.
+    """
+    value_size = array('L').itemsize  # PWMLog stores values as array('L')
+    with open(path, 'rb') as f:
+        if f.read(4) != LOG_MAGIC:
+            raise ValueError("Not a PWM log file")
+        count = int(np.frombuffer(f.read(4), '<u4')[0])
+    offset = 8 + 8 * count  # Skip the header and the timestamps
+    pins = np.memmap(path, dtype='u1', mode='r', offset=offset, shape=(count,))
+    ops = np.memmap(path, dtype='u1', mode='r', offset=offset + count, shape=(count,))
+    values = np.memmap(path, dtype=f'<u{value_size}', mode='r', offset=offset + 2 * count, shape=(count,))
+
+    shoulder, elbow = -1, -1  # Last duty of each servo carried across chunks
+    for start in range(0, count, chunk):
+        pin, op, value = pins[start:start + chunk], ops[start:start + chunk], values[start:start + chunk]
+        servo = (op == OP_DUTY) & ((pin == shoulder_gpio) | (pin == elbow_gpio))
+        pin, value = pin[servo], value[servo].astype(np.int64)
+        if len(pin) == 0:
+            continue
+        shoulder_values = _forward_fill(np.where(pin == shoulder_gpio, value, -1), shoulder)
+        elbow_values = _forward_fill(np.where(pin == elbow_gpio, value, -1), elbow)
+        shoulder, elbow = int(shoulder_values[-1]), int(elbow_values[-1])
+        known = (shoulder_values >= 0) & (elbow_values >= 0)
+        yield shoulder_values[known], elbow_values[known], np.ones(int(known.sum()), dtype=bool)
+
+def _forward_fill(values, previous):
+    """Replace each -1 with the last value before it (previous before the first)."""
+    index = np.where(values >= 0, np.arange(len(values)), -1)
+    np.maximum.accumulate(index, out=index)
+    return np.where(index >= 0, values[np.maximum(index, 0)], previous)
+
+# ============================ Rendering ============================
+def duties_to_points(shoulder, elbow):
+    """Pen positions (x, y) in mm for arrays of servo duties."""
+    q1 = np.radians(untranslate_batch(shoulder))
+    q2 = np.radians(untranslate_batch(elbow))
+    _, _, x, y = forward_kinematics_batch(q1, q2)
+    return x, y
+
+class Canvas:
+    """Agg canvas in workspace millimetres that pen strokes are drawn onto chunk by chunk."""
+
+    def __init__(self, extent=DEFAULT_EXTENT, pixels_per_mm=2.0, line_width_mm=0.5, color=(0, 0, 0)):
+        x_min, y_min, x_max, y_max = extent
+        self.width = int(round((x_max - x_min) * pixels_per_mm))
+        self.height = int(round((y_max - y_min) * pixels_per_mm))
+        self.renderer = RendererAgg(self.width, self.height, 72)
+        self.renderer.clear()
+        self.transform = Affine2D().translate(-x_min, -y_min).scale(pixels_per_mm)
+        self.gc = self.renderer.new_gc()
+        self.gc.set_linewidth(line_width_mm * pixels_per_mm)  # Points are pixels at 72 dpi
+        self.gc.set_foreground(color)
+        self.gc.set_joinstyle('round')
+        self.gc.set_capstyle('round')
+        self.last = None  # Last (x, y, pen_down) drawn, joins strokes across chunks
+        self.samples = 0
+        self.segments = 0
+        # White background
+        background = self.renderer.new_gc()
+        background.set_foreground((1, 1, 1))
+        self.renderer.draw_path(background, Path([(0, 0), (self.width, 0), (self.width, self.height),
+                                                  (0, self.height), (0, 0)], closed=True),
+                                Affine2D(), (1, 1, 1))
+
+    def draw(self, x, y, pen_down):
+        """Draw one chunk: a segment ends at every pen-down sample."""
+        if len(x) == 0:
+            return
+        self.samples += len(x)
+        if self.last is not None:
+            x = np.concatenate(([self.last[0]], x))
+            y = np.concatenate(([self.last[1]], y))
+            pen_down = np.concatenate(([self.last[2]], pen_down))
+        self.last = (x[-1], y[-1], bool(pen_down[-1]))
+
+        # Drop samples that repeat the previous one (the servos holding still)
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:] = (np.diff(x) != 0) | (np.diff(y) != 0) | (pen_down[1:] != pen_down[:-1])
+        x, y, pen_down = x[keep], y[keep], pen_down[keep]
+        codes = np.where(pen_down, Path.LINETO, Path.MOVETO).astype(Path.code_type)
+        codes[0] = Path.MOVETO
+        lines = int(np.count_nonzero(codes == Path.LINETO))
+        if lines:
+            self.segments += lines
+            self.renderer.draw_path(self.gc, Path(np.column_stack((x, y)), codes), self.transform)
+
+    def save(self, path):
+        matplotlib.image.imsave(path, np.asarray(self.renderer.buffer_rgba()))
+
+    def image(self):
+        """The canvas as an (height, width, 4) uint8 array, top row first."""
+        return np.asarray(self.renderer.buffer_rgba()).copy()
+
+def render(chunks, output=None, extent=DEFAULT_EXTENT, pixels_per_mm=2.0, line_width_mm=0.5):
+    """
+    Render (shoulder, elbow, pen_down) chunks onto a canvas and save it as a
+    PNG if output is given. Returns the canvas.
+    """
+    canvas = Canvas(extent, pixels_per_mm, line_width_mm)
+    for shoulder, elbow, pen_down in chunks:
+        x, y = duties_to_points(shoulder, elbow)
+        canvas.draw(x, y, np.asarray(pen_down, dtype=bool))
+    if output is not None:
+        canvas.save(output)
+    return canvas
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    pwm_log = "--pwm-log" in argv
+    args = [arg for arg in argv if arg != "--pwm-log"]
+    if len(args) < 2:
+        print("Usage: python offline_render.py [--pwm-log] recording out.png [pixels_per_mm]")
+        return
+    pixels_per_mm = float(args[2]) if len(args) > 2 else 2.0
+    chunks = pwm_log_chunks(args[0]) if pwm_log else recording_chunks(args[0])
+    start = time.perf_counter()
+    canvas = render(chunks, args[1], pixels_per_mm=pixels_per_mm)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {canvas.samples:,} samples ({canvas.segments:,} pen-down segments) to {args[1]} "
+          f"in {elapsed:.2f} s ({canvas.samples / elapsed:,.0f} samples/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from batch_kinematics import translate_batch
+from offline_render import recording_chunks, render
+
+# Benchmark: render a multi-million-sample duty recording to PNG.
+# Usage: python offline_render_benchmark.py [samples]
+
+def write_recording(path, samples, chunk=1 << 18):
+    """Write a recording of a joint-space Lissajous drawing in DutyRecorder's format, chunk by chunk."""
+    with open(path, "wb") as f:
+        for start in range(0, samples, chunk):
+            t = np.arange(start, min(samples, start + chunk)) / 2000
+            shoulder = translate_batch(90 + 60 * np.sin(t))
+            elbow = translate_batch(90 + 65 * np.sin(1.31 * t + 0.4))
+            pen = ((t * 3).astype(np.int64) % 5 != 0).astype(np.uint16)
+            np.column_stack((shoulder, elbow, pen)).astype('<u2').tofile(f)
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 4000000
+    with tempfile.TemporaryDirectory() as directory:
+        recording = os.path.join(directory, "run.u16")
+        write_recording(recording, samples)
+        start = time.perf_counter()
+        canvas = render(recording_chunks(recording), os.path.join(directory, "run.png"))
+        elapsed = time.perf_counter() - start
+    print(f"{canvas.samples:,} samples, {canvas.segments:,} segments drawn in {elapsed:.2f} s "
+          f"({canvas.samples / elapsed / 1e6:.1f} M samples/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import sim_machine
+from batch_kinematics import translate_batch, forward_kinematics_batch
+from offline_render import DutyRecorder, recording_chunks, pwm_log_chunks, duties_to_points, render
+
+def arc_duties(count=2000):
+    """Duties sweeping the shoulder with a fixed elbow, inside the servo range."""
+    shoulder_angles = np.linspace(40, 140, count)
+    elbow_angles = np.full(count, 90.0)
+    return translate_batch(shoulder_angles), translate_batch(elbow_angles), shoulder_angles, elbow_angles
+
+def dark(image):
+    return image[:, :, :3].min(axis=2) < 128
+
+class TestOfflineRender(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_duties_to_points(self):
+        """Test that duties map back to the forward kinematics of their angles"""
+        shoulder, elbow, shoulder_angles, elbow_angles = arc_duties(50)
+        x, y = duties_to_points(shoulder, elbow)
+        _, _, ex, ey = forward_kinematics_batch(np.radians(shoulder_angles), np.radians(elbow_angles))
+        self.assertLess(np.max(np.hypot(x - ex, y - ey)), 0.5)
+
+    def test_draws_pen_down_only(self):
+        """Test that pen-down samples are drawn and pen-up travel is not"""
+        shoulder, elbow, _, _ = arc_duties()
+        pen = np.arange(len(shoulder)) < len(shoulder) // 2
+        canvas = render([(shoulder, elbow, pen)], pixels_per_mm=1)
+        image = dark(canvas.image())
+        x, y = duties_to_points(shoulder, elbow)
+        for i, expected in ((len(x) // 4, True), (3 * len(x) // 4, False)):
+            column = int(round(x[i] + 320))
+            row = canvas.height - 1 - int(round(y[i] + 10))
+            self.assertEqual(image[row - 1:row + 2, column - 1:column + 2].any(), expected)
+
+    def test_chunking_is_invisible(self):
+        """Test that rendering in small chunks gives the same image as one chunk"""
+        shoulder, elbow, _, _ = arc_duties()
+        pen = (np.arange(len(shoulder)) // 300) % 2 == 0
+        whole = render([(shoulder, elbow, pen)], pixels_per_mm=2, line_width_mm=1).image()
+        chunks = [(shoulder[i:i + 97], elbow[i:i + 97], pen[i:i + 97]) for i in range(0, len(shoulder), 97)]
+        pieces = render(chunks, pixels_per_mm=2, line_width_mm=1).image()
+        # Only the line joins at chunk boundaries may differ by a pixel or so
+        self.assertLess(np.count_nonzero(dark(whole) != dark(pieces)), 0.01 * np.count_nonzero(dark(whole)))
+
+    def test_recorder_round_trip(self):
+        """Test that a DutyRecorder file reads back in chunks"""
+        shoulder, elbow, _, _ = arc_duties(1000)
+        with DutyRecorder(self.path("run.u16"), buffer_samples=64) as recorder:
+            for i, (s, e) in enumerate(zip(shoulder.tolist(), elbow.tolist())):
+                recorder(s, e, i % 2 == 0)
+        chunks = list(recording_chunks(self.path("run.u16"), chunk=300))
+        self.assertEqual([len(c[0]) for c in chunks], [300, 300, 300, 100])
+        self.assertEqual(np.concatenate([c[0] for c in chunks]).tolist(), shoulder.tolist())
+        self.assertEqual(np.concatenate([c[2] for c in chunks]).tolist()[:4], [True, False, True, False])
+
+    def test_pwm_log(self):
+        """Test that a PWM log is forward-filled into samples across chunks"""
+        sim_machine.reset()
+        shoulder_pwm, elbow_pwm, wrist_pwm = sim_machine.PWM(0, freq=50), sim_machine.PWM(1), sim_machine.PWM(2)
+        shoulder_pwm.duty_u16(4000)
+        wrist_pwm.duty_u16(4000)
+        elbow_pwm.duty_u16(5000)
+        shoulder_pwm.duty_u16(4100)
+        elbow_pwm.duty_u16(5100)
+        shoulder_pwm.duty_u16(4200)
+        sim_machine.pwm_log.save(self.path("run.bin"))
+        chunks = list(pwm_log_chunks(self.path("run.bin"), chunk=3))
+        shoulder = np.concatenate([c[0] for c in chunks]).tolist()
+        elbow = np.concatenate([c[1] for c in chunks]).tolist()
+        self.assertEqual(list(zip(shoulder, elbow)), [(4000, 5000), (4100, 5000), (4100, 5100), (4200, 5100)])
+
+    def test_saves_png(self):
+        """Test that the render is written as a PNG"""
+        shoulder, elbow, _, _ = arc_duties(100)
+        render([(shoulder, elbow, np.ones(100, dtype=bool))], self.path("out.png"))
+        with open(self.path("out.png"), "rb") as f:
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+
+if __name__ == '__main__':
+    unittest.main()
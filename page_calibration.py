@@ -1,6 +1,12 @@
 # calibration python file for the group code.
-from machine import Pin
+# Importing this file has no side effects: the servos are set up and the pen
+# moved only when it is run as a script (see main() at the bottom).
+import math
 import time
+from servo_translator import inverse_kinematics, translate
+from motion_pipeline import line_source, interpolate, solve_ik, timed_sink
+from calibration import run_calibration
+from config_store import ConfigStore, MAX_COEFFICIENTS
 
 # from inverse kinematics
 # assign an origin on a paper.
@@ -22,60 +28,77 @@ def move_pen(alpha: float, beta: float):
 
     print(f"Moving servos: Shoulder = {alpha:.2f}° ({shoulder_duty} μs), Elbow = {beta:.2f}° ({elbow_duty} μs)")
 
-# define the position
-# Target coordinates for the pen
-x, y = 9, 10  # Replace with the desired position on the page in cms
 l1, l2 = 13, 17  # Lengths of the two arm links
 
-try:
-    # Calculate joint angles using the inverse kinematics above
-    alpha, beta = inverse_kinematics(x, y, l1, l2)
-
-    # Move the pen to the calculated position using the joint angles calculated from the inverse kinematics function
-    move_pen(alpha, beta)
-
-    print(f"Pen moved to position: (x={x}, y={y})")
-except ValueError as e:
-    print(e)
-
 #validating pen movement by drawing a shape
     
 def draw_line(x1, y1, x2, y2, steps=10):
     """
     Draws a straight line from (x1, y1) to (x2, y2).
     """
-    for i in range(steps + 1):
-        # Insert the coordinates
-        x = x1 + (x2 - x1) * i / steps
-        y = y1 + (y2 - y1) * i / steps
-
-        # Calculate and move to the position
-        try:
-            alpha, beta = inverse_kinematics(x, y, l1, l2)
-            move_pen(alpha, beta)
-            time.sleep(0.1)  # Small delay for smooth movement
-        except ValueError as e:
-            print(e)
-
-# the function being used:
-# Draw a line from (5, 5) to (10, 10)
-draw_line(5, 5, 10, 10)
+    # Split the line into steps, solve each point and move there at 10 points per second
+    max_step = math.hypot(x2 - x1, y2 - y1) / steps or 1
+    points = interpolate(line_source(x1, y1, x2, y2), max_step)
+    angles = solve_ik(points, ik=lambda x, y: inverse_kinematics(x, y, l1, l2),
+                      on_unreachable=lambda x, y, e: print(e))
+    timed_sink(angles, lambda alpha, beta, pen_down: move_pen(alpha, beta), rate_hz=10)
 
 # Function to calibrate the page
-def calibrate_page():
-    # Define the origin and other calibration points
-    origin_x, origin_y = 0, 0
-    calibration_points = [(0, 0), (10, 0), (0, 10), (10, 10)]
-    
-    for (x, y) in calibration_points:
-        try:
-            alpha, beta = inverse_kinematics(x, y, l1, l2)
-            move_pen(alpha, beta)
-            print(f"Calibrated point: (x={x}, y={y})")
-            time.sleep(1)  # Pause to ensure the pen has moved
-        except ValueError as e:
-            print(e)
+def ask_position(expected_x, expected_y):
+    """Ask where the pen dot really landed, in mm (enter keeps the expected position)."""
+    answer = input(f"Expected ({expected_x:.1f}, {expected_y:.1f}) mm, measured x,y? ")
+    if not answer.strip():
+        return expected_x, expected_y
+    x, y = answer.split(",")
+    return float(x), float(y)
+
+def calibrate_page(servos, degree=1):
+    """
+    Move through the calibration angles, record where the pen really lands
+    and fit a per-joint correction. The correction table is installed on
+    the servo bank and the fit kept in the config store for the next start.
+    """
+    if degree > MAX_COEFFICIENTS - 1:
+        # Checked before any servo moves: the config record could not store the fit
+        raise ValueError(f"Calibration degree can be at most {MAX_COEFFICIENTS - 1}")
+    servos.correction = None  # Measure the servos as they are
+    calibration, model = run_calibration(servos.write, ask_position, degree=degree)
+    print(calibration.report(model))
+    servos.correction = model.table()
+    store = ConfigStore()
+    config = store.load()
+    config.calibration = (model.shoulder, model.elbow)
+    store.save(config)
+    return model
 
 # I get the position from the inverse kinematiocs and then defining the position of the pen on the page. 
 # make sure that its where it needs to be.
 
+def main():
+    global shoulder_servo, elbow_servo
+    from machine import Pin, PWM
+    shoulder_servo, elbow_servo = PWM(Pin(0)), PWM(Pin(1))
+    shoulder_servo.freq(50)
+    elbow_servo.freq(50)
+
+    # define the position
+    # Target coordinates for the pen
+    x, y = 9, 10  # Replace with the desired position on the page in cms
+
+    try:
+        # Calculate joint angles using the inverse kinematics above
+        alpha, beta = inverse_kinematics(x, y, l1, l2)
+
+        # Move the pen to the calculated position using the joint angles calculated from the inverse kinematics function
+        move_pen(alpha, beta)
+
+        print(f"Pen moved to position: (x={x}, y={y})")
+    except ValueError as e:
+        print(e)
+
+    # the function being used:
+    # Draw a line from (5, 5) to (10, 10)
+    draw_line(5, 5, 10, 10)
+
+if __name__ == "__main__":
+    main()
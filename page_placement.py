@@ -0,0 +1,227 @@
+import json
+import math
+import os
+
+from kinematics import L1, L2, PWM_MIN, PWM_MAX
+
+# Automatic page placement.
+# A page profile is a sheet size in mm. The solver tries every orientation
+# (in angle_step degree steps) of the sheet over the reachable-workspace map:
+# the map is resampled into the page's rotated frame, and a summed-area table
+# over it tells in O(1) whether a window of any size is fully reachable at any
+# position. The margin is grown by binary search until the sheet no longer
+# fits anywhere, and the orientation with the largest margin wins. If a sheet
+# does not fit at all, the drawing area is shrunk instead and the largest
+# scale that fits is reported.
+#
+# The control code's elbow solution can not express any point without
+# clamping (see workspace_map.py), so placements are solved for ELBOW_UP.
+#
+# Solutions are cached as JSON per geometry (arm lengths, PWM limits, map
+# resolution, elbow and angle step), so only the first start after a change
+# does the search. Reading the cache does not need numpy.
+
+CACHE_DIR = ".placement_cache"
+CACHE_VERSION = 1
+ELBOW_UP = 1  # Same as workspace_map.ELBOW_UP, without importing numpy
+
+# ============================ Page profiles ============================
+class PageProfile:
+    """A sheet of paper, width x height in mm (portrait)."""
+
+    def __init__(self, name, width, height):
+        if not (0 < width < math.inf and 0 < height < math.inf):  # Also false for NaN
+            raise ValueError("Page width and height must be positive finite sizes")
+        self.name = name
+        self.width = float(width)
+        self.height = float(height)
+
+    def key(self):
+        return f"{self.name}:{self.width:.1f}x{self.height:.1f}"
+
+    def __repr__(self):
+        return f"PageProfile({self.name!r}, {self.width:g}, {self.height:g})"
+
+A4 = PageProfile("A4", 210, 297)
+LETTER = PageProfile("Letter", 215.9, 279.4)
+PROFILES = {"a4": A4, "letter": LETTER}
+
+def profile(name):
+    """Look up "A4" or "Letter" (any case), or parse a custom "WIDTHxHEIGHT" size in mm."""
+    name = name.strip()
+    if name.lower() in PROFILES:
+        return PROFILES[name.lower()]
+    try:
+        width, height = (float(part) for part in name.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Unknown page size {name!r}, expected A4, Letter or WIDTHxHEIGHT in mm") from None
+    return PageProfile("Custom", width, height)
+
+# ============================ Placements ============================
+class Placement:
+    """
+    Where a page goes: its origin corner (x, y) in arm coordinates, the angle
+    (degrees) of the page's x axis, the margin (mm) left to the edge of the
+    reachable area, and the scale the drawing area must be shrunk to (1.0
+    when the whole sheet fits).
+    """
+
+    def __init__(self, page, x, y, angle, margin, scale=1.0, elbow=ELBOW_UP):
+        self.page = page
+        self.x, self.y = x, y
+        self.angle = angle
+        self.margin = margin
+        self.scale = scale
+        self.elbow = elbow
+
+    def to_arm(self, u, v):
+        """Page coordinates (mm from the origin corner) to arm coordinates."""
+        c, s = math.cos(math.radians(self.angle)), math.sin(math.radians(self.angle))
+        return self.x + c * u - s * v, self.y + s * u + c * v
+
+    def corners(self):
+        """The four corners of the drawing area in arm coordinates."""
+        w, h = self.page.width * self.scale, self.page.height * self.scale
+        return [self.to_arm(u, v) for u, v in ((0, 0), (w, 0), (w, h), (0, h))]
+
+    def to_dict(self):
+        return {"x": self.x, "y": self.y, "angle": self.angle, "margin": self.margin,
+                "scale": self.scale, "elbow": self.elbow}
+
+    @classmethod
+    def from_dict(cls, page, data):
+        return cls(page, data["x"], data["y"], data["angle"], data["margin"], data["scale"], data["elbow"])
+
+    def report(self):
+        text = (f"{self.page.name} {self.page.width:g}x{self.page.height:g} mm: origin ({self.x:.1f}, {self.y:.1f}) mm, "
+                f"rotated {self.angle:g} deg, margin {self.margin:.1f} mm")
+        if self.scale < 1:
+            text += f", does not fit - drawing area scaled to {100 * self.scale:.0f}%"
+        return text
+
+# ============================ Solver ============================
+def rotated_cells(workspace, angle):
+    """
+    Resample the workspace map into a frame rotated by angle (degrees).
+    Returns (cells, u_min, v_min); a cell counts only if all four corners land
+    in reachable cells of the map.
+    """
+    import numpy as np
+    r = workspace.resolution
+    reach = workspace.l1 + workspace.l2
+    size = int(math.ceil(2 * reach / r))
+    u_min = v_min = -size * r / 2
+    nodes = u_min + np.arange(size + 1) * r
+    us, vs = np.meshgrid(nodes, nodes)
+    c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    ok = workspace.reachable_batch(c * us - s * vs, s * us + c * vs)
+    cells = ok[:-1, :-1] & ok[1:, :-1] & ok[:-1, 1:] & ok[1:, 1:]
+    return cells, u_min, v_min
+
+def summed_area(cells):
+    """Summed-area table with a zero first row and column."""
+    import numpy as np
+    table = np.zeros((cells.shape[0] + 1, cells.shape[1] + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(cells, axis=0), axis=1, out=table[1:, 1:])
+    return table
+
+def fitting_windows(table, rows, columns):
+    """Boolean array over window positions (top row, left column): True where a rows x columns window is all reachable."""
+    if rows > table.shape[0] - 1 or columns > table.shape[1] - 1:
+        return None
+    sums = table[rows:, columns:] - table[:-rows, columns:] - table[rows:, :-columns] + table[:-rows, :-columns]
+    return sums == rows * columns
+
+def _largest_fit(table, rows, columns, limit):
+    """Largest k <= limit for which a (rows + 2k) x (columns + 2k) window fits, with its fitting positions."""
+    fits = fitting_windows(table, rows, columns)
+    if fits is None or not fits.any():
+        return -1, None
+    low, high, best = 0, limit, fits
+    while low < high:
+        k = (low + high + 1) // 2
+        wider = fitting_windows(table, rows + 2 * k, columns + 2 * k)
+        if wider is not None and wider.any():
+            low, best = k, wider
+        else:
+            high = k - 1
+    return low, best
+
+def _central(fits):
+    """The fitting position nearest the centroid of all of them."""
+    import numpy as np
+    rows, columns = np.nonzero(fits)
+    nearest = np.argmin((rows - rows.mean()) ** 2 + (columns - columns.mean()) ** 2)
+    return int(rows[nearest]), int(columns[nearest])
+
+def solve(page, workspace, angle_step=5):
+    """
+    Search every orientation for the placement of page with the largest
+    margin. Falls back to the largest scale that fits if the sheet does not.
+    Raises ValueError if the reachable area is empty.
+    """
+    r = workspace.resolution
+    frames = [(angle,) + rotated_cells(workspace, angle) for angle in range(0, 180, angle_step)]
+    tables = [summed_area(cells) for _, cells, _, _ in frames]
+    if not any(table[-1, -1] for table in tables):
+        raise ValueError("No point of the workspace is reachable without clamping")
+
+    def best_fit(width, height):
+        best = None
+        for (angle, cells, u_min, v_min), table in zip(frames, tables):
+            rows, columns = int(math.ceil(height / r)), int(math.ceil(width / r))
+            k, fits = _largest_fit(table, rows, columns, cells.shape[0] // 2)
+            if k >= 0 and (best is None or k > best[0]):
+                row, column = _central(fits)
+                # Centre the page in the window, which is rounded up to whole cells
+                u = u_min + (column + k) * r + (columns * r - width) / 2
+                v = v_min + (row + k) * r + (rows * r - height) / 2
+                best = (k, angle, u, v)
+        return best
+
+    fit = best_fit(page.width, page.height)
+    scale = 1.0
+    if fit is None:
+        # Binary search the largest drawing area that still fits
+        low, high = 0.0, 1.0
+        while high - low > 0.005:
+            middle = (low + high) / 2
+            attempt = best_fit(page.width * middle, page.height * middle)
+            if attempt is None:
+                high = middle
+            else:
+                low, fit = middle, attempt
+        if fit is None:
+            raise ValueError(f"{page.name} does not fit the reachable area at any scale")
+        scale = low
+    k, angle, u, v = fit
+    c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    return Placement(page, c * u - s * v, s * u + c * v, angle, k * r, scale, workspace.elbow)
+
+# ============================ Cache ============================
+def cache_path(resolution, elbow, angle_step, cache_dir=CACHE_DIR):
+    """Cache file for the current arm geometry and solver settings."""
+    name = f"L{L1:g}-{L2:g}_pwm{PWM_MIN}-{PWM_MAX}_r{resolution:g}_e{elbow}_a{angle_step}_v{CACHE_VERSION}.json"
+    return os.path.join(cache_dir, name)
+
+def place(page, resolution=1.0, elbow=ELBOW_UP, angle_step=5, cache_dir=CACHE_DIR):
+    """Placement for page, from the cache if this geometry has solved it before."""
+    path = cache_path(resolution, elbow, angle_step, cache_dir)
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if page.key() in cached:
+        return Placement.from_dict(page, cached[page.key()])
+
+    from workspace_map import WorkspaceMap
+    placement = solve(page, WorkspaceMap(resolution, elbow), angle_step)
+    cached[page.key()] = placement.to_dict()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cached, f, indent=1)
+    except OSError:
+        pass  # Read-only location, just skip caching
+    return placement
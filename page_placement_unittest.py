@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import page_placement
+from page_placement import A4, LETTER, PageProfile, Placement, profile, solve, place, summed_area, fitting_windows
+from workspace_map import WorkspaceMap, ELBOW_UP, ELBOW_DOWN
+
+class TestPagePlacement(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.workspace = WorkspaceMap(4.0, ELBOW_UP)
+
+    def assertInside(self, placement, step=5.0):
+        """Every point on the edge of the drawing area is reachable"""
+        w, h = placement.page.width * placement.scale, placement.page.height * placement.scale
+        for u in np.arange(0, w + step, step).clip(max=w):
+            for v in (0, h):
+                self.assertTrue(self.workspace.reachable(*placement.to_arm(u, v)), f"({u}, {v}) out of reach")
+        for v in np.arange(0, h + step, step).clip(max=h):
+            for u in (0, w):
+                self.assertTrue(self.workspace.reachable(*placement.to_arm(u, v)), f"({u}, {v}) out of reach")
+
+    def test_profiles(self):
+        """Test the named profiles and custom sizes"""
+        self.assertIs(profile("a4"), A4)
+        self.assertIs(profile(" Letter "), LETTER)
+        custom = profile("100x150")
+        self.assertEqual((custom.width, custom.height), (100.0, 150.0))
+        for bad in ("A5", "10x", "0x10", "-5x10", "infx10", "10xinf", "nanx10"):
+            with self.assertRaises(ValueError):
+                profile(bad)
+
+    def test_fitting_windows(self):
+        """Test the summed-area window search against direct slicing"""
+        rng = np.random.default_rng(3)
+        cells = rng.random((12, 15)) < 0.8
+        table = summed_area(cells)
+        for rows, columns in ((1, 1), (2, 3), (3, 2), (4, 4)):
+            fits = fitting_windows(table, rows, columns)
+            for row in range(cells.shape[0] - rows + 1):
+                for column in range(cells.shape[1] - columns + 1):
+                    self.assertEqual(fits[row, column], cells[row:row + rows, column:column + columns].all())
+        self.assertIsNone(fitting_windows(table, 13, 1))
+
+    def test_small_page_fits_with_margin(self):
+        """Test that a small page fits whole, with its margin clear of the edge"""
+        placement = solve(PageProfile("Card", 100, 60), self.workspace)
+        self.assertEqual(placement.scale, 1.0)
+        self.assertGreater(placement.margin, 0)
+        self.assertInside(placement)
+        # Pushing the page out by less than the margin keeps it reachable
+        for u, v in ((-placement.margin + 4, 30), (100 + placement.margin - 4, 30)):
+            self.assertTrue(self.workspace.reachable(*placement.to_arm(u, v)))
+
+    def test_larger_page_has_smaller_margin(self):
+        """Test that the margin shrinks as the page grows"""
+        small = solve(PageProfile("Small", 60, 60), self.workspace)
+        large = solve(PageProfile("Large", 120, 120), self.workspace)
+        self.assertGreater(small.margin, large.margin)
+
+    def test_a4_is_scaled(self):
+        """Test that a sheet too big for the arm is placed scaled down, still reachable"""
+        placement = solve(A4, self.workspace)
+        self.assertLess(placement.scale, 1.0)
+        self.assertGreater(placement.scale, 0.5)
+        self.assertInside(placement)
+
+    def test_empty_workspace(self):
+        """Test that an empty map is reported"""
+        with self.assertRaises(ValueError):
+            solve(A4, WorkspaceMap(8.0, ELBOW_DOWN))
+
+    def test_cache(self):
+        """Test that a second placement for the same geometry comes from the cache"""
+        with tempfile.TemporaryDirectory() as directory:
+            page = PageProfile("Card", 100, 60)
+            first = place(page, resolution=4.0, cache_dir=directory)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            solver = page_placement.solve
+            page_placement.solve = None  # Any search now fails
+            try:
+                second = place(page, resolution=4.0, cache_dir=directory)
+            finally:
+                page_placement.solve = solver
+            self.assertEqual(second.to_dict(), first.to_dict())
+            # Another geometry has its own cache file
+            place(page, resolution=8.0, cache_dir=directory)
+            self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_placement_round_trip(self):
+        """Test that to_arm maps the origin and keeps page distances"""
+        placement = Placement(A4, 10.0, 20.0, 30, 5.0)
+        self.assertEqual(placement.to_arm(0, 0), (10.0, 20.0))
+        x, y = placement.to_arm(100, 0)
+        self.assertAlmostEqual(np.hypot(x - 10, y - 20), 100)
+        self.assertEqual(Placement.from_dict(A4, placement.to_dict()).to_dict(), placement.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
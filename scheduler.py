@@ -0,0 +1,109 @@
+import time
+
+# Deadline-based fixed-rate scheduler for the control loops.
+# Each tick is started against an absolute deadline (ticks_us on the Pico,
+# perf_counter on a PC), so the loop rate no longer drifts with however much
+# printing or IK work a tick happened to do.
+
+if hasattr(time, "ticks_us"):
+    # MicroPython, or CPython with sim_machine installed
+    ticks_us, ticks_diff, ticks_add = time.ticks_us, time.ticks_diff, time.ticks_add
+else:
+    TICKS_PERIOD = 1 << 30
+
+    def ticks_us():
+        return int(time.perf_counter() * 1000000) % TICKS_PERIOD
+
+    def ticks_add(ticks, delta):
+        return (ticks + delta) % TICKS_PERIOD
+
+    def ticks_diff(ticks1, ticks2):
+        half = TICKS_PERIOD // 2
+        return (ticks1 - ticks2 + half) % TICKS_PERIOD - half
+
+def sleep_us(us):
+    if hasattr(time, "sleep_us"):
+        time.sleep_us(us)
+    else:
+        time.sleep(us / 1000000)
+
+class FixedRateScheduler:
+    """
+    Runs a step function at a fixed rate against absolute deadlines.
+    A tick that overruns its period counts as an overrun, and the deadlines it
+    missed are skipped rather than run back to back, so the loop keeps its phase.
+    """
+
+    def __init__(self, rate_hz):
+        if rate_hz <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate_hz = rate_hz
+        self.period_us = int(1000000 // rate_hz)
+        self.running = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0  # Deadlines dropped after overruns
+        self.max_jitter_us = 0  # Latest start after a deadline
+        self.total_jitter_us = 0
+        self.max_work_us = 0  # Longest time spent in the step function
+
+    def run(self, step, ticks=None):
+        """Call step() once per period, forever, for the given number of ticks or until stop()."""
+        period = self.period_us
+        deadline = ticks_us()
+        count = 0
+        self.running = True
+        while self.running and (ticks is None or count < ticks):
+            start = ticks_us()
+            jitter = ticks_diff(start, deadline)
+            if jitter > self.max_jitter_us:
+                self.max_jitter_us = jitter
+            self.total_jitter_us += abs(jitter)
+
+            step()
+
+            end = ticks_us()
+            work = ticks_diff(end, start)
+            if work > self.max_work_us:
+                self.max_work_us = work
+            self.ticks += 1
+            count += 1
+            if not self.running:
+                break  # Stopped by step(): return now rather than after the next deadline
+
+            deadline = ticks_add(deadline, period)
+            remaining = ticks_diff(deadline, end)
+            if remaining < 0:
+                self.overruns += 1
+                missed = -remaining // period + 1
+                self.skipped += missed
+                deadline = ticks_add(deadline, missed * period)
+                remaining = ticks_diff(deadline, end)
+            if remaining > 0:
+                sleep_us(remaining)
+
+    def stop(self):
+        """Make run() return once the current tick's step() has finished."""
+        self.running = False
+
+    def stats(self):
+        """Return the timing statistics gathered so far as a dict."""
+        return {
+            "rate_hz": self.rate_hz,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "max_jitter_us": self.max_jitter_us,
+            "mean_jitter_us": self.total_jitter_us / self.ticks if self.ticks else 0,
+            "max_work_us": self.max_work_us,
+        }
+
+    def report(self):
+        """One-line summary of the timing statistics."""
+        stats = self.stats()
+        return (f"{stats['ticks']} ticks at {stats['rate_hz']} Hz: {stats['overruns']} overruns "
+                f"({stats['skipped']} deadlines skipped), jitter max {stats['max_jitter_us']} us "
+                f"mean {stats['mean_jitter_us']:.1f} us, longest tick {stats['max_work_us']} us")
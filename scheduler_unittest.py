@@ -0,0 +1,56 @@
+import unittest
+
+import sim_machine
+from scheduler import FixedRateScheduler
+
+class TestFixedRateScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = sim_machine.install(virtual_time=True)
+
+    def tearDown(self):
+        sim_machine.uninstall()
+
+    def test_fixed_rate(self):
+        """Test that ticks start on absolute deadlines regardless of the work done in them"""
+        starts = []
+        def step():
+            starts.append(self.clock.now)
+            self.clock.now += 0.003 * (len(starts) % 3)  # Variable amount of work
+        scheduler = FixedRateScheduler(50)
+        scheduler.run(step, ticks=20)
+        for i, start in enumerate(starts):
+            self.assertAlmostEqual(start - starts[0], i * 0.02, places=5)
+        self.assertEqual(scheduler.overruns, 0)
+        self.assertLessEqual(scheduler.max_jitter_us, 1)
+
+    def test_overrun(self):
+        """Test that an overrunning tick is counted and the missed deadlines are skipped"""
+        starts = []
+        def step():
+            starts.append(self.clock.now)
+            if len(starts) == 3:
+                self.clock.now += 0.05  # 2.5 periods of work
+        scheduler = FixedRateScheduler(50)
+        scheduler.run(step, ticks=5)
+        self.assertEqual(scheduler.overruns, 1)
+        self.assertEqual(scheduler.skipped, 2)
+        self.assertAlmostEqual(starts[3] - starts[0], 0.1, places=5)
+        self.assertIn("1 overruns", scheduler.report())
+
+    def test_stop(self):
+        """Test that stop() from a step ends run() after that tick, without waiting for the next deadline"""
+        scheduler = FixedRateScheduler(50)
+        def step():
+            if scheduler.ticks == 2:
+                scheduler.stop()
+        scheduler.run(step)
+        self.assertEqual(scheduler.ticks, 3)
+        self.assertAlmostEqual(self.clock.now, 0.04, places=5)
+
+    def test_invalid_rate(self):
+        """Test that a zero rate is rejected"""
+        with self.assertRaises(ValueError):
+            FixedRateScheduler(0)
+
+if __name__ == '__main__':
+    unittest.main()
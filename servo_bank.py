@@ -0,0 +1,92 @@
+try:
+    from machine import disable_irq, enable_irq
+except ImportError:
+    def disable_irq():
+        return None
+
+    def enable_irq(state):
+        pass
+
+# Servo bank: the shoulder, elbow and wrist PWM channels behind one object.
+# The last duty sent to each channel is cached, so writing a value a channel
+# already has costs nothing, and a multi-channel update is done with
+# interrupts disabled so an IRQ handler never sees a half-applied move.
+# An optional correction (calibration.CorrectionTable) maps the ideal
+# shoulder and elbow duties to calibrated ones on every write, whether
+# through write() or write_channel().
+
+SHOULDER, ELBOW, WRIST = 0, 1, 2
+
+class ServoBank:
+    """Three servo PWM channels with cached duties and write elision."""
+
+    __slots__ = ("channels", "last", "issued", "elided", "correction")
+
+    def __init__(self, shoulder, elbow, wrist, correction=None):
+        self.channels = (shoulder, elbow, wrist)
+        self.correction = correction  # CorrectionTable-like (correct, correct_joint), or None
+        self.last = [None, None, None]  # Last duty written to each channel
+        self.issued = 0  # duty_u16 calls actually made
+        self.elided = 0  # Writes skipped because the duty was unchanged
+
+    @classmethod
+    def from_pins(cls, shoulder_pin, elbow_pin, wrist_pin, freq=50):
+        """Create the PWM channels on the given GPIOs and set their frequency."""
+        from machine import PWM, Pin
+        channels = []
+        for gpio in (shoulder_pin, elbow_pin, wrist_pin):
+            channel = PWM(Pin(gpio))
+            channel.freq(freq)
+            channels.append(channel)
+        return cls(*channels)
+
+    def write(self, shoulder, elbow, wrist=None):
+        """
+        Update all three channels in one go. The wrist mirrors the shoulder
+        unless given. Channels already at the requested duty are not written.
+        Returns the number of channels that changed.
+        """
+        if self.correction is not None:
+            shoulder, elbow = self.correction.correct(shoulder, elbow)
+        if wrist is None:
+            wrist = shoulder
+        last = self.last
+        if shoulder == last[0] and elbow == last[1] and wrist == last[2]:
+            self.elided += 3
+            return 0
+
+        changed = 0
+        state = disable_irq()
+        try:
+            for index, duty in ((SHOULDER, shoulder), (ELBOW, elbow), (WRIST, wrist)):
+                if duty != last[index]:
+                    self.channels[index].duty_u16(duty)
+                    last[index] = duty
+                    changed += 1
+        finally:
+            enable_irq(state)
+        self.issued += changed
+        self.elided += 3 - changed
+        return changed
+
+    def write_channel(self, index, duty):
+        """Update a single channel, corrected like write(). Returns True if it was written."""
+        if self.correction is not None and index != WRIST:
+            duty = self.correction.correct_joint(index, duty)
+        if duty == self.last[index]:
+            self.elided += 1
+            return False
+        self.channels[index].duty_u16(duty)
+        self.last[index] = duty
+        self.issued += 1
+        return True
+
+    def invalidate(self):
+        """Forget the cached duties, so the next write goes out on every channel."""
+        self.last = [None, None, None]
+
+    def report(self):
+        """One-line summary of the write counters."""
+        total = self.issued + self.elided
+        share = 100 * self.elided / total if total else 0
+        return f"Servo writes: {self.issued} issued, {self.elided} elided ({share:.0f}% saved)"
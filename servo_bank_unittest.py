@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+import sim_machine
+import servo_bank
+from servo_bank import ServoBank, SHOULDER, ELBOW, WRIST
+
+class TestServoBank(unittest.TestCase):
+    def setUp(self):
+        sim_machine.reset()
+        self.bank = ServoBank(sim_machine.PWM(0), sim_machine.PWM(1), sim_machine.PWM(2))
+
+    def writes(self):
+        return [(pin, value) for _, pin, op, value in sim_machine.pwm_log.records() if op == sim_machine.OP_DUTY]
+
+    def test_first_write_goes_out(self):
+        """Test that the first write reaches every channel and the wrist mirrors the shoulder"""
+        self.assertEqual(self.bank.write(4000, 5000), 3)
+        self.assertEqual(self.writes(), [(0, 4000), (1, 5000), (2, 4000)])
+        self.assertEqual(self.bank.last, [4000, 5000, 4000])
+
+    def test_redundant_writes_elided(self):
+        """Test that unchanged duties are not written again"""
+        self.bank.write(4000, 5000)
+        self.assertEqual(self.bank.write(4000, 5000), 0)
+        self.assertEqual(self.bank.write(4000, 5100), 1)
+        self.assertEqual(self.writes()[3:], [(1, 5100)])
+        self.assertEqual(self.bank.issued, 4)
+        self.assertEqual(self.bank.elided, 5)
+
+    def test_explicit_wrist(self):
+        """Test that a given wrist duty overrides the mirrored shoulder"""
+        self.bank.write(4000, 5000, 6000)
+        self.assertEqual(self.bank.last[WRIST], 6000)
+
+    def test_write_channel(self):
+        """Test single-channel writes share the cache with full writes"""
+        self.bank.write(4000, 5000)
+        self.assertFalse(self.bank.write_channel(ELBOW, 5000))
+        self.assertTrue(self.bank.write_channel(SHOULDER, 4100))
+        self.assertEqual(self.writes()[-1], (0, 4100))
+
+    def test_invalidate(self):
+        """Test that invalidate() forces the next write out on every channel"""
+        self.bank.write(4000, 5000)
+        self.bank.invalidate()
+        self.assertEqual(self.bank.write(4000, 5000), 3)
+
+    def test_irqs_restored(self):
+        """Test that interrupts are re-enabled even if a channel write fails"""
+        self.bank.channels[ELBOW].duty_u16 = mock.Mock(side_effect=OSError)
+        with mock.patch.object(servo_bank, "enable_irq") as enable_irq:
+            with self.assertRaises(OSError):
+                self.bank.write(4000, 5000)
+        enable_irq.assert_called_once()
+
+    def test_from_pins(self):
+        """Test that the bank creates its PWM channels at the requested frequency"""
+        sim_machine.install()
+        try:
+            bank = ServoBank.from_pins(0, 1, 2, freq=50)
+        finally:
+            sim_machine.uninstall()
+        self.assertEqual([channel.gpio for channel in bank.channels], [0, 1, 2])
+        self.assertEqual([channel.freq() for channel in bank.channels], [50, 50, 50])
+
+    def test_slots(self):
+        """Test that the bank has no per-instance dict"""
+        with self.assertRaises(AttributeError):
+            self.bank.extra = 1
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,34 +1,35 @@
-from machine import PWM
 import math
 
-def translate(angle: float) -> int:
-    """Translate a degree input into a servo PWM signal."""
-    pulse_width = 500 + (2500 - 500) * angle / 180  # Pulse width equation
-    duty_cycle = pulse_width / 20000  # 20000 microseconds / 20ms
-    duty_u16_value = int(duty_cycle * 65535)  # Convert to 16-bit PWM value
-    duty_u16_value = max(2300, min(7500, duty_u16_value))  # Clamp value
-    return duty_u16_value
+from kinematics import Kinematics
 
-def inverse_kinematics(x, y, l1, l2):
-    """Calculate the angles for a 2-link robotic arm based on target (x, y)."""
-    print(f"Inputs -> Target coordinates: (x={x}, y={y}), Arm lengths: l1={l1}, l2={l2}")
-    r = math.sqrt(x**2 + y**2)
-    print(f"Distance to target (r): {r:.2f}")
+# Fixed-point translation constants.
+# pulse_width = 500 + angle * 2000 / 180 us, duty = pulse_width / 20000 * 65535.
+# With the angle in centi-degrees this is duty = 65535 * (4500 + cdeg) / 180000,
+# which reduces to 13107 * (4500 + cdeg) / 36000.
+DUTY_NUM, DUTY_DEN, CDEG_OFFSET = 13107, 36000, 4500
+# At or beyond these angles the duty is clamped to 2300/7500. Returning early
+# also keeps the product below 2**30, so MicroPython never allocates a big int.
+CDEG_MIN, CDEG_MAX = 1817, 16100
 
-    if r > l1 + l2:
-        print("Target is out of reach. Try a closer point.")
-        raise ValueError("Target is out of reach.")
-    if r < abs(l1 - l2):
-        print("Target is too close to the base. Try a farther point.")
-        raise ValueError("Target is too close.")
+def translate_cdeg(cdeg: int) -> int:
+    """Translate an angle in integer centi-degrees into a servo PWM signal, using integers only."""
+    if cdeg <= CDEG_MIN:
+        return 2300  # Clamp value
+    if cdeg >= CDEG_MAX:
+        return 7500  # Clamp value
+    return DUTY_NUM * (CDEG_OFFSET + cdeg) // DUTY_DEN
 
-    cos_beta = (x**2 + y**2 - l1**2 - l2**2) / (2 * l1 * l2)
-    beta = math.acos(cos_beta)
-    k1 = l1 + l2 * math.cos(beta)
-    k2 = l2 * math.sin(beta)
-    alpha = math.atan2(y, x) - math.atan2(k2, k1)
+def translate(angle: float) -> int:
+    """Translate a degree input into a servo PWM signal."""
+    return translate_cdeg(int(angle * 100))
+
+# One precomputed kernel per arm geometry, elbow angle positive as before
+_arms = {}
 
-    alpha_deg = math.degrees(alpha)
-    beta_deg = math.degrees(beta)
-    print(f"Calculated Angles -> Shoulder (alpha): {alpha_deg:.2f}°, Elbow (beta): {beta_deg:.2f}°")
-    return alpha_deg, beta_deg
+def inverse_kinematics(x, y, l1, l2):
+    """Calculate the angles (degrees) for a 2-link robotic arm based on target (x, y)."""
+    arm = _arms.get((l1, l2))
+    if arm is None:
+        arm = _arms[(l1, l2)] = Kinematics(l1, l2, elbow=1)
+    alpha, beta = arm.inverse(x, y)
+    return math.degrees(alpha), math.degrees(beta)
@@ -0,0 +1,29 @@
+import sys
+import timeit
+
+from kinematics import translate as translate_float
+from servo_translator import translate, translate_cdeg
+
+# Micro-benchmark: float translate against the fixed-point translator.
+# Usage: python servo_translator_benchmark.py [calls]
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    angles = [(i * 7) % 200 - 10 for i in range(1000)]
+    cdegs = [angle * 100 for angle in angles]
+    rounds = max(1, calls // len(angles))
+
+    candidates = [
+        ("float translate(deg)", translate_float, angles),
+        ("fixed translate(deg)", translate, angles),
+        ("fixed translate_cdeg(cdeg)", translate_cdeg, cdegs),
+    ]
+    baseline = None
+    for name, function, inputs in candidates:
+        seconds = min(timeit.repeat(lambda: [function(value) for value in inputs], number=rounds, repeat=5))
+        rate = rounds * len(inputs) / seconds
+        baseline = baseline or rate
+        print(f"{name:28s} {rate:>12,.0f} calls/s ({rate / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import unittest
+from fractions import Fraction
+
+from kinematics import translate as translate_float
+from servo_translator import translate, translate_cdeg
+
+class TestFixedPointTranslator(unittest.TestCase):
+    def test_exact(self):
+        """Test that translate_cdeg matches the exact rational formula for every centi-degree"""
+        for cdeg in range(-3000, 22000):
+            pulse_width = 500 + Fraction(2000 * cdeg, 18000)
+            expected = max(2300, min(7500, int(pulse_width / 20000 * 65535)))
+            self.assertEqual(translate_cdeg(cdeg), expected, f"Wrong duty for {cdeg} centi-degrees")
+
+    def test_integer_only(self):
+        """Test that integer angles give integer results without going through floats"""
+        self.assertIsInstance(translate_cdeg(9000), int)
+        self.assertEqual(translate_cdeg(9000), 4915)
+        self.assertEqual(translate_cdeg(-10**9), 2300)
+        self.assertEqual(translate_cdeg(10**9), 7500)
+
+    def test_matches_float_version(self):
+        """Test that whole-degree inputs agree with the original float translate"""
+        for angle in range(-20, 200):
+            self.assertEqual(translate(angle), translate_float(angle))
+
+if __name__ == '__main__':
+    unittest.main()
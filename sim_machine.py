@@ -0,0 +1,357 @@
+import struct
+import sys
+import time
+from array import array
+
+# Simulated machine backend.
+# Pure-Python stand-ins for machine.Pin, ADC and PWM (plus no-op
+# disable_irq/enable_irq) so the control programs
+# can run headless on Linux. ADC readings come from scripted or recorded
+# sample streams, and every PWM duty_u16/freq call is logged with a timestamp.
+# With virtual time, sleeping and asyncio timers both advance a virtual clock.
+#
+# Run a control program against it with:
+#     python sim_machine.py single_file.py --adc 27=knob1.bin --adc 26=32768*500 --virtual-time
+
+TICKS_PERIOD = 1 << 30  # Same wrap-around as MicroPython's ticks_ms/ticks_us
+
+OP_FREQ, OP_DUTY = 0, 1
+LOG_MAGIC = b"PWML"
+
+class SimulationFinished(Exception):
+    """Raised when a scripted input stream runs out, which ends a headless run."""
+
+# ============================ Clock ============================
+def _now():
+    # Looked up on every call so a virtual clock installed later is honoured
+    return time.perf_counter()
+
+class VirtualClock:
+    """A clock that only moves when the program sleeps, so loops run at full speed."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+
+def virtual_event_loop(clock):
+    """
+    An asyncio event loop on the virtual clock: where the loop would wait for
+    its next timer, the clock jumps forward instead, so async control code
+    runs at full speed too.
+    """
+    import asyncio
+    import selectors
+
+    class VirtualSelector(selectors.SelectSelector):
+        def select(self, timeout=None):
+            if timeout is None:
+                raise SimulationFinished("Every task is waiting and no timer is due")
+            clock.sleep(timeout)
+            return super().select(0)
+
+    return asyncio.SelectorEventLoop(VirtualSelector())
+
+def ticks_ms():
+    return int(_now() * 1000) % TICKS_PERIOD
+
+def ticks_us():
+    return int(_now() * 1000000) % TICKS_PERIOD
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) % TICKS_PERIOD
+
+def ticks_diff(ticks1, ticks2):
+    half = TICKS_PERIOD // 2
+    return (ticks1 - ticks2 + half) % TICKS_PERIOD - half
+
+def sleep_ms(ms):
+    time.sleep(ms / 1000)
+
+def sleep_us(us):
+    time.sleep(us / 1000000)
+
+# ============================ PWM log ============================
+class PWMLog:
+    """Compact column store of PWM calls: timestamp, GPIO, operation and value."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.times = array('d')
+        self.pins = array('B')
+        self.ops = array('B')
+        self.values = array('L')
+
+    def append(self, pin, op, value):
+        self.times.append(_now())
+        self.pins.append(pin)
+        self.ops.append(op)
+        self.values.append(value)
+
+    def __len__(self):
+        return len(self.times)
+
+    def records(self):
+        """Iterate over (time, pin, op, value) tuples."""
+        return zip(self.times, self.pins, self.ops, self.values)
+
+    def duties(self, pin):
+        """Return (times, values) of every duty_u16 write to one GPIO."""
+        times, values = array('d'), array('L')
+        for t, p, op, value in self.records():
+            if p == pin and op == OP_DUTY:
+                times.append(t)
+                values.append(value)
+        return times, values
+
+    def save(self, path):
+        """Write the log to a binary file (header, then one block per column)."""
+        with open(path, 'wb') as f:
+            f.write(LOG_MAGIC + struct.pack('<I', len(self)))
+            for column in (self.times, self.pins, self.ops, self.values):
+                f.write(array(column.typecode, column).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        log = cls()
+        with open(path, 'rb') as f:
+            if f.read(4) != LOG_MAGIC:
+                raise ValueError("Not a PWM log file")
+            count, = struct.unpack('<I', f.read(4))
+            for column in (log.times, log.pins, log.ops, log.values):
+                column.frombytes(f.read(count * column.itemsize))
+        return log
+
+pwm_log = PWMLog()
+
+# ============================ Input streams ============================
+_adc_streams = {}
+_pin_streams = {}
+
+def _stream(samples, repeat):
+    samples = list(samples) if repeat else samples
+    while True:
+        for sample in samples:
+            yield sample
+        if not repeat:
+            return
+
+def script_adc(gpio, samples, repeat=False):
+    """Feed read_u16() on the ADC attached to `gpio` from an iterable of 0-65535 values."""
+    _adc_streams[_adc_gpio(gpio)] = _stream(samples, repeat)
+
+def load_adc_recording(gpio, path, repeat=False):
+    """Feed an ADC from a recording of raw little-endian uint16 samples."""
+    samples = array('H')
+    with open(path, 'rb') as f:
+        samples.frombytes(f.read())
+    if sys.byteorder != 'little':
+        samples.byteswap()
+    script_adc(gpio, samples, repeat)
+
+def script_pin(gpio, samples, repeat=False):
+    """Feed value() on an input Pin from an iterable of 0/1 values."""
+    _pin_streams[gpio] = _stream(samples, repeat)
+
+def reset():
+    """Forget every scripted stream, pin state and logged PWM call."""
+    _adc_streams.clear()
+    _pin_streams.clear()
+    Pin._levels.clear()
+    pwm_log.clear()
+
+def _adc_gpio(pin):
+    if isinstance(pin, Pin):
+        return pin.id
+    return pin + 26 if 0 <= pin <= 3 else pin  # ADC channel numbers 0-3 are GP26-GP29
+
+# ============================ machine API ============================
+class Pin:
+    IN, OUT, OPEN_DRAIN = 0, 1, 2
+    PULL_UP, PULL_DOWN = 1, 2
+    IRQ_FALLING, IRQ_RISING = 4, 8
+
+    _levels = {}  # GPIO -> last level written to an output pin
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        self.handler = None
+        if value is not None:
+            self.value(value)
+
+    def value(self, level=None):
+        if level is not None:
+            Pin._levels[self.id] = 1 if level else 0
+            return None
+        stream = _pin_streams.get(self.id)
+        if stream is not None:
+            try:
+                return next(stream)
+            except StopIteration:
+                raise SimulationFinished(f"Pin {self.id} input stream finished") from None
+        return Pin._levels.get(self.id, 0)
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def toggle(self):
+        self.value(not Pin._levels.get(self.id, 0))
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self.handler = handler
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+class ADC:
+    def __init__(self, pin):
+        self.gpio = _adc_gpio(pin)
+
+    def read_u16(self):
+        stream = _adc_streams.get(self.gpio)
+        if stream is None:
+            return 0
+        try:
+            return next(stream)
+        except StopIteration:
+            raise SimulationFinished(f"ADC on GP{self.gpio} sample stream finished") from None
+
+class PWM:
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin
+        self.gpio = pin.id if isinstance(pin, Pin) else pin
+        self._freq = 0
+        self._duty = 0
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+        pwm_log.append(self.gpio, OP_FREQ, value)
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty
+        self._duty = value
+        pwm_log.append(self.gpio, OP_DUTY, value)
+
+    def deinit(self):
+        self._duty = 0
+
+def disable_irq():
+    return 0
+
+def enable_irq(state):
+    pass
+
+# ============================ Installation ============================
+_saved_time = {}
+_saved_policy = []
+
+def install(virtual_time=False):
+    """
+    Register this module as `machine` (and the time module as `utime`) and add
+    the MicroPython ticks/sleep helpers to time. With virtual_time, sleeping
+    advances a virtual clock instead of blocking.
+    """
+    sys.modules['machine'] = sys.modules[__name__]
+    sys.modules.setdefault('utime', time)
+    for name, function in (("ticks_ms", ticks_ms), ("ticks_us", ticks_us), ("ticks_add", ticks_add),
+                           ("ticks_diff", ticks_diff), ("sleep_ms", sleep_ms), ("sleep_us", sleep_us)):
+        if not hasattr(time, name):
+            _saved_time.setdefault(name, None)
+            setattr(time, name, function)
+    if virtual_time:
+        clock = VirtualClock()
+        for name in ("sleep", "perf_counter", "monotonic"):
+            _saved_time.setdefault(name, getattr(time, name))
+        time.sleep = clock.sleep
+        time.perf_counter = clock.perf_counter
+        time.monotonic = clock.perf_counter
+        # asyncio.run() (control_runtime) gets an event loop on the same clock
+        import asyncio
+
+        class VirtualPolicy(asyncio.DefaultEventLoopPolicy):
+            def new_event_loop(self):
+                return virtual_event_loop(clock)
+
+        if not _saved_policy:
+            _saved_policy.append(asyncio.get_event_loop_policy())
+        asyncio.set_event_loop_policy(VirtualPolicy())
+        return clock
+    return None
+
+def uninstall():
+    """Undo install()."""
+    if sys.modules.get('machine') is sys.modules[__name__]:
+        del sys.modules['machine']
+    if sys.modules.get('utime') is time:
+        del sys.modules['utime']
+    for name, original in _saved_time.items():
+        if original is None:
+            delattr(time, name)
+        else:
+            setattr(time, name, original)
+    _saved_time.clear()
+    if _saved_policy:
+        import asyncio
+        asyncio.set_event_loop_policy(_saved_policy.pop())
+
+# ============================ Command line ============================
+def _parse_adc_argument(argument):
+    gpio, _, source = argument.partition("=")
+    if "*" in source:
+        value, _, count = source.partition("*")
+        script_adc(int(gpio), [int(value)] * int(count))
+    else:
+        load_adc_recording(int(gpio), source)
+
+def main(argv=None):
+    import argparse
+    import runpy
+
+    parser = argparse.ArgumentParser(description="Run a control program against the simulated machine backend.")
+    parser.add_argument("script", help="program to run, e.g. single_file.py")
+    parser.add_argument("--adc", action="append", default=[], metavar="GPIO=FILE|VALUE*COUNT",
+                        help="ADC sample stream; the run ends when a stream is exhausted")
+    parser.add_argument("--virtual-time", action="store_true", help="make time.sleep return immediately")
+    parser.add_argument("--log", help="save the PWM log to this file")
+    args = parser.parse_args(argv)
+
+    for argument in args.adc:
+        _parse_adc_argument(argument)
+    real_start = time.perf_counter()
+    install(virtual_time=args.virtual_time)
+    try:
+        runpy.run_path(args.script, run_name="__main__")
+    except SimulationFinished as e:
+        print(f"Simulation finished: {e}")
+    finally:
+        uninstall()
+    elapsed = time.perf_counter() - real_start
+
+    writes = sum(1 for op in pwm_log.ops if op == OP_DUTY)
+    print(f"{writes} duty writes in {elapsed:.3f} s ({writes / elapsed:,.0f} writes/s)")
+    if args.log:
+        pwm_log.save(args.log)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import runpy
+import sys
+import tempfile
+import time
+import unittest
+
+import sim_machine
+
+class TestSimMachine(unittest.TestCase):
+    def setUp(self):
+        sim_machine.reset()
+
+    def tearDown(self):
+        sim_machine.uninstall()
+        sim_machine.reset()
+
+    def test_scripted_adc(self):
+        """Test that ADC readings come from the scripted stream and end the run when exhausted"""
+        sim_machine.script_adc(27, [100, 200])
+        knob = sim_machine.ADC(sim_machine.Pin(27))
+        self.assertEqual([knob.read_u16(), knob.read_u16()], [100, 200])
+        with self.assertRaises(sim_machine.SimulationFinished):
+            knob.read_u16()
+        self.assertEqual(sim_machine.ADC(1).gpio, 27)
+
+    def test_pwm_log(self):
+        """Test that freq and duty_u16 calls are logged and survive a save/load"""
+        servo = sim_machine.PWM(sim_machine.Pin(0))
+        servo.freq(50)
+        servo.duty_u16(4915)
+        servo.duty_u16(2300)
+        self.assertEqual(servo.duty_u16(), 2300)
+        times, values = sim_machine.pwm_log.duties(0)
+        self.assertEqual(list(values), [4915, 2300])
+        self.assertLessEqual(times[0], times[1])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pwm.bin")
+            sim_machine.pwm_log.save(path)
+            loaded = sim_machine.PWMLog.load(path)
+        self.assertEqual(list(loaded.records()), list(sim_machine.pwm_log.records()))
+
+    def test_install(self):
+        """Test that install() provides machine and the MicroPython time helpers"""
+        clock = sim_machine.install(virtual_time=True)
+        import machine
+        self.assertIs(machine.PWM, sim_machine.PWM)
+        start = time.ticks_ms()
+        time.sleep(2.5)
+        self.assertEqual(time.ticks_diff(time.ticks_ms(), start), 2500)
+        self.assertEqual(clock.now, 2.5)
+        sim_machine.uninstall()
+        self.assertNotIn('machine', sys.modules)
+        self.assertFalse(hasattr(time, 'ticks_ms'))
+
+    def test_ticks_wrap(self):
+        """Test that ticks arithmetic wraps like MicroPython"""
+        late = sim_machine.ticks_add(sim_machine.TICKS_PERIOD - 5, 10)
+        self.assertEqual(late, 5)
+        self.assertEqual(sim_machine.ticks_diff(late, sim_machine.TICKS_PERIOD - 5), 10)
+
+    def test_run_single_file(self):
+        """Test that the knob control program runs headless until its samples run out"""
+        # 4 reads per knob per tick: 20 ticks resting at one position, then 40 at another
+        sim_machine.script_adc(27, [20000] * 80 + [24000] * 160)
+        sim_machine.script_adc(26, [30000] * 240)
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "single_file.py")
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            sim_machine.install(virtual_time=True)
+            try:
+                with open(os.devnull, 'w') as devnull:
+                    stdout, sys.stdout = sys.stdout, devnull
+                    try:
+                        with self.assertRaises(sim_machine.SimulationFinished):
+                            runpy.run_path(script)
+                    finally:
+                        sys.stdout = stdout
+            finally:
+                os.chdir(cwd)
+        times, values = sim_machine.pwm_log.duties(0)
+        # One write for the first position, nothing while resting, then a ramp to the second
+        self.assertGreater(len(values), 2)
+        self.assertLess(len(values), 40)
+        self.assertAlmostEqual(times[1] - times[0], 20 / 50, places=5)  # 50 Hz control loop
+        self.assertLess(times[-1] - times[0], 59 / 50)
+
+if __name__ == '__main__':
+    unittest.main()
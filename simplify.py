@@ -0,0 +1,105 @@
+from array import array
+
+from kinematics import PEN_RESOLUTION
+
+# Ramer-Douglas-Peucker polyline simplification.
+# Dense polylines send far more points through inverse_kinematics -> translate
+# -> duty_u16 than the servos can resolve. Simplification drops every vertex
+# whose removal moves the drawn line by no more than a tolerance in mm, before
+# any IK is run. The recursion of RDP is done with an explicit stack, so long
+# strokes cannot hit the recursion limit (which is small on MicroPython).
+
+DEFAULT_TOLERANCE = PEN_RESOLUTION
+
+def _keep_flags(xs, ys, tolerance):
+    """Return a bytearray marking the vertices RDP keeps."""
+    count = len(xs)
+    keep = bytearray(count)
+    keep[0] = keep[count - 1] = 1
+    tolerance_squared = tolerance * tolerance
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        length_squared = dx * dx + dy * dy
+        farthest, farthest_squared = -1, tolerance_squared * length_squared if length_squared else tolerance_squared
+        for i in range(first + 1, last):
+            px, py = xs[i] - ax, ys[i] - ay
+            if length_squared:
+                # Squared distance to the chord, scaled by the chord length squared
+                cross = px * dy - py * dx
+                distance = cross * cross
+            else:
+                distance = px * px + py * py  # Closed loop: distance to the end point
+            if distance > farthest_squared:
+                farthest, farthest_squared = i, distance
+        if farthest >= 0:
+            keep[farthest] = 1
+            if farthest - first > 1:
+                stack.append((first, farthest))
+            if last - farthest > 1:
+                stack.append((farthest, last))
+    return keep
+
+def simplify_polyline(polyline, tolerance=DEFAULT_TOLERANCE):
+    """Simplify a flat x, y array('f') polyline, always keeping its end points."""
+    count = len(polyline) // 2
+    if count <= 2:
+        return array(polyline.typecode, polyline)
+    xs, ys = polyline[0::2], polyline[1::2]
+    keep = _keep_flags(xs, ys, tolerance)
+    simplified = array(polyline.typecode)
+    for i in range(count):
+        if keep[i]:
+            simplified.append(xs[i])
+            simplified.append(ys[i])
+    return simplified
+
+class SimplifyStats:
+    """Counts points going into and out of simplify()."""
+
+    def __init__(self):
+        self.points_in = 0
+        self.points_out = 0
+
+    def ratio(self):
+        """Fraction of the points that were dropped."""
+        return 1 - self.points_out / self.points_in if self.points_in else 0.0
+
+    def report(self):
+        return (f"Simplified {self.points_in} points to {self.points_out} "
+                f"({100 * self.ratio():.0f}% fewer)")
+
+def simplify(points, tolerance=DEFAULT_TOLERANCE, stats=None, max_run=1024):
+    """
+    Pipeline stage: simplify a stream of (x, y, pen_down) points. Each run of
+    points with the same pen state is simplified on its own, so pen changes
+    happen exactly where they did; runs longer than max_run points are cut
+    into pieces to keep memory bounded. Counts go into stats if given.
+    """
+    xs, ys = [], []
+    pen = None
+    continued = False  # True when the run's first point was already yielded by the previous piece
+    for x, y, pen_down in points:
+        if stats is not None:
+            stats.points_in += 1
+        if pen_down != pen or len(xs) >= max_run:
+            if xs:
+                yield from _flush(xs, ys, pen, tolerance, stats, continued)
+                # Cutting a long run: its last point also starts the next piece
+                continued = pen_down == pen
+                xs, ys = ([xs[-1]], [ys[-1]]) if continued else ([], [])
+            pen = pen_down
+        xs.append(x)
+        ys.append(y)
+    if xs:
+        yield from _flush(xs, ys, pen, tolerance, stats, continued)
+
+def _flush(xs, ys, pen_down, tolerance, stats, continued):
+    keep = _keep_flags(xs, ys, tolerance) if len(xs) > 2 else b"\x01" * len(xs)
+    for i in range(1 if continued else 0, len(xs)):
+        if keep[i]:
+            if stats is not None:
+                stats.points_out += 1
+            yield xs[i], ys[i], pen_down
@@ -0,0 +1,77 @@
+import math
+import unittest
+from array import array
+
+from motion_pipeline import plot_path
+from simplify import simplify_polyline, simplify, SimplifyStats
+
+def circle(count, radius=50, cx=0, cy=200):
+    return [(cx + radius * math.cos(2 * math.pi * i / count), cy + radius * math.sin(2 * math.pi * i / count))
+            for i in range(count + 1)]
+
+def flat(points):
+    return array('f', [value for point in points for value in point])
+
+def segment_distance(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    length_squared = dx * dx + dy * dy
+    t = 0 if length_squared == 0 else max(0, min(1, ((px - ax) * dx + (py - ay) * dy) / length_squared))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+class TestSimplify(unittest.TestCase):
+    def test_collinear(self):
+        """Test that points on a straight line collapse to its end points"""
+        line = flat([(i, 2 * i) for i in range(100)])
+        self.assertEqual(list(simplify_polyline(line, 0.01)), [0, 0, 99, 198])
+
+    def test_within_tolerance(self):
+        """Test that every dropped vertex lies within tolerance of the simplified line"""
+        points = circle(2000)
+        for tolerance in (0.05, 0.5, 2.0):
+            simplified = simplify_polyline(flat(points), tolerance)
+            kept = [(simplified[i], simplified[i + 1]) for i in range(0, len(simplified), 2)]
+            self.assertLess(len(kept), len(points))
+            self.assertEqual(kept[0], (points[0][0], points[0][1]))
+            for px, py in points:
+                distance = min(segment_distance(px, py, *a, *b) for a, b in zip(kept, kept[1:]))
+                self.assertLessEqual(distance, tolerance + 1e-4)
+
+    def test_closed_loop(self):
+        """Test that a closed loop whose ends coincide keeps its shape"""
+        simplified = simplify_polyline(flat(circle(400)), 0.5)
+        self.assertGreater(len(simplified), 8)
+
+    def test_stream_keeps_pen_changes(self):
+        """Test that the stage simplifies each pen run and keeps the pen-change points"""
+        stroke = [(x, 100, True) for x in range(20)]
+        points = [(0, 100, False)] + stroke + [(19, 150, False)] + [(19, 150 + y, True) for y in range(10)]
+        stats = SimplifyStats()
+        result = list(simplify(points, 0.1, stats))
+        self.assertEqual(result, [(0, 100, False), (0, 100, True), (19, 100, True), (19, 150, False),
+                                  (19, 150, True), (19, 159, True)])
+        self.assertEqual(stats.points_in, len(points))
+        self.assertEqual(stats.points_out, 6)
+        self.assertAlmostEqual(stats.ratio(), 1 - 6 / len(points))
+
+    def test_long_runs_are_cut(self):
+        """Test that cutting a long run neither loses nor repeats points"""
+        points = [(x / 10, 100 + (x % 7) * 0.01, True) for x in range(5000)]
+        result = list(simplify(points, 1.0, max_run=256))
+        xs = [x for x, y, pen in result]
+        self.assertEqual(xs, sorted(set(xs)))
+        self.assertEqual(result[0], points[0])
+        self.assertEqual(result[-1], points[-1])
+        self.assertLess(len(result), 40)
+
+    def test_plot_path_stage(self):
+        """Test that plot_path runs the simplification before IK"""
+        stats = SimplifyStats()
+        points = [(x / 20, 200, True) for x in range(200)]
+        writes = []
+        plot_path(points, lambda *item: writes.append(item), rate_hz=1000, max_step=5,
+                  simplify_tolerance=0.1, simplify_stats=stats)
+        self.assertEqual(stats.points_out, 2)
+        self.assertEqual(len(writes), 3)  # Start, one interpolated point, end
+
+if __name__ == '__main__':
+    unittest.main()
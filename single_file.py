@@ -1,10 +1,53 @@
 import math
-import time
-from machine import Pin, ADC, PWM
+from machine import Pin, ADC
+from kinematics import Kinematics, xy_to_knob
+from duty_table import KnobDutyTable
+from control_runtime import ControlRuntime, BoundedQueue
+from telemetry import Telemetry, DEBUG, INFO, WARN
+from motion_profile import MotionLimiter, degrees_to_duty
+from knob_input import KnobInput, EMA
+from servo_bank import ServoBank
+from calibration import CalibrationModel
+from config_store import ConfigStore
 
 # Arm length constants
 L1, L2 = 155, 155  # Lengths of the first and second arm segments (in mm)
 
+# Knob lookup table: resolution in bits per knob, and where it is kept in flash
+KNOB_TABLE_BITS = 6
+KNOB_TABLE_FILE = "knob_table.bin"
+
+# Control loop rate, matching the 50 Hz servo PWM frame
+CONTROL_RATE_HZ = 50
+
+# Button debounce, and how often the status line is recorded and telemetry flushed
+BUTTON_DEBOUNCE_MS = 500
+TELEMETRY_RATE_HZ = 10
+
+# Knob filtering: samples averaged per read, EMA weight 1/2**KNOB_EMA_SHIFT, and the
+# smallest filtered movement (in ADC counts) that counts as the knob being turned
+KNOB_OVERSAMPLE = 4
+KNOB_EMA_SHIFT = 2
+KNOB_DEADBAND = 128
+
+# Joint speed and acceleration limits (degrees/s and degrees/s^2)
+JOINT_SPEED_LIMIT = 180
+JOINT_ACCEL_LIMIT = 900
+
+# Telemetry: lowest level that gets recorded (DEBUG, INFO, WARN, ERROR or OFF)
+TELEMETRY_LEVEL = INFO
+
+# Telemetry events, recorded as binary records and printed in batches
+telemetry = Telemetry(capacity=64, level=TELEMETRY_LEVEL, flush_every_ms=1000)
+EVT_ARM = telemetry.event("arm", "Arm angles: q1 = {0:.2f} degrees, q2 = {1:.2f} degrees", DEBUG)
+EVT_EFFECTOR = telemetry.event("effector", "End effector position: ({0:.2f}, {1:.2f})", DEBUG)
+EVT_OUT_OF_REACH = telemetry.event("reach", "Target is out of reach.", WARN, min_interval_ms=1000)
+EVT_POINT1 = telemetry.event("point1", "Point 1 set at: ({0:.2f}, {1:.2f})", INFO)
+EVT_POINT2 = telemetry.event("point2", "Point 2 set at: ({0:.2f}, {1:.2f})", INFO)
+EVT_PEN = telemetry.event("pen", "Pen up: {0:.0f}", INFO)
+EVT_STATUS = telemetry.event("status", "Pen up: {0:.0f}, point 1 set: {1:.0f}, point 2 set: {2:.0f}",
+                             DEBUG, min_interval_ms=1000)
+
 # Initialize buttons
 button_point1 = Pin(13, Pin.IN, Pin.PULL_DOWN)  # Set point 1 (GP13)
 button_point2 = Pin(11, Pin.IN, Pin.PULL_DOWN)  # Set point 2 (GP11)
@@ -18,78 +61,93 @@ led_updown.off()
 led_pos1.off()
 led_pos2.off()
 
-# Servo PWM setup
-wrist_servo = PWM(Pin(2))  # GP2 for wrist servo
-elbow_servo = PWM(Pin(1))  # GP1 for elbow servo
-shoulder_servo = PWM(Pin(0))  # GP0 for shoulder servo
+# Servo PWM setup: shoulder on GP0, elbow on GP1, wrist on GP2, all at 50 Hz.
+# The bank skips writes of a duty a servo already has.
+servos = ServoBank.from_pins(0, 1, 2, freq=50)
 
-wrist_servo.freq(50)
-elbow_servo.freq(50)
-shoulder_servo.freq(50)
+# Persistent settings: boundary points and calibration survive a power cycle
+config_store = ConfigStore()
+config = config_store.load()
+if config.calibration is not None:  # Saved by page_calibration.calibrate_page()
+    servos.correction = CalibrationModel(*config.calibration).table()
 
 # Setup ADCs for the "sliders" (Potentiometers connected to ADC pins)
 knob1 = ADC(Pin(27))  # X-axis knob (GP27)
 knob2 = ADC(Pin(26))  # Y-axis knob (GP26)
+knob1_input = KnobInput(knob1, KNOB_OVERSAMPLE, EMA, KNOB_EMA_SHIFT, deadband=KNOB_DEADBAND)
+knob2_input = KnobInput(knob2, KNOB_OVERSAMPLE, EMA, KNOB_EMA_SHIFT, deadband=KNOB_DEADBAND)
+
+# Variables to store the boundary points, restored from the config store
+point1_x, point1_y = config.point1 if config.point1 is not None else (None, None)
+point2_x, point2_y = config.point2 if config.point2 is not None else (None, None)
+knob1_range, knob2_range = None, None  # Same boundary, in raw knob readings
+bounds_changed = False  # Set when the boundary moves, so the target is re-clamped
+
+# Precompute knob reading -> servo duty so the main loop does no trig
+knob_table = KnobDutyTable.load_or_build(KNOB_TABLE_FILE, KNOB_TABLE_BITS)
 
-# Variables to store the boundary points
-point1_x, point1_y = None, None
-point2_x, point2_y = None, None
+# Servo duties the arm is heading for; the motion limiter ramps towards them each tick
+servo_target = None
+motion = MotionLimiter((degrees_to_duty(JOINT_SPEED_LIMIT),) * 2, (degrees_to_duty(JOINT_ACCEL_LIMIT),) * 2,
+                       CONTROL_RATE_HZ)
+
+# Queues between the control tasks: knob readings that moved, and new servo targets
+knob_queue = BoundedQueue(4)
+target_queue = BoundedQueue(2)
 
 # Initialize arm color (used for pen up/down)
 led_state = False
 prev_led_state = False
 
-# Inverse Kinematics Function
-def inverse_kinematics(x, y):
-    """
-    Compute shoulder (q1) and elbow (q2) angles for given (x, y) position.
-    Returns angles in radians.
-    """
-    r_squared = x**2 + y**2
-    if r_squared > (L1 + L2)**2:
-        raise ValueError("Target is out of reach")
-
-    q2 = -math.acos((r_squared - L1**2 - L2**2) / (2 * L1 * L2))  # Elbow angle
-    q1 = math.atan2(y, x) - math.atan2(L2 * math.sin(q2), L1 + L2 * math.cos(q2))  # Shoulder angle
-
-    return q1, q2
-
-# Forward Kinematics Function
-def forward_kinematics(q1, q2):
-    """
-    Compute end-effector position (x, y) based on joint angles q1 and q2.
-    Returns x, y coordinates of the end effector.
-    """
-    x1, y1 = L1 * math.cos(q1), L1 * math.sin(q1)
-    x2, y2 = x1 + L2 * math.cos(q1 + q2), y1 + L2 * math.sin(q1 + q2)
-    return x1, y1, x2, y2
+# Arm maths, with every geometry constant computed once (L1 == L2 takes the symmetric path)
+arm = Kinematics(L1, L2)
 
 # Update the arm's position based on x and y
 def update_arm_position(x, y):
     try:
-        q1, q2 = inverse_kinematics(x, y)
-        print_arm(q1, q2)
+        q1, q2 = arm.inverse(x, y)
+        if telemetry.enabled(DEBUG):
+            print_arm(q1, q2)
         control_servos(q1, q2)
     except ValueError:
-        print("Target is out of reach.")
+        telemetry.record(EVT_OUT_OF_REACH)
+
+# Update the arm's position straight from raw knob readings
+def update_arm_from_knobs(knobs):
+    """Look up the servo duties for (knob1, knob2) readings and make them the new target."""
+    pwm_q1, pwm_q2, reachable = knob_table.lookup(*knobs)
+    if not reachable:
+        telemetry.record(EVT_OUT_OF_REACH)
+        return
+    target_queue.put((pwm_q1, pwm_q2))
+
+# Move the servos one control tick closer to the target
+def drive_servos():
+    """Send the next velocity- and acceleration-limited setpoint to the servos."""
+    global servo_target
+    target = target_queue.latest()
+    if target is not None:
+        servo_target = target
+    if servo_target is None or motion.settled(servo_target):
+        return  # Nothing to do while the arm is resting on its target
+    pwm_q1, pwm_q2 = motion.step(servo_target)
+    servos.write(pwm_q1, pwm_q2)  # Wrist follows shoulder for simplicity
 
 def print_arm(q1, q2):
-    """Print the arm's joint angles and end effector position."""
-    x1, y1, x2, y2 = forward_kinematics(q1, q2)
-    print(f"Arm angles: q1 = {math.degrees(q1):.2f} degrees, q2 = {math.degrees(q2):.2f} degrees")
-    print(f"End effector position: ({x2:.2f}, {y2:.2f})")
-    print("------------")
+    """Record the arm's joint angles and end effector position."""
+    x1, y1, x2, y2 = arm.forward(q1, q2)
+    telemetry.record(EVT_ARM, math.degrees(q1), math.degrees(q2))
+    telemetry.record(EVT_EFFECTOR, x2, y2)
 
 # Control the servos to move the arm
 def control_servos(q1, q2):
-    """Convert joint angles to PWM signals for the servos."""
+    """Convert joint angles to PWM signals and make them the servos' target."""
     # Convert joint angles to PWM pulse widths
     pwm_q1 = translate(math.degrees(q1))
     pwm_q2 = translate(math.degrees(q2))
-    
-    shoulder_servo.duty_u16(pwm_q1)
-    elbow_servo.duty_u16(pwm_q2)
-    wrist_servo.duty_u16(pwm_q1)  # Assuming wrist follows shoulder for simplicity
+
+    # drive_servos() ramps towards the target instead of jumping straight there
+    target_queue.put((pwm_q1, pwm_q2))
 
 # Translate Function: Convert angle to PWM signal
 def translate(angle: float) -> int:
@@ -104,67 +162,95 @@ def translate(angle: float) -> int:
 def set_point1(pin):
     global point1_x, point1_y
     # Get the current position from the knobs (simulated slider values)
-    x = -1*(-310 + 2*(knob1.read_u16() * (L1 + L2)/ 65535))  # Scaling ADC to arm's reach
-    y = -1*(knob2.read_u16() * (L1 + L2) / 65535) + 310
+    x = -1*(-310 + 2*(knob1_input.value * (L1 + L2)/ 65535))  # Scaling ADC to arm's reach
+    y = -1*(knob2_input.value * (L1 + L2) / 65535) + 310
     point1_x, point1_y = x, y
-    print(f"Point 1 set at: ({point1_x}, {point1_y})")
+    telemetry.record(EVT_POINT1, point1_x, point1_y)
     led_pos1.on()
+    update_knob_bounds()
+    save_boundary()
 
 def set_point2(pin):
     global point2_x, point2_y
     # Get the current position from the knobs (simulated slider values)
-    x = -1*(-310 + 2*(knob1.read_u16() * (L1 + L2)/ 65535))  # Scaling ADC to arm's reach
-    y = -1*(knob2.read_u16() * (L1 + L2) / 65535) + 310
+    x = -1*(-310 + 2*(knob1_input.value * (L1 + L2)/ 65535))  # Scaling ADC to arm's reach
+    y = -1*(knob2_input.value * (L1 + L2) / 65535) + 310
     point2_x, point2_y = x, y
-    print(f"Point 2 set at: ({point2_x}, {point2_y})")
+    telemetry.record(EVT_POINT2, point2_x, point2_y)
     led_pos2.on()
+    update_knob_bounds()
+    save_boundary()
 
     # Update arm position to the new coordinates
     update_arm_position(x, y)
 
+def update_knob_bounds():
+    """Convert the boundary box into knob reading ranges for the main loop."""
+    global knob1_range, knob2_range, bounds_changed
+    if point1_x is None or point2_x is None:
+        return
+    knob1_a, knob2_a = xy_to_knob(point1_x, point1_y)
+    knob1_b, knob2_b = xy_to_knob(point2_x, point2_y)
+    knob1_range = (min(knob1_a, knob1_b), max(knob1_a, knob1_b))
+    knob2_range = (min(knob2_a, knob2_b), max(knob2_a, knob2_b))
+    bounds_changed = True
+
+def save_boundary():
+    """Keep the boundary points in the config store (flash is only written if they changed)."""
+    config.point1 = (point1_x, point1_y) if point1_x is not None else None
+    config.point2 = (point2_x, point2_y) if point2_x is not None else None
+    config_store.save(config)
+
 def toggle_led(pin):
+    """Pen up/down button, once the boundary is set."""
     global led_state
+    if knob1_range is None:
+        return
     led_state = not led_state
-    led_updown.value(led_state)
-
-
-
-# Main loop
-while True:
-    # Read knob values (simulating sliders)
-    knob1_value = -1*(-310 + 2*(knob1.read_u16() * (L1 + L2)/ 65535))  # Map ADC to -L1-L2 to L1+L2 range
-    knob2_value = -1*(knob2.read_u16() * (L1 + L2) / 65535) + 310
-    
-    
-    # Check if within the boundary (if boundary points are set)
-    if point1_x is not None and point2_x is not None:
-        # Boundary check (clamp values within the boundary box)
-        knob1_value = min(max(knob1_value, min(point1_x, point2_x)), max(point1_x, point2_x))
-        knob2_value = min(max(knob2_value, min(point1_y, point2_y)), max(point1_y, point2_y))
-        if button_updown.value() == 1:
-            led_state = not led_state
-            print(led_state)
-
-    # Update the arm's position based on the current knob values
-    update_arm_position(knob1_value, knob2_value)
-
-    # Simulate pen color and boundary display using LEDs
-    if led_state == False:
-        led_updown.value(0)  # Pen down
-    else:
-        led_updown.value(1)  # Pen up
-
-    # Button checks for setting points
-    if button_point1.value():
-        set_point1(button_point1)
-        time.sleep(0.5)  # Debouncing
-
-    if button_point2.value():
-        set_point2(button_point2)
-        time.sleep(0.5)  # Debouncing
-
-    print(led_state)
-    print(f"{point1_x},{point1_y}")
-    print(f"{point2_x},{point2_y}")  
-    # Small delay to prevent excessive loop cycling
-    time.sleep(0.1)
+    led_updown.value(led_state)  # LED on: pen up
+    telemetry.record(EVT_PEN, led_state)
+
+# Control tasks: knobs -> kinematics -> servos, plus the buttons and telemetry.
+# Each runs on its own, so a button waiting out its debounce no longer stalls the servos.
+def sample_knobs():
+    """Read the filtered knobs and pass the readings on when a knob has moved."""
+    global bounds_changed
+    knobs_moved = knob1_input.poll() | knob2_input.poll()
+    if not (knobs_moved or bounds_changed):
+        return
+    bounds_changed = False
+    knob1_value = knob1_input.value
+    knob2_value = knob2_input.value
+    # Clamp the readings within the boundary box, if boundary points are set
+    if knob1_range is not None:
+        knob1_value = min(max(knob1_value, knob1_range[0]), knob1_range[1])
+        knob2_value = min(max(knob2_value, knob2_range[0]), knob2_range[1])
+    knob_queue.put((knob1_value, knob2_value))
+
+def record_status():
+    telemetry.record(EVT_STATUS, led_state, point1_x is not None, point2_x is not None)
+    telemetry.maybe_flush()
+
+# Boundary points restored from the config store
+if point1_x is not None:
+    led_pos1.on()
+if point2_x is not None:
+    led_pos2.on()
+update_knob_bounds()
+led_updown.value(led_state)
+
+# Servo output runs half a period after sampling, so a new reading reaches the servos in the same period
+runtime = ControlRuntime()
+runtime.periodic("sample", CONTROL_RATE_HZ, sample_knobs)
+runtime.consumer("kinematics", knob_queue, update_arm_from_knobs)
+runtime.periodic("servo", CONTROL_RATE_HZ, drive_servos, phase_us=500000 // CONTROL_RATE_HZ)
+runtime.button("point1", button_point1, set_point1, BUTTON_DEBOUNCE_MS)
+runtime.button("point2", button_point2, set_point2, BUTTON_DEBOUNCE_MS)
+runtime.button("pen", button_updown, toggle_led, BUTTON_DEBOUNCE_MS)
+runtime.periodic("telemetry", TELEMETRY_RATE_HZ, record_status)
+try:
+    runtime.run()
+finally:
+    telemetry.flush()
+    print(runtime.report())
+    print(servos.report())
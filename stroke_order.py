@@ -0,0 +1,208 @@
+import math
+from array import array
+
+# Stroke ordering: cut pen-up travel between strokes.
+# Strokes are polylines stored as flat array('f') x, y pairs (as produced by
+# svg_import). A greedy nearest-neighbour pass picks, from wherever the pen
+# is, the closest stroke end not drawn yet, drawing the stroke backwards if its
+# far end is nearer. A uniform grid over the stroke end points keeps each
+# search local. A windowed 2-opt pass then reverses runs of strokes whenever
+# that shortens the travel. Both passes are close to linear in the stroke count.
+#
+# Pen-up moves are straight lines, but the area the arm can really reach is
+# not convex: the servo PWM limits clamp the joint angles, which cuts holes
+# and notches into the disc (see workspace_map.py). Strokes that are not
+# entirely reachable can be filtered out first with the `reachable`
+# predicate, but reordered travel between two reachable strokes may still
+# cross a clamped region. crossing_travel() finds those moves, sampling each
+# one against the same predicate (WorkspaceMap.reachable, say).
+
+def pen_up_distance(strokes, start=(0.0, 0.0)):
+    """Total length of the pen-up moves needed to draw strokes in order, starting from start."""
+    x, y = start
+    total = 0.0
+    for stroke in strokes:
+        total += math.hypot(stroke[0] - x, stroke[1] - y)
+        x, y = stroke[-2], stroke[-1]
+    return total
+
+def reverse_stroke(stroke):
+    """Return the stroke with its points in the opposite order."""
+    reversed_stroke = array(stroke.typecode, stroke)
+    reversed_stroke[0::2] = stroke[-2::-2]
+    reversed_stroke[1::2] = stroke[-1::-2]
+    return reversed_stroke
+
+class _EndGrid:
+    """Uniform grid of stroke end points supporting nearest-unused-end queries."""
+
+    def __init__(self, xs, ys, cell):
+        self.xs, self.ys = xs, ys
+        self.min_x, self.min_y = min(xs), min(ys)
+        self.cell = cell
+        self.columns = int((max(xs) - self.min_x) / cell) + 1
+        self.rows = int((max(ys) - self.min_y) / cell) + 1
+        self.cells = {}
+        for end in range(len(xs)):
+            self.cells.setdefault(self._key(xs[end], ys[end]), []).append(end)
+
+    def _key(self, x, y):
+        column = min(self.columns - 1, max(0, int((x - self.min_x) / self.cell)))
+        row = min(self.rows - 1, max(0, int((y - self.min_y) / self.cell)))
+        return column, row
+
+    def nearest(self, x, y, used):
+        """Return the closest end whose stroke is not used, or None when all are."""
+        xs, ys, cells = self.xs, self.ys, self.cells
+        column, row = self._key(x, y)
+        best, best_squared = None, math.inf
+        for ring in range(max(self.columns, self.rows) + 1):
+            # Walk only the cells on this ring that lie inside the grid
+            for r in range(max(0, row - ring), min(self.rows, row + ring + 1)):
+                if r == row - ring or r == row + ring:
+                    columns = range(max(0, column - ring), min(self.columns, column + ring + 1))
+                else:
+                    columns = [c for c in (column - ring, column + ring) if 0 <= c < self.columns]
+                for c in columns:
+                    ends = cells.get((c, r))
+                    if not ends:
+                        continue
+                    alive = [end for end in ends if not used[end >> 1]]
+                    if len(alive) != len(ends):
+                        if alive:
+                            cells[(c, r)] = alive
+                        else:
+                            del cells[(c, r)]
+                    for end in alive:
+                        dx, dy = xs[end] - x, ys[end] - y
+                        squared = dx * dx + dy * dy
+                        if squared < best_squared:
+                            best, best_squared = end, squared
+            # Ends outside this ring are at least ring * cell away
+            if best is not None and best_squared <= (ring * self.cell) ** 2:
+                return best
+            if not cells:
+                return best
+        return best
+
+def nearest_neighbour_order(strokes, start=(0.0, 0.0)):
+    """Greedy order: returns a list of (stroke_index, reversed) pairs."""
+    count = len(strokes)
+    if count == 0:
+        return []
+    # End 2*i is the start of stroke i and end 2*i+1 its finish
+    xs, ys = array('d'), array('d')
+    for stroke in strokes:
+        xs.append(stroke[0])
+        ys.append(stroke[1])
+        xs.append(stroke[-2])
+        ys.append(stroke[-1])
+    width = max(xs) - min(xs)
+    height = max(ys) - min(ys)
+    # About one end per cell, also when the ends lie along a line
+    cell = max(math.sqrt(width * height / count), max(width, height) / count, 1e-6)
+    grid = _EndGrid(xs, ys, cell)
+
+    used = bytearray(count)
+    order = []
+    x, y = start
+    for _ in range(count):
+        end = grid.nearest(x, y, used)
+        index, reversed_ = end >> 1, bool(end & 1)
+        used[index] = 1
+        order.append((index, reversed_))
+        exit_end = end ^ 1  # Leave from the other end of the stroke
+        x, y = xs[exit_end], ys[exit_end]
+    return order
+
+def two_opt(strokes, order, start=(0.0, 0.0), window=32, passes=3):
+    """
+    Improve an order in place by reversing runs of up to `window` strokes
+    (flipping each stroke's direction too) whenever that shortens pen-up
+    travel. Only the two moves at the ends of a run change, so each
+    candidate costs O(1).
+    """
+    # Entry and exit point of the stroke at each position of the order
+    entry_x, entry_y, exit_x, exit_y = [], [], [], []
+    for index, reversed_ in order:
+        stroke = strokes[index]
+        first, last = (stroke[0], stroke[1]), (stroke[-2], stroke[-1])
+        if reversed_:
+            first, last = last, first
+        entry_x.append(first[0])
+        entry_y.append(first[1])
+        exit_x.append(last[0])
+        exit_y.append(last[1])
+
+    hypot = math.hypot
+    count = len(order)
+    for _ in range(passes):
+        improved = False
+        for i in range(count):
+            px, py = (exit_x[i - 1], exit_y[i - 1]) if i else start
+            ix, iy = entry_x[i], entry_y[i]
+            before_i = hypot(ix - px, iy - py)
+            for j in range(i + 1, min(count, i + window)):
+                jx, jy = exit_x[j], exit_y[j]
+                if j + 1 < count:
+                    nx, ny = entry_x[j + 1], entry_y[j + 1]
+                    before = before_i + hypot(nx - jx, ny - jy)
+                    after = hypot(jx - px, jy - py) + hypot(nx - ix, ny - iy)
+                else:
+                    before = before_i
+                    after = hypot(jx - px, jy - py)
+                if after < before - 1e-9:
+                    order[i:j + 1] = [(index, not reversed_) for index, reversed_ in reversed(order[i:j + 1])]
+                    # The run's entries become its old exits in reverse, and the other way round
+                    stop = i - 1 if i else None
+                    entry_x[i:j + 1], exit_x[i:j + 1] = exit_x[j:stop:-1], entry_x[j:stop:-1]
+                    entry_y[i:j + 1], exit_y[i:j + 1] = exit_y[j:stop:-1], entry_y[j:stop:-1]
+                    ix, iy = entry_x[i], entry_y[i]
+                    before_i = hypot(ix - px, iy - py)
+                    improved = True
+        if not improved:
+            break
+    return order
+
+def optimize(strokes, start=(0.0, 0.0), reachable=None, window=32, passes=3):
+    """
+    Reorder (and where useful reverse) strokes to cut pen-up travel.
+    reachable(x, y), if given, drops strokes with any unreachable point.
+    Returns (ordered_strokes, dropped_count, distance_before, distance_after).
+    """
+    kept = strokes
+    if reachable is not None:
+        kept = [stroke for stroke in strokes
+                if all(reachable(stroke[i], stroke[i + 1]) for i in range(0, len(stroke), 2))]
+    before = pen_up_distance(kept, start)
+    order = two_opt(kept, nearest_neighbour_order(kept, start), start, window, passes)
+    ordered = [reverse_stroke(kept[index]) if reversed_ else kept[index] for index, reversed_ in order]
+    return ordered, len(strokes) - len(kept), before, pen_up_distance(ordered, start)
+
+def crossing_travel(strokes, reachable, start=(0.0, 0.0), step=1.0):
+    """
+    Indices of the strokes whose straight pen-up move in (from the previous
+    stroke's end, or start) passes an unreachable point, sampled every `step` mm.
+    """
+    crossings = []
+    x, y = start
+    for index, stroke in enumerate(strokes):
+        dx, dy = stroke[0] - x, stroke[1] - y
+        samples = int(math.hypot(dx, dy) // step)
+        for i in range(1, samples + 1):
+            t = i / (samples + 1)
+            if not reachable(x + t * dx, y + t * dy):
+                crossings.append(index)
+                break
+        x, y = stroke[-2], stroke[-1]
+    return crossings
+
+def report(before, after, dropped=0, crossings=0):
+    """One-line summary of an optimize() run (crossings: the count from crossing_travel())."""
+    saved = 100 * (1 - after / before) if before else 0
+    text = f"Pen-up travel: {before:.0f} mm -> {after:.0f} mm ({saved:.0f}% less)"
+    if dropped:
+        text += f", {dropped} unreachable strokes dropped"
+    if crossings:
+        text += f", {crossings} pen-up moves cross unreachable areas"
+    return text
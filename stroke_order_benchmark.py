@@ -0,0 +1,38 @@
+import math
+import random
+import sys
+import time
+from array import array
+
+from stroke_order import nearest_neighbour_order, two_opt, pen_up_distance, reverse_stroke, report
+
+# Benchmark: stroke ordering runtime as the stroke count grows.
+# Usage: python stroke_order_benchmark.py [largest_stroke_count]
+
+def make_strokes(count, seed=1):
+    """Short random strokes scattered over an A4-sized area in front of the arm."""
+    rng = random.Random(seed)
+    strokes = []
+    for _ in range(count):
+        x, y = rng.uniform(-105, 105), rng.uniform(60, 270)
+        angle, length = rng.uniform(0, 2 * math.pi), rng.uniform(1, 8)
+        strokes.append(array('f', [x, y, x + length * math.cos(angle) / 2, y + length * math.sin(angle) / 2,
+                                   x + length * math.cos(angle), y + length * math.sin(angle)]))
+    return strokes
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    for count in (largest // 8, largest // 4, largest // 2, largest):
+        strokes = make_strokes(count)
+        start = time.perf_counter()
+        order = nearest_neighbour_order(strokes)
+        greedy_time = time.perf_counter() - start
+        two_opt(strokes, order)
+        total_time = time.perf_counter() - start
+        before = pen_up_distance(strokes)
+        after = pen_up_distance([reverse_stroke(strokes[i]) if r else strokes[i] for i, r in order])
+        print(f"{count:>7,} strokes: nearest neighbour {greedy_time:6.2f} s, + 2-opt {total_time:6.2f} s "
+              f"({total_time / count * 1e6:5.1f} us/stroke)  {report(before, after)}")
+
+if __name__ == "__main__":
+    main()
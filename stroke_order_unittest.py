@@ -0,0 +1,73 @@
+import math
+import random
+import unittest
+from array import array
+
+from kinematics import L1, L2
+from stroke_order import (pen_up_distance, reverse_stroke, nearest_neighbour_order, two_opt, optimize, crossing_travel,
+                          report)
+
+def stroke(*points):
+    return array('f', [value for point in points for value in point])
+
+class TestStrokeOrder(unittest.TestCase):
+    def test_pen_up_distance(self):
+        """Test pen-up travel is measured from the start between stroke ends"""
+        strokes = [stroke((3, 4), (10, 4)), stroke((10, 8), (0, 0))]
+        self.assertAlmostEqual(pen_up_distance(strokes), 5 + 4)
+
+    def test_reverse_stroke(self):
+        """Test that reversing keeps x, y pairs together"""
+        self.assertEqual(list(reverse_stroke(stroke((1, 2), (3, 4), (5, 6)))), [5, 6, 3, 4, 1, 2])
+
+    def test_nearest_neighbour_reverses(self):
+        """Test that a stroke is drawn backwards when its far end is closer"""
+        strokes = [stroke((50, 0), (60, 0)), stroke((20, 0), (1, 0))]
+        self.assertEqual(nearest_neighbour_order(strokes), [(1, True), (0, False)])
+
+    def test_every_stroke_once(self):
+        """Test that the order is a permutation of all strokes"""
+        rng = random.Random(3)
+        strokes = [stroke((rng.uniform(0, 200), rng.uniform(0, 200)), (rng.uniform(0, 200), rng.uniform(0, 200)))
+                   for _ in range(500)]
+        order = two_opt(strokes, nearest_neighbour_order(strokes))
+        self.assertEqual(sorted(index for index, _ in order), list(range(500)))
+
+    def test_two_opt_improves(self):
+        """Test that 2-opt untangles a crossing order"""
+        strokes = [stroke((0, 0), (1, 0)), stroke((10, 10), (11, 10)), stroke((2, 0), (3, 0)), stroke((12, 10), (13, 10))]
+        order = [(0, False), (1, False), (2, False), (3, False)]
+        before = pen_up_distance(strokes)
+        improved = two_opt(strokes, list(order))
+        after = pen_up_distance([reverse_stroke(strokes[i]) if r else strokes[i] for i, r in improved])
+        self.assertLess(after, before)
+
+    def test_optimize(self):
+        """Test that optimizing cuts travel and drops unreachable strokes"""
+        rng = random.Random(5)
+        strokes = []
+        for _ in range(2000):
+            x, y = rng.uniform(-100, 100), rng.uniform(50, 250)
+            strokes.append(stroke((x, y), (x + rng.uniform(-5, 5), y + rng.uniform(-5, 5))))
+        strokes.append(stroke((0, 300), (0, 320)))
+        ordered, dropped, before, after = optimize(strokes, reachable=lambda x, y: math.hypot(x, y) <= L1 + L2)
+        self.assertEqual(dropped, 1)
+        self.assertEqual(len(ordered), 2000)
+        self.assertLess(after, before / 20)
+        self.assertAlmostEqual(after, pen_up_distance(ordered), places=3)
+
+    def test_crossing_travel(self):
+        """Test that pen-up moves through an unreachable hole between reachable strokes are found"""
+        def reachable(x, y):
+            return math.hypot(x, y - 100) > 20  # Not convex: a hole around (0, 100)
+        strokes = [stroke((-50, 100), (-40, 100)), stroke((40, 100), (50, 100)), stroke((50, 200), (40, 200))]
+        self.assertEqual(crossing_travel(strokes, reachable, start=(-60, 100)), [1])
+        self.assertEqual(crossing_travel(strokes[:1] + strokes[2:], reachable, start=(-60, 100)), [])
+        self.assertIn("1 pen-up moves cross", report(100, 50, crossings=1))
+
+    def test_empty(self):
+        """Test that no strokes gives an empty order"""
+        self.assertEqual(optimize([])[0], [])
+
+if __name__ == '__main__':
+    unittest.main()
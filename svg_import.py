@@ -0,0 +1,429 @@
+import hashlib
+import math
+import os
+import struct
+from array import array
+
+from kinematics import PEN_RESOLUTION
+
+# SVG artwork import.
+# Reads every <path> in an SVG file, flattens lines, Bézier curves and arcs
+# into polylines and converts them to millimetres. The transform attributes
+# of each path and the groups around it are applied, and the viewBox origin
+# becomes (0, 0). Curves are subdivided
+# adaptively, only as far as needed to stay within a tolerance of the true
+# curve, and each polyline is kept as a flat array('f') of x, y pairs.
+# Flattened files are cached by content hash and tolerance, so re-plotting
+# the same artwork skips the geometry work. Coordinates keep the SVG
+# orientation (y grows downwards); placing them on the page is up to the caller.
+
+# Flattening any finer than the pen can resolve cannot show on paper
+DEFAULT_TOLERANCE = PEN_RESOLUTION
+
+CACHE_DIR = ".svg_cache"
+CACHE_MAGIC = b"SVGP"
+CACHE_VERSION = 2  # 2: transforms and the viewBox origin are applied
+
+UNITS_MM = {"mm": 1.0, "cm": 10.0, "in": 25.4, "pt": 25.4 / 72, "pc": 25.4 / 6, "px": 25.4 / 96, "": 25.4 / 96}
+
+# ============================ Path data ============================
+class _PathScanner:
+    """Reads numbers and arc flags out of SVG path data."""
+
+    def __init__(self, data):
+        self.data = data
+        self.index = 0
+
+    def _skip_separators(self):
+        data, index = self.data, self.index
+        while index < len(data) and data[index] in " \t\r\n,":
+            index += 1
+        self.index = index
+
+    def at_number(self):
+        self._skip_separators()
+        return self.index < len(self.data) and self.data[self.index] in "+-.0123456789"
+
+    def command(self):
+        self._skip_separators()
+        if self.index >= len(self.data):
+            return None
+        letter = self.data[self.index]
+        if not letter.isalpha():
+            raise ValueError(f"Expected a path command at {self.index}, got {letter!r}")
+        self.index += 1
+        return letter
+
+    def number(self):
+        self._skip_separators()
+        data, start = self.data, self.index
+        index = start
+        if index < len(data) and data[index] in "+-":
+            index += 1
+        seen_dot = False
+        while index < len(data) and (data[index].isdigit() or (data[index] == "." and not seen_dot)):
+            seen_dot = seen_dot or data[index] == "."
+            index += 1
+        if index < len(data) and data[index] in "eE":
+            index += 1
+            if index < len(data) and data[index] in "+-":
+                index += 1
+            while index < len(data) and data[index].isdigit():
+                index += 1
+        if index == start:
+            raise ValueError(f"Expected a number at {start}")
+        self.index = index
+        return float(data[start:index])
+
+    def flag(self):
+        self._skip_separators()
+        if self.index >= len(self.data) or self.data[self.index] not in "01":
+            raise ValueError(f"Expected an arc flag at {self.index}")
+        self.index += 1
+        return self.data[self.index - 1] == "1"
+
+def _flatten_cubic(out, x0, y0, x1, y1, x2, y2, x3, y3, tolerance):
+    """Append points approximating a cubic Bézier (excluding its start) to out."""
+    stack = [(x0, y0, x1, y1, x2, y2, x3, y3, 0)]
+    tolerance_squared = tolerance * tolerance
+    while stack:
+        x0, y0, x1, y1, x2, y2, x3, y3, depth = stack.pop()
+        # Flat enough when both control points lie within tolerance of the chord
+        dx, dy = x3 - x0, y3 - y0
+        chord_squared = dx * dx + dy * dy
+        if chord_squared > 0:
+            d1 = (x1 - x0) * dy - (y1 - y0) * dx
+            d2 = (x2 - x0) * dy - (y2 - y0) * dx
+            flat = max(d1 * d1, d2 * d2) <= tolerance_squared * chord_squared
+        else:
+            flat = max((x1 - x0) ** 2 + (y1 - y0) ** 2, (x2 - x0) ** 2 + (y2 - y0) ** 2) <= tolerance_squared
+        if flat or depth >= 16:
+            out.append(x3)
+            out.append(y3)
+            continue
+        # Split in half with de Casteljau; push the second half first so the first is emitted first
+        x01, y01 = (x0 + x1) / 2, (y0 + y1) / 2
+        x12, y12 = (x1 + x2) / 2, (y1 + y2) / 2
+        x23, y23 = (x2 + x3) / 2, (y2 + y3) / 2
+        xa, ya = (x01 + x12) / 2, (y01 + y12) / 2
+        xb, yb = (x12 + x23) / 2, (y12 + y23) / 2
+        xm, ym = (xa + xb) / 2, (ya + yb) / 2
+        stack.append((xm, ym, xb, yb, x23, y23, x3, y3, depth + 1))
+        stack.append((x0, y0, x01, y01, xa, ya, xm, ym, depth + 1))
+
+def _flatten_arc(out, x0, y0, rx, ry, rotation, large_arc, sweep, x, y, tolerance):
+    """Append points approximating an SVG elliptical arc (excluding its start) to out."""
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0 or (x0 == x and y0 == y):
+        out.append(x)
+        out.append(y)
+        return
+    # Endpoint to centre parameterisation (SVG 1.1 implementation notes, F.6.5)
+    phi = math.radians(rotation)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    hx, hy = (x0 - x) / 2, (y0 - y) / 2
+    x1p = cos_phi * hx + sin_phi * hy
+    y1p = -sin_phi * hx + cos_phi * hy
+    scale = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    numerator = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    denominator = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    factor = math.sqrt(max(0.0, numerator / denominator))
+    if large_arc == sweep:
+        factor = -factor
+    cxp, cyp = factor * rx * y1p / ry, -factor * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x0 + x) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y0 + y) / 2
+    theta = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    delta = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx) - theta
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+
+    # Largest angle step whose chord stays within tolerance of the larger radius
+    radius = max(rx, ry)
+    step = 2 * math.acos(max(-1.0, 1 - tolerance / radius)) if tolerance < radius else math.pi / 2
+    segments = max(1, int(math.ceil(abs(delta) / step)))
+    for i in range(1, segments):
+        angle = theta + delta * i / segments
+        ex, ey = rx * math.cos(angle), ry * math.sin(angle)
+        out.append(cos_phi * ex - sin_phi * ey + cx)
+        out.append(sin_phi * ex + cos_phi * ey + cy)
+    out.append(x)
+    out.append(y)
+
+def parse_path(data, tolerance=DEFAULT_TOLERANCE):
+    """
+    Flatten SVG path data into a list of polylines, each an array('f') of
+    interleaved x, y coordinates in the path's own units.
+    """
+    scanner = _PathScanner(data)
+    polylines = []
+    current = None
+    x = y = start_x = start_y = 0.0
+    last_control = None  # Reflected by S/T: (kind, x, y)
+    command = None
+
+    while True:
+        if command is None or not scanner.at_number():
+            letter = scanner.command()
+            if letter is None:
+                break
+            command = letter
+        elif command in "Mm":
+            command = "l" if command == "m" else "L"  # Extra pairs after a move are lines
+        absolute = command.isupper()
+        kind = command.upper()
+        ox, oy = (0.0, 0.0) if absolute else (x, y)
+
+        if kind == "Z":
+            if current is not None and (x, y) != (start_x, start_y):
+                current.append(start_x)
+                current.append(start_y)
+            x, y = start_x, start_y
+            current = None
+            last_control = None
+            command = None
+            continue
+        if kind == "M":
+            x, y = ox + scanner.number(), oy + scanner.number()
+            start_x, start_y = x, y
+            current = array('f', [x, y])
+            polylines.append(current)
+            last_control = None
+            continue
+        if current is None:
+            # Drawing straight after Z starts a new polyline at the subpath start
+            current = array('f', [x, y])
+            polylines.append(current)
+
+        if kind == "L":
+            x, y = ox + scanner.number(), oy + scanner.number()
+            current.append(x)
+            current.append(y)
+            last_control = None
+        elif kind == "H":
+            x = ox + scanner.number()
+            current.append(x)
+            current.append(y)
+            last_control = None
+        elif kind == "V":
+            y = oy + scanner.number()
+            current.append(x)
+            current.append(y)
+            last_control = None
+        elif kind in "CS":
+            if kind == "C":
+                x1, y1 = ox + scanner.number(), oy + scanner.number()
+            elif last_control is not None and last_control[0] == "C":
+                x1, y1 = 2 * x - last_control[1], 2 * y - last_control[2]
+            else:
+                x1, y1 = x, y
+            x2, y2 = ox + scanner.number(), oy + scanner.number()
+            x3, y3 = ox + scanner.number(), oy + scanner.number()
+            _flatten_cubic(current, x, y, x1, y1, x2, y2, x3, y3, tolerance)
+            last_control = ("C", x2, y2)
+            x, y = x3, y3
+        elif kind in "QT":
+            if kind == "Q":
+                qx, qy = ox + scanner.number(), oy + scanner.number()
+            elif last_control is not None and last_control[0] == "Q":
+                qx, qy = 2 * x - last_control[1], 2 * y - last_control[2]
+            else:
+                qx, qy = x, y
+            x3, y3 = ox + scanner.number(), oy + scanner.number()
+            # A quadratic is the cubic with control points 2/3 of the way to its control point
+            _flatten_cubic(current, x, y, x + 2 * (qx - x) / 3, y + 2 * (qy - y) / 3,
+                           x3 + 2 * (qx - x3) / 3, y3 + 2 * (qy - y3) / 3, x3, y3, tolerance)
+            last_control = ("Q", qx, qy)
+            x, y = x3, y3
+        elif kind == "A":
+            rx, ry, rotation = scanner.number(), scanner.number(), scanner.number()
+            large_arc, sweep = scanner.flag(), scanner.flag()
+            x3, y3 = ox + scanner.number(), oy + scanner.number()
+            _flatten_arc(current, x, y, rx, ry, rotation, large_arc, sweep, x3, y3, tolerance)
+            last_control = None
+            x, y = x3, y3
+        else:
+            raise ValueError(f"Unsupported path command {command!r}")
+
+    return [polyline for polyline in polylines if len(polyline) >= 4]
+
+# ============================ Documents ============================
+def _length_mm(value):
+    value = value.strip()
+    number = value.rstrip("abcdefghijklmnopqrstuvwxyz%")
+    unit = value[len(number):]
+    if unit not in UNITS_MM:
+        raise ValueError(f"Unsupported length unit {unit!r}")
+    return float(number) * UNITS_MM[unit]
+
+def _view_box(root):
+    view_box = root.get("viewBox")
+    return None if view_box is None else [float(v) for v in view_box.replace(",", " ").split()]
+
+def document_scale(root):
+    """Millimetres per SVG user unit, from the width/height and viewBox attributes."""
+    width = root.get("width")
+    view_box = _view_box(root)
+    if width is None or width.endswith("%"):
+        return UNITS_MM["px"]
+    if view_box is None:
+        return _length_mm(width) / float(width.rstrip("abcdefghijklmnopqrstuvwxyz"))
+    return _length_mm(width) / view_box[2]
+
+def document_origin(root):
+    """The user-space point at the top left of the document (the viewBox min-x, min-y)."""
+    view_box = _view_box(root)
+    return (0.0, 0.0) if view_box is None else (view_box[0], view_box[1])
+
+# ============================ Transforms ============================
+# Affine transforms are (a, b, c, d, e, f) as in SVG's matrix(): a point maps
+# to (a x + c y + e, b x + d y + f).
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+def multiply(m, n):
+    """The transform that applies n, then m."""
+    a, b, c, d, e, f = m
+    na, nb, nc, nd, ne, nf = n
+    return (a * na + c * nb, b * na + d * nb, a * nc + c * nd, b * nc + d * nd,
+            a * ne + c * nf + e, b * ne + d * nf + f)
+
+def parse_transform(text):
+    """A transform attribute (translate, scale, rotate, matrix, skewX, skewY) as one affine matrix."""
+    matrix = IDENTITY
+    rest = text.strip()
+    while rest:
+        name, bracket, rest = rest.partition("(")
+        arguments, closing, rest = rest.partition(")")
+        name = name.strip(" \t\r\n,")
+        if not bracket or not closing:
+            raise ValueError(f"Malformed transform {text!r}")
+        values = [float(v) for v in arguments.replace(",", " ").split()]
+        count = len(values)
+        if name == "matrix" and count == 6:
+            step = tuple(values)
+        elif name == "translate" and count in (1, 2):
+            step = (1.0, 0.0, 0.0, 1.0, values[0], values[1] if count == 2 else 0.0)
+        elif name == "scale" and count in (1, 2):
+            step = (values[0], 0.0, 0.0, values[-1], 0.0, 0.0)
+        elif name == "rotate" and count in (1, 3):
+            angle = math.radians(values[0])
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            step = (cos_a, sin_a, -sin_a, cos_a, 0.0, 0.0)
+            if count == 3:  # Rotate about (cx, cy)
+                cx, cy = values[1], values[2]
+                step = multiply(multiply((1.0, 0.0, 0.0, 1.0, cx, cy), step), (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == "skewX" and count == 1:
+            step = (1.0, 0.0, math.tan(math.radians(values[0])), 1.0, 0.0, 0.0)
+        elif name == "skewY" and count == 1:
+            step = (1.0, math.tan(math.radians(values[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            raise ValueError(f"Unsupported transform {name}() with {count} values")
+        matrix = multiply(matrix, step)
+        rest = rest.strip()
+    return matrix
+
+def _stretch(matrix):
+    """An upper bound on how much the matrix lengthens any vector."""
+    a, b, c, d = matrix[:4]
+    return math.sqrt(a * a + b * b + c * c + d * d)
+
+def _walk(element, matrix, found):
+    """Collect (path data, transform) for every path below element, transforms composed on the way down."""
+    transform = element.get("transform")
+    if transform:
+        matrix = multiply(matrix, parse_transform(transform))
+    if element.tag.rsplit("}", 1)[-1] == "path" and element.get("d"):
+        found.append((element.get("d"), matrix))
+    for child in element:
+        _walk(child, matrix, found)
+
+def flatten_svg(source, tolerance=DEFAULT_TOLERANCE):
+    """
+    Flatten every path in an SVG document (a path or file object) into
+    polylines in millimetres, within `tolerance` mm of the true curves.
+    """
+    import xml.etree.ElementTree as ElementTree  # Not on MicroPython; parse_path() works without it
+    root = ElementTree.parse(source).getroot()
+    scale = document_scale(root)
+    origin_x, origin_y = document_origin(root)
+    paths = []
+    _walk(root, IDENTITY, paths)
+    polylines = []
+    for data, matrix in paths:
+        # Millimetres straight from the path's own units: transform, shift the origin, scale
+        a, b, c, d, e, f = matrix
+        a, b, c, d, e, f = a * scale, b * scale, c * scale, d * scale, (e - origin_x) * scale, (f - origin_y) * scale
+        stretch = _stretch((a, b, c, d))
+        for polyline in parse_path(data, tolerance / stretch if stretch else tolerance):
+            if (a, b, c, d, e, f) != IDENTITY:
+                for i in range(0, len(polyline), 2):
+                    x, y = polyline[i], polyline[i + 1]
+                    polyline[i] = a * x + c * y + e
+                    polyline[i + 1] = b * x + d * y + f
+            polylines.append(polyline)
+    return polylines
+
+# ============================ Cache ============================
+def cache_path(data, tolerance, cache_dir=CACHE_DIR):
+    """Cache file for SVG file contents flattened at a tolerance."""
+    digest = hashlib.sha1(data).hexdigest()
+    return os.path.join(cache_dir, f"{digest}-{tolerance:.4f}.bin")
+
+def save_polylines(path, polylines):
+    """Write polylines as a header, a count per polyline, then their coordinates."""
+    with open(path + ".tmp", "wb") as f:
+        f.write(CACHE_MAGIC + struct.pack("<HI", CACHE_VERSION, len(polylines)))
+        f.write(array('I', [len(polyline) for polyline in polylines]))
+        for polyline in polylines:
+            f.write(polyline)
+    os.replace(path + ".tmp", path)
+
+def load_polylines(path):
+    """Read polylines written by save_polylines(). Raises ValueError on a bad file."""
+    with open(path, "rb") as f:
+        header = f.read(10)
+        if len(header) != 10 or header[:4] != CACHE_MAGIC:
+            raise ValueError("Not a polyline cache file")
+        version, count = struct.unpack("<HI", header[4:])
+        if version != CACHE_VERSION:
+            raise ValueError("Polyline cache file is from another version")
+        lengths = array('I')
+        lengths.frombytes(f.read(4 * count))
+        polylines = []
+        for length in lengths:
+            polyline = array('f')
+            polyline.frombytes(f.read(4 * length))
+            if len(polyline) != length:
+                raise ValueError("Polyline cache file is truncated")
+            polylines.append(polyline)
+    return polylines
+
+def load_svg(path, tolerance=DEFAULT_TOLERANCE, cache_dir=CACHE_DIR):
+    """Flatten an SVG file, reusing the cached result for the same contents and tolerance."""
+    with open(path, "rb") as f:
+        data = f.read()
+    cached = cache_path(data, tolerance, cache_dir)
+    try:
+        return load_polylines(cached)
+    except (OSError, ValueError):
+        pass
+    with open(path, "rb") as f:
+        polylines = flatten_svg(f, tolerance)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_polylines(cached, polylines)
+    except OSError:
+        pass  # Read-only location, just skip caching
+    return polylines
+
+# ============================ Pipeline source ============================
+def polyline_source(polylines):
+    """Yield (x, y, pen_down) for the motion pipeline: pen up to each polyline's start, then down along it."""
+    for polyline in polylines:
+        yield polyline[0], polyline[1], False
+        for i in range(0, len(polyline), 2):
+            yield polyline[i], polyline[i + 1], True
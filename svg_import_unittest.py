@@ -0,0 +1,132 @@
+import io
+import math
+import os
+import tempfile
+import unittest
+
+from svg_import import (parse_path, parse_transform, flatten_svg, load_svg, cache_path, polyline_source,
+                        DEFAULT_TOLERANCE)
+
+def points(polyline):
+    return [(polyline[i], polyline[i + 1]) for i in range(0, len(polyline), 2)]
+
+def svg(body, attributes='width="100mm" height="100mm" viewBox="0 0 100 100"'):
+    return f'<svg xmlns="http://www.w3.org/2000/svg" {attributes}>{body}</svg>'
+
+class TestSvgImport(unittest.TestCase):
+    def test_lines(self):
+        """Test absolute, relative, implicit and closing line commands"""
+        polylines = parse_path("M10,10 L20 10 h5 v5 l-5,5 z m1 1 2 0 2-1")
+        self.assertEqual(points(polylines[0]), [(10, 10), (20, 10), (25, 10), (25, 15), (20, 20), (10, 10)])
+        self.assertEqual(points(polylines[1]), [(11, 11), (13, 11), (15, 10)])
+
+    def test_packed_numbers(self):
+        """Test numbers that run together without separators"""
+        self.assertEqual(points(parse_path("M.5.5L-1-2e1")[0]), [(0.5, 0.5), (-1, -20)])
+
+    def test_cubic_within_tolerance(self):
+        """Test that a flattened cubic stays within tolerance of the curve"""
+        for tolerance in (1.0, 0.1, 0.01):
+            polyline = points(parse_path("M0 0 C0 100 100 100 100 0", tolerance)[0])
+            self.assertEqual(polyline[-1], (100, 0))
+            for t in (i / 200 for i in range(201)):
+                bx = 3 * (1 - t) * t * t * 100 + t ** 3 * 100
+                by = 3 * (1 - t) ** 2 * t * 100 + 3 * (1 - t) * t * t * 100
+                distance = min(_segment_distance(bx, by, a, b) for a, b in zip(polyline, polyline[1:]))
+                self.assertLessEqual(distance, tolerance * 1.01)
+
+    def test_adaptive(self):
+        """Test that a tighter tolerance uses more points, and a straight cubic only one segment"""
+        coarse = len(parse_path("M0 0 C0 100 100 100 100 0", 1.0)[0])
+        fine = len(parse_path("M0 0 C0 100 100 100 100 0", 0.01)[0])
+        self.assertLess(coarse, fine)
+        self.assertEqual(len(parse_path("M0 0 C10 0 20 0 30 0", 0.01)[0]), 4)
+
+    def test_smooth_and_quadratic(self):
+        """Test S and T reflect the previous control point"""
+        smooth = points(parse_path("M0 0 C0 10 10 10 10 0 S20 -10 20 0", 0.01)[0])
+        self.assertEqual(smooth[-1], (20, 0))
+        self.assertTrue(any(y < -5 for x, y in smooth))
+        quadratic = points(parse_path("M0 0 Q5 10 10 0 T20 0", 0.01)[0])
+        self.assertTrue(any(y > 4.9 for x, y in quadratic) and any(y < -4.9 for x, y in quadratic))
+
+    def test_arc(self):
+        """Test a half-circle arc lies on its circle and ends on its end point"""
+        polyline = points(parse_path("M0 0 A10 10 0 0 1 20 0", 0.05)[0])
+        self.assertAlmostEqual(polyline[-1][0], 20, places=4)
+        for x, y in polyline:
+            self.assertAlmostEqual(math.hypot(x - 10, y), 10, places=3)
+        self.assertTrue(all(y <= 1e-4 for x, y in polyline))  # Sweep flag 1 goes through negative y
+
+    def test_document_units(self):
+        """Test that user units are converted to millimetres with the viewBox"""
+        document = svg('<path d="M0 0 L100 50"/>', 'width="50mm" height="25mm" viewBox="0 0 100 50"')
+        polylines = flatten_svg(io.StringIO(document))
+        self.assertEqual(points(polylines[0]), [(0, 0), (50, 25)])
+
+    def test_grouped_transform(self):
+        """Test that group and path transforms are composed and the viewBox origin is subtracted"""
+        document = svg('<g transform="translate(40,0) scale(2)"><path d="M50 50 L60 50"/></g>',
+                       'width="100mm" height="100mm" viewBox="50 50 100 100"')
+        self.assertEqual(points(flatten_svg(io.StringIO(document))[0]), [(90, 50), (110, 50)])
+        nested = svg('<g transform="translate(10 20)"><g transform="rotate(90)">'
+                     '<path transform="scale(2, 1)" d="M0 0 L5 0"/></g></g>',
+                     'width="200mm" height="200mm" viewBox="0 0 100 100"')
+        (start, end), = [points(polyline) for polyline in flatten_svg(io.StringIO(nested))]
+        self.assertEqual(start, (20, 40))
+        self.assertAlmostEqual(end[0], 20, places=4)
+        self.assertAlmostEqual(end[1], 60, places=4)
+
+    def test_transform_forms(self):
+        """Test each transform function against its matrix"""
+        self.assertEqual(parse_transform("matrix(1,2,3,4,5,6)"), (1, 2, 3, 4, 5, 6))
+        self.assertEqual(parse_transform("translate(3)"), (1, 0, 0, 1, 3, 0))
+        self.assertEqual(parse_transform("scale(2)"), (2, 0, 0, 2, 0, 0))
+        a, b, c, d, e, f = parse_transform("rotate(90 10 0)")  # (0, 0) turns about (10, 0) to (10, -10)
+        self.assertAlmostEqual(e, 10)
+        self.assertAlmostEqual(f, -10)
+        self.assertAlmostEqual(parse_transform("skewX(45)")[2], 1)
+        self.assertAlmostEqual(parse_transform("skewY(45)")[1], 1)
+        self.assertEqual(parse_transform("translate(1 2) scale(3)"), (3, 0, 0, 3, 1, 2))
+        for bad in ("perspective(1)", "scale(1 2 3)", "translate(1"):
+            with self.assertRaises(ValueError):
+                parse_transform(bad)
+
+    def test_transformed_tolerance(self):
+        """Test that a scaled-up curve is flattened finely enough in millimetres"""
+        document = svg('<path transform="scale(10)" d="M0 0 C0 10 10 10 10 0"/>')
+        coarse = flatten_svg(io.StringIO(svg('<path d="M0 0 C0 100 100 100 100 0"/>')), 0.1)[0]
+        scaled = flatten_svg(io.StringIO(document), 0.1)[0]
+        self.assertGreaterEqual(len(scaled), len(coarse))
+
+    def test_cache(self):
+        """Test that load_svg caches per contents and tolerance"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "art.svg")
+            cache_dir = os.path.join(directory, "cache")
+            with open(path, "w") as f:
+                f.write(svg('<g><path d="M10 10 C10 60 60 60 60 10"/></g><path d="M0 0 H5"/>'))
+            first = load_svg(path, cache_dir=cache_dir)
+            with open(path, "rb") as f:
+                cached = cache_path(f.read(), DEFAULT_TOLERANCE, cache_dir)
+            self.assertTrue(os.path.exists(cached))
+            self.assertEqual(load_svg(path, cache_dir=cache_dir), first)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            load_svg(path, 1.0, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_polyline_source(self):
+        """Test that the pen travels up to each polyline and draws along it"""
+        items = list(polyline_source(parse_path("M0 0 L1 0 M5 5 L6 5")))
+        self.assertEqual(items, [(0, 0, False), (0, 0, True), (1, 0, True),
+                                 (5, 5, False), (5, 5, True), (6, 5, True)])
+
+def _segment_distance(px, py, a, b):
+    (ax, ay), (bx, by) = a, b
+    dx, dy = bx - ax, by - ay
+    length_squared = dx * dx + dy * dy
+    t = 0 if length_squared == 0 else max(0, min(1, ((px - ax) * dx + (py - ay) * dy) / length_squared))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+if __name__ == '__main__':
+    unittest.main()
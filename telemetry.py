@@ -0,0 +1,109 @@
+import struct
+import time
+
+# Ring-buffer telemetry for the control loop.
+# Events are registered once with a level, a format string and an optional
+# rate limit. Recording an event packs its timestamp and up to three numbers
+# into a preallocated bytearray; nothing is formatted or printed until the
+# buffer is flushed, and a disabled event returns after one comparison.
+
+DEBUG, INFO, WARN, ERROR, OFF = 10, 20, 30, 40, 100
+
+RECORD_FORMAT = "<IHHfff"  # ticks_ms, event id, spare, three values
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+if hasattr(time, "ticks_ms"):
+    ticks_ms, ticks_diff = time.ticks_ms, time.ticks_diff
+else:
+    def ticks_ms():
+        return int(time.perf_counter() * 1000) & 0x3FFFFFFF
+
+    def ticks_diff(ticks1, ticks2):
+        return ((ticks1 - ticks2 + 0x20000000) & 0x3FFFFFFF) - 0x20000000
+
+class Telemetry:
+    """
+    Levelled, rate-limited event log backed by a fixed-size ring buffer of
+    binary records. When the buffer fills up it is flushed as one batch, or,
+    with overwrite=True, the oldest records are overwritten and counted as dropped.
+    """
+
+    def __init__(self, capacity=64, level=INFO, flush_every_ms=1000, output=print, overwrite=False):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * RECORD_SIZE)
+        self.head = 0  # Slot the next record goes into
+        self.count = 0  # Records waiting to be flushed
+        self.dropped = 0
+        self.level = level
+        self.flush_every_ms = flush_every_ms
+        self.output = output
+        self.overwrite = overwrite
+        self.last_flush = ticks_ms()
+
+        # Per-event settings, indexed by event id
+        self.names = []
+        self.formats = []
+        self.levels = []
+        self.intervals = []
+        self.last_sent = []
+
+    def event(self, name, message, level=INFO, min_interval_ms=0):
+        """
+        Register an event and return its id. `message` is a str.format template
+        filled from the recorded values, e.g. "Point 1 set at: ({0:.1f}, {1:.1f})".
+        """
+        self.names.append(name)
+        self.formats.append(message)
+        self.levels.append(level)
+        self.intervals.append(min_interval_ms)
+        self.last_sent.append(None)
+        return len(self.names) - 1
+
+    def enabled(self, level):
+        """True when events of this level would be recorded."""
+        return level >= self.level
+
+    def record(self, event_id, a=0.0, b=0.0, c=0.0):
+        """Append one event to the ring buffer. Pass raw numbers, never pre-formatted text."""
+        if self.levels[event_id] < self.level:
+            return
+        now = ticks_ms()
+        interval = self.intervals[event_id]
+        if interval:
+            last = self.last_sent[event_id]
+            if last is not None and ticks_diff(now, last) < interval:
+                return
+            self.last_sent[event_id] = now
+
+        if self.count == self.capacity:
+            if self.overwrite:
+                self.dropped += 1
+                self.count -= 1
+            else:
+                self.flush()
+        struct.pack_into(RECORD_FORMAT, self.buffer, self.head * RECORD_SIZE, now, event_id, 0, a, b, c)
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+
+    def records(self):
+        """Decode the buffered records, oldest first, as (ticks_ms, event_id, a, b, c)."""
+        first = (self.head - self.count) % self.capacity
+        for i in range(self.count):
+            offset = ((first + i) % self.capacity) * RECORD_SIZE
+            ticks, event_id, _, a, b, c = struct.unpack_from(RECORD_FORMAT, self.buffer, offset)
+            yield ticks, event_id, a, b, c
+
+    def flush(self):
+        """Format and output every buffered record, then empty the buffer."""
+        if self.dropped:
+            self.output(f"telemetry: {self.dropped} records dropped")
+            self.dropped = 0
+        for ticks, event_id, a, b, c in self.records():
+            self.output(f"{ticks:>10} {self.formats[event_id].format(a, b, c)}")
+        self.count = 0
+        self.last_flush = ticks_ms()
+
+    def maybe_flush(self):
+        """Flush if flush_every_ms has passed since the last flush. Call once per tick."""
+        if self.count and ticks_diff(ticks_ms(), self.last_flush) >= self.flush_every_ms:
+            self.flush()
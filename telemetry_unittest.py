@@ -0,0 +1,71 @@
+import unittest
+
+import sim_machine
+from telemetry import Telemetry, DEBUG, INFO, WARN, OFF, RECORD_SIZE
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.clock = sim_machine.install(virtual_time=True)
+        self.lines = []
+        self.telemetry = Telemetry(capacity=4, level=INFO, flush_every_ms=1000, output=self.lines.append)
+        self.point = self.telemetry.event("point", "Point set at: ({0:.1f}, {1:.1f})", INFO)
+        self.debug = self.telemetry.event("debug", "q1 = {0:.2f}", DEBUG)
+        self.reach = self.telemetry.event("reach", "Target is out of reach.", WARN, min_interval_ms=500)
+
+    def tearDown(self):
+        sim_machine.uninstall()
+
+    def test_records_are_formatted_on_flush(self):
+        """Test that records stay binary until flushed"""
+        self.telemetry.record(self.point, 1.25, 2.5)
+        self.assertEqual(self.lines, [])
+        self.assertEqual(len(self.telemetry.buffer), 4 * RECORD_SIZE)
+        self.telemetry.flush()
+        self.assertEqual(len(self.lines), 1)
+        self.assertTrue(self.lines[0].endswith("Point set at: (1.2, 2.5)"))
+        self.assertEqual(self.telemetry.count, 0)
+
+    def test_levels(self):
+        """Test that events below the configured level are not recorded"""
+        self.telemetry.record(self.debug, 1.0)
+        self.assertEqual(self.telemetry.count, 0)
+        self.telemetry.level = OFF
+        self.telemetry.record(self.reach)
+        self.assertEqual(self.telemetry.count, 0)
+        self.assertFalse(self.telemetry.enabled(WARN))
+
+    def test_rate_limit(self):
+        """Test that a rate-limited event is recorded at most once per interval"""
+        for _ in range(10):
+            self.telemetry.record(self.reach)
+            self.clock.now += 0.1
+        self.assertEqual(self.telemetry.count, 2)
+
+    def test_batch_flush_when_full(self):
+        """Test that a full buffer is flushed as a batch, oldest record first"""
+        for i in range(5):
+            self.telemetry.record(self.point, i, 0)
+        self.assertEqual(len(self.lines), 4)
+        self.assertTrue(self.lines[0].endswith("(0.0, 0.0)"))
+        self.assertEqual(self.telemetry.count, 1)
+
+    def test_overwrite(self):
+        """Test that overwrite mode keeps the newest records and counts the dropped ones"""
+        self.telemetry.overwrite = True
+        for i in range(6):
+            self.telemetry.record(self.point, i, 0)
+        self.assertEqual([record[2] for record in self.telemetry.records()], [2, 3, 4, 5])
+        self.telemetry.flush()
+        self.assertEqual(self.lines[0], "telemetry: 2 records dropped")
+
+    def test_maybe_flush(self):
+        """Test that maybe_flush waits for the flush interval"""
+        self.telemetry.record(self.point, 1, 2)
+        self.telemetry.maybe_flush()
+        self.assertEqual(self.lines, [])
+        self.clock.now += 1.0
+        self.telemetry.maybe_flush()
+        self.assertEqual(len(self.lines), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import numpy as np
+
+from kinematics import L1, L2, PWM_MIN, PWM_MAX
+from batch_kinematics import inverse_kinematics_batch
+
+# Reachable workspace bitmap.
+# inverse_kinematics() only rejects points beyond L1 + L2, but translate()
+# clamps any angle outside roughly 18-161 degrees to PWM_MIN/PWM_MAX, so the
+# pen silently lands somewhere else. This map marks the grid cells where both
+# joint angles can really be expressed by the servos. A cell only counts as
+# reachable when all four of its corners are, so every point inside a marked
+# cell is reachable. Lookups are O(1); the largest axis-aligned rectangle
+# inside the reachable area is found with the histogram method.
+#
+# The map defaults to ELBOW_UP, the solution the servo range can express.
+# With the control code's elbow solution (ELBOW_DOWN, q2 = -acos(...)) the
+# elbow angle is never positive, so every point clamps and that map is empty.
+
+ELBOW_DOWN, ELBOW_UP = -1, 1
+
+def expressible(angle):
+    """True where translate() would not clamp an angle (degrees) (vectorized)."""
+    raw = np.trunc((500 + (2500 - 500) * np.asarray(angle, dtype=np.float64) / 180) / 20000 * 65535)
+    return (raw >= PWM_MIN) & (raw <= PWM_MAX)
+
+class WorkspaceMap:
+    """
+    Bitmap of reachable cells over the square -L1-L2..L1+L2 in both axes.
+    cells[row, column] covers x from x_min + column * resolution and y from
+    y_min + row * resolution, each `resolution` mm wide.
+    """
+
+    def __init__(self, resolution=1.0, elbow=ELBOW_UP, l1=L1, l2=L2):
+        self.resolution = resolution
+        self.elbow = elbow
+        self.l1, self.l2 = l1, l2
+        reach = l1 + l2
+        self.size = int(np.ceil(2 * reach / resolution))
+        self.x_min = self.y_min = -self.size * resolution / 2
+
+        # Solve every grid node, then keep the cells whose four corners are all reachable
+        nodes = self.x_min + np.arange(self.size + 1) * resolution
+        xs, ys = np.meshgrid(nodes, nodes)
+        q1, q2, reachable = inverse_kinematics_batch(xs, ys, l1, l2, elbow)
+        with np.errstate(invalid='ignore'):
+            ok = reachable & expressible(np.degrees(q1)) & expressible(np.degrees(q2))
+        self.cells = ok[:-1, :-1] & ok[1:, :-1] & ok[:-1, 1:] & ok[1:, 1:]
+
+    def reachable(self, x, y):
+        """O(1) check that the servos can put the pen at (x, y) without clamping."""
+        column = int((x - self.x_min) // self.resolution)
+        row = int((y - self.y_min) // self.resolution)
+        if 0 <= row < self.size and 0 <= column < self.size:
+            return bool(self.cells[row, column])
+        return False
+
+    def reachable_batch(self, x, y):
+        """Vectorized reachable() for arrays of points."""
+        columns = np.floor((np.asarray(x) - self.x_min) / self.resolution).astype(np.int64)
+        rows = np.floor((np.asarray(y) - self.y_min) / self.resolution).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.size) & (columns >= 0) & (columns < self.size)
+        result = np.zeros(np.shape(columns), dtype=bool)
+        result[inside] = self.cells[rows[inside], columns[inside]]
+        return result
+
+    def rectangle_reachable(self, x_min, y_min, x_max, y_max):
+        """True if every cell touched by the rectangle is reachable."""
+        column_0 = int((x_min - self.x_min) // self.resolution)
+        row_0 = int((y_min - self.y_min) // self.resolution)
+        column_1 = int(np.ceil((x_max - self.x_min) / self.resolution))
+        row_1 = int(np.ceil((y_max - self.y_min) / self.resolution))
+        if column_0 < 0 or row_0 < 0 or column_1 > self.size or row_1 > self.size:
+            return False
+        return bool(self.cells[row_0:row_1, column_0:column_1].all())
+
+    def largest_rectangle(self):
+        """
+        Largest axis-aligned rectangle of reachable cells, as
+        (x_min, y_min, x_max, y_max) in mm, or None if nothing is reachable.
+        Each row is treated as a histogram of reachable run heights, and the
+        largest rectangle under it is found with a stack in linear time.
+        """
+        best_area, best = 0, None
+        heights = np.zeros(self.size + 1, dtype=np.int64)  # Trailing 0 flushes the stack
+        for row in range(self.size):
+            heights[:-1] = np.where(self.cells[row], heights[:-1] + 1, 0)
+            if not heights.any():
+                continue
+            stack = []  # Columns with increasing heights
+            for column, height in enumerate(heights.tolist()):
+                start = column
+                while stack and stack[-1][1] >= height:
+                    start, top = stack.pop()
+                    area = top * (column - start)
+                    if area > best_area:
+                        best_area, best = area, (start, row - top + 1, column, row + 1)
+                stack.append((start, height))
+        if best is None:
+            return None
+        column_0, row_0, column_1, row_1 = best
+        r = self.resolution
+        return (self.x_min + column_0 * r, self.y_min + row_0 * r, self.x_min + column_1 * r, self.y_min + row_1 * r)
+
+    def coverage(self):
+        """Reachable area in mm^2."""
+        return float(self.cells.sum()) * self.resolution ** 2
@@ -0,0 +1,95 @@
+import math
+import unittest
+
+import numpy as np
+
+from kinematics import L1, L2, PWM_MIN, PWM_MAX
+from batch_kinematics import inverse_kinematics_batch
+from workspace_map import WorkspaceMap, ELBOW_DOWN, ELBOW_UP, expressible
+
+def unclamped_duty(angle):
+    """translate() without the clamp"""
+    return int((500 + (2500 - 500) * angle / 180) / 20000 * 65535)
+
+def brute_force_rectangle(cells):
+    """Largest all-True rectangle area by checking every candidate"""
+    rows, columns = cells.shape
+    best = 0
+    for r0 in range(rows):
+        for r1 in range(r0 + 1, rows + 1):
+            for c0 in range(columns):
+                for c1 in range(c0 + 1, columns + 1):
+                    if cells[r0:r1, c0:c1].all():
+                        best = max(best, (r1 - r0) * (c1 - c0))
+    return best
+
+class TestWorkspaceMap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.up = WorkspaceMap(2.0, ELBOW_UP)
+
+    def test_elbow_down_is_empty(self):
+        """Test that the control code's elbow solution always clamps"""
+        down = WorkspaceMap(4.0, ELBOW_DOWN)
+        self.assertEqual(down.coverage(), 0.0)
+        self.assertIsNone(down.largest_rectangle())
+
+    def test_default_is_reachable(self):
+        """Test that the default map is the elbow solution the servos can express"""
+        self.assertEqual(WorkspaceMap(5.0).elbow, ELBOW_UP)
+        self.assertGreater(WorkspaceMap(5.0).coverage(), 0.0)
+
+    def test_expressible(self):
+        """Test that expressible matches the translate() clamp"""
+        angles = np.arange(-10, 190, 0.1)
+        expected = [PWM_MIN <= unclamped_duty(a) <= PWM_MAX for a in angles.tolist()]
+        self.assertEqual(expressible(angles).tolist(), expected)
+
+    def test_reachable_cells_do_not_clamp(self):
+        """Test that every point in a reachable cell solves to unclamped duties"""
+        rng = np.random.default_rng(1)
+        xs = rng.uniform(-L1 - L2, L1 + L2, 4000)
+        ys = rng.uniform(-L1 - L2, L1 + L2, 4000)
+        hits = 0
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            if not self.up.reachable(x, y):
+                continue
+            hits += 1
+            q1, q2, ok = inverse_kinematics_batch(x, y, elbow=ELBOW_UP)
+            self.assertTrue(ok)
+            for angle in (math.degrees(q1), math.degrees(q2)):
+                self.assertTrue(PWM_MIN <= unclamped_duty(angle) <= PWM_MAX, f"({x}, {y}) clamps")
+        self.assertGreater(hits, 100)
+
+    def test_out_of_reach(self):
+        """Test that points beyond L1 + L2 or off the grid are not reachable"""
+        self.assertFalse(self.up.reachable(0, L1 + L2 + 1))
+        self.assertFalse(self.up.reachable(-1000, 0))
+        self.assertFalse(self.up.rectangle_reachable(-50, 0, 50, L1 + L2 + 5))
+
+    def test_batch_matches_scalar(self):
+        """Test that reachable_batch agrees with reachable"""
+        xs, ys = np.meshgrid(np.linspace(-330, 330, 67), np.linspace(-330, 330, 67))
+        batch = self.up.reachable_batch(xs, ys)
+        for x, y, value in zip(xs.ravel().tolist(), ys.ravel().tolist(), batch.ravel().tolist()):
+            self.assertEqual(value, self.up.reachable(x, y))
+
+    def test_largest_rectangle(self):
+        """Test that the largest rectangle is reachable and covers whole cells"""
+        x_min, y_min, x_max, y_max = self.up.largest_rectangle()
+        self.assertTrue(self.up.rectangle_reachable(x_min, y_min, x_max, y_max))
+        self.assertGreater((x_max - x_min) * (y_max - y_min), 0.3 * self.up.coverage())
+
+    def test_largest_rectangle_is_maximal(self):
+        """Test the histogram search against brute force on small random maps"""
+        rng = np.random.default_rng(2)
+        workspace = WorkspaceMap(40.0, ELBOW_UP)
+        for _ in range(20):
+            workspace.cells = rng.random((workspace.size, workspace.size)) < 0.7
+            x_min, y_min, x_max, y_max = workspace.largest_rectangle()
+            area = round((x_max - x_min) * (y_max - y_min) / workspace.resolution ** 2)
+            self.assertEqual(area, brute_force_rectangle(workspace.cells))
+            self.assertTrue(workspace.rectangle_reachable(x_min, y_min, x_max, y_max))
+
+if __name__ == '__main__':
+    unittest.main()